@@ -0,0 +1,9 @@
+"""Performance benchmarks for the todo app.
+
+Each module is a standalone script, run from the project root::
+
+    python -m benchmarks.pagination --rows 100000
+
+Benchmarks use a throwaway SQLite database in a temporary directory, so
+the development ``db.sqlite3`` is never touched.
+"""
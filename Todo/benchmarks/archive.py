@@ -0,0 +1,110 @@
+"""Measure live-table queries as completed todos pile up, with and without archiving.
+
+    python -m benchmarks.archive --rows 10000 --rows 100000 --rows 1000000
+
+For each ``--rows`` size, seeds that many todos: the newest ``--live``
+are a mix of pending and completed, all older ones were completed more
+than 30 days ago. Times the queries the list page and the API run
+against ``todos_todo``, with every row still there, then runs
+``todos.archive.archive()`` and times them again on what's left. The
+report shows the median ms of each; ``archived list`` is the first page
+of ``?archived=1``, which reads both tables.
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from benchmarks.utils import print_table, seed_todos, setup_django, timed
+
+
+def queries():
+    """Return ``{name: callable}`` of the queries to time."""
+    from django.test import Client
+
+    from todos import archive, search
+    from todos.models import Todo
+    from todos.views import TodoListView
+
+    fields = TodoListView.fields
+    client = Client()
+
+    def last_page():
+        count = Todo.objects.count()
+        list(Todo.objects.only(*fields)[max(count - 10, 0) : count])
+
+    return {
+        "first page": lambda: list(Todo.objects.only(*fields)[:10]),
+        "last page": last_page,
+        "COUNT(*)": lambda: Todo.objects.count(),
+        "pending page": lambda: list(
+            Todo.objects.filter(completed=False).only(*fields)[:10]
+        ),
+        "search": lambda: list(search.search(Todo.objects.only(*fields), "todo")[:10]),
+        "list request": lambda: client.get("/todos/"),
+        "archived list": lambda: list(
+            archive.with_archived(Todo.objects.all(), fields)[:10]
+        ),
+    }
+
+
+def run(rows, live, repeat):
+    setup_django()
+    seed_todos(rows, description="Something to do " * 16)
+
+    from django.conf import settings
+    from django.db import connection
+    from django.utils import timezone
+
+    from todos import archive
+    from todos.models import Todo
+
+    # Every read renders the page; the cache would hide the database.
+    settings.TODOS_PAGE_CACHE_TIMEOUT = 0
+    Todo.objects.filter(pk__lte=rows - live).update(
+        completed=True, updated_at=timezone.now() - timedelta(days=60)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    timings = {name: [timed(fn, repeat)] for name, fn in queries().items()}
+    started = time.perf_counter()
+    progress = archive.archive(chunk_size=5000, rate=0)
+    elapsed = time.perf_counter() - started
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    for name, fn in queries().items():
+        timings[name].append(timed(fn, repeat))
+
+    results = [
+        [f"{rows:,}", name, f"{before:.2f}", f"{after:.2f}"]
+        for name, (before, after) in timings.items()
+    ]
+    summary = (
+        f"{rows:,} rows: archived {progress.rows:,} in {elapsed:.1f} s "
+        f"({progress.rows / elapsed:,.0f} rows/s), "
+        f"{Todo.objects.count():,} left live"
+    )
+    return results, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append")
+    parser.add_argument("--live", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    results = []
+    summaries = []
+    for rows in args.rows or [10_000, 100_000]:
+        table, summary = run(rows, min(args.live, rows), args.repeat)
+        results.extend(table)
+        summaries.append(summary)
+    print_table(["rows", "query", "before ms", "after ms"], results)
+    print()
+    print("\n".join(summaries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Compare WSGI and ASGI serving of the todo views at high concurrency.
+
+    python -m benchmarks.asgi --rows 10000 --concurrency 64 --requests 5000
+
+Three setups are driven in-process, each in its own interpreter so the
+URLconf is loaded fresh:
+
+* ``wsgi``: the sync views behind the WSGI handler, one thread per
+  concurrent client, as a threaded WSGI server would run them.
+* ``asgi-sync``: the same sync views behind the ASGI handler, which hands
+  every request to a thread through ``sync_to_async``.
+* ``asgi-async``: the native async views (``TODOS_ASYNC_VIEWS=1``).
+
+Clients request the list page, a random detail page and a random toggle
+in turn. The page cache is off, so every request reaches the database.
+The report shows requests/sec and latency percentiles. Pass
+``--sqlite-profile`` to serve from the production SQLite profile.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.utils import percentiles, print_table, seed_todos, setup_django
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+
+
+def request_paths(seed, count, rows):
+    """Return ``count`` paths cycling through list, detail and toggle."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            paths.append("/todos/")
+        elif kind == 1:
+            paths.append(f"/todos/todo/{rng.randint(1, rows)}/")
+        else:
+            paths.append(f"/todos/todo/{rng.randint(1, rows)}/toggle/")
+    return paths
+
+
+def wsgi_request(app, path):
+    """Send one GET to a WSGI ``app`` and return the status code."""
+    status = []
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    body = app(environ, lambda code, headers: status.append(int(code.split()[0])))
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return status[0]
+
+
+async def asgi_request(app, path):
+    """Send one GET to an ASGI ``app`` and return the status code."""
+    status = []
+    done = asyncio.Event()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return status[0]
+
+
+def run_wsgi(paths, concurrency):
+    from django.core.wsgi import get_wsgi_application
+
+    app = get_wsgi_application()
+    latencies, errors = [], []
+    queue = iter(paths)
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                path = next(queue, None)
+            if path is None:
+                return
+            started = time.perf_counter()
+            status = wsgi_request(app, path)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def run_asgi(paths, concurrency):
+    from django.core.asgi import get_asgi_application
+
+    app = get_asgi_application()
+    latencies, errors = [], []
+    queue = iter(paths)
+
+    async def client():
+        for path in queue:
+            started = time.perf_counter()
+            status = await asgi_request(app, path)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+
+    async def main():
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    asyncio.run(main())
+    return latencies, errors
+
+
+def worker(mode, db_path, rows, concurrency, requests, sqlite_profile):
+    """Run one mode in this process and print its results as JSON."""
+    from todo_project.sqlite import production_database
+
+    os.environ["TODOS_ASYNC_VIEWS"] = "1" if mode == "asgi-async" else "0"
+    setup_django(db_path, production_database(db_path) if sqlite_profile else None)
+    from django.conf import settings
+
+    settings.TODOS_PAGE_CACHE_TIMEOUT = 0
+
+    paths = request_paths(0, requests, rows)
+    run = run_wsgi if mode == "wsgi" else run_asgi
+    started = time.perf_counter()
+    latencies, errors = run(paths, concurrency)
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "mode": mode,
+                "rps": len(latencies) / elapsed,
+                **percentiles(latencies),
+                "errors": len(errors),
+            }
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--mode", choices=MODES, action="append")
+    parser.add_argument("--sqlite-profile", action="store_true")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(
+            args.worker,
+            args.db,
+            args.rows,
+            args.concurrency,
+            args.requests,
+            args.sqlite_profile,
+        )
+        return
+
+    db_path = setup_django()
+    seed_todos(args.rows)
+    results = []
+    for mode in args.mode or MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.asgi",
+                f"--worker={mode}",
+                f"--db={db_path}",
+                f"--rows={args.rows}",
+                f"--concurrency={args.concurrency}",
+                f"--requests={args.requests}",
+                *(["--sqlite-profile"] if args.sqlite_profile else []),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        results.append(
+            (
+                mode,
+                f"{result['rps']:,.0f}",
+                f"{result['p50']:.1f}",
+                f"{result['p99']:.1f}",
+                result["errors"],
+            )
+        )
+
+    print(f"{args.rows} rows, {args.concurrency} concurrent clients")
+    print_table(("mode", "req/s", "p50 ms", "p99 ms", "errors"), results)
+
+
+if __name__ == "__main__":
+    main()
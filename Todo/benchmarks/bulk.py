@@ -0,0 +1,74 @@
+"""Compare the bulk operations with per-item loops.
+
+    python -m benchmarks.bulk --items 10000 --batch-size 500
+
+The loops mirror what import and cleanup jobs did through the one-object
+views: one statement and one autocommit transaction per todo.
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import print_table, setup_django
+
+
+def elapsed_ms(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from todos import bulk
+    from todos.models import Todo
+
+    items = [
+        {"title": f"Todo {i}", "description": "imported"} for i in range(args.items)
+    ]
+
+    def loop_create():
+        for item in items:
+            Todo.objects.create(**item)
+
+    def loop_complete():
+        for todo in Todo.objects.all():
+            todo.completed = True
+            todo.save()
+
+    def loop_delete():
+        for todo in Todo.objects.all():
+            todo.delete()
+
+    def ids():
+        return list(Todo.objects.values_list("pk", flat=True))
+
+    results = []
+    loop_times = [
+        elapsed_ms(loop_create),
+        elapsed_ms(loop_complete),
+        elapsed_ms(loop_delete),
+    ]
+    bulk_times = [
+        elapsed_ms(lambda: bulk.bulk_create_todos(items, args.batch_size)),
+        elapsed_ms(lambda: bulk.bulk_set_completed(ids(), True, args.batch_size)),
+        elapsed_ms(lambda: bulk.bulk_delete(ids(), args.batch_size)),
+    ]
+    for name, loop, batched in zip(
+        ("create", "complete", "delete"), loop_times, bulk_times
+    ):
+        results.append(
+            (name, f"{loop:.0f}", f"{batched:.0f}", f"{loop / batched:.1f}x")
+        )
+
+    print(f"{args.items} todos, batch size {args.batch_size} (ms)")
+    print_table(("operation", "per-item", "bulk", "speedup"), results)
+
+
+if __name__ == "__main__":
+    main()
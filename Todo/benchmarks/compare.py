@@ -0,0 +1,82 @@
+"""Compare two saved ``benchmarks.endpoints`` runs.
+
+    python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+
+Prints p95 latency and throughput side by side for every endpoint both
+runs measured. Exits with status 1 if any p95 grew by more than
+``--threshold`` (a fraction) and ``--min-ms``, so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.utils import print_table
+
+
+def load(path):
+    """Return a saved run's results keyed by ``(rows, mode, endpoint)``."""
+    with open(path, encoding="utf-8") as f:
+        run = json.load(f)
+    return run, {
+        (result["rows"], result["mode"], result["endpoint"]): result
+        for result in run["results"]
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_ms=1.0):
+    """Return ``(table_rows, regressions)`` comparing two loaded runs."""
+    rows, regressions = [], []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        change = (new["p95"] - old["p95"]) / old["p95"] if old["p95"] else 0.0
+        regressed = change > threshold and new["p95"] - old["p95"] > min_ms
+        if regressed:
+            regressions.append(key)
+        rows.append(
+            (
+                *key,
+                f"{old['p95']:.1f}",
+                f"{new['p95']:.1f}",
+                f"{change:+.0%}",
+                f"{old['rps']:,.0f}",
+                f"{new['rps']:,.0f}",
+                "REGRESSION" if regressed else "",
+            )
+        )
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    baseline_run, baseline = load(args.baseline)
+    current_run, current = load(args.current)
+    rows, regressions = compare(baseline, current, args.threshold, args.min_ms)
+    print(f"{baseline_run['commit']} -> {current_run['commit']}")
+    print_table(
+        (
+            "rows",
+            "mode",
+            "endpoint",
+            "old p95",
+            "new p95",
+            "change",
+            "old req/s",
+            "new req/s",
+            "",
+        ),
+        rows,
+    )
+    if regressions:
+        print(f"\n{len(regressions)} endpoint(s) regressed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Latency and throughput of every todo URL at several table sizes.
+
+    python -m benchmarks.endpoints --rows 10000 --rows 100000 --rows 1000000
+
+For each ``--rows`` the todos table is seeded from scratch, then every
+endpoint below is driven by ``--concurrency`` clients, first in-process
+through Django's test client and then over HTTP against a local threaded
+server (``benchmarks.serve``). Each endpoint gets ``--requests`` requests;
+the report shows requests/sec and p50/p95/p99 latency. Pass
+``--sqlite-profile`` to serve from the production SQLite profile.
+
+Results are saved as JSON, named after the current commit, so runs can
+be compared across commits with ``python -m benchmarks.compare``.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+from benchmarks.utils import percentiles, print_table, seed_todos, setup_django
+
+MODES = ("inprocess", "server")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class Context:
+    """What endpoints need to build requests against the seeded table."""
+
+    def __init__(self, rows, cursor):
+        self.rows = rows
+        self.cursor = cursor
+        self._next = itertools.count()
+        self._disposable = iter(())
+
+    def pk(self):
+        """Return a seeded pk, spread deterministically over the table."""
+        return next(self._next) * 7919 % self.rows + 1
+
+    def load_disposable(self):
+        """Hand the rows the benchmark itself created to the deletes."""
+        from todos.models import Todo
+
+        self._disposable = iter(
+            Todo.objects.filter(pk__gt=self.rows)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def disposable_pk(self):
+        # 0 never exists, so running out shows up as 404s.
+        return next(self._disposable, 0)
+
+
+class Endpoint:
+    """One URL to drive, with how to build each request's path and body.
+
+    ``path`` and ``data`` are callables taking a ``Context``. ``data`` is
+    sent as a form unless ``json`` is set. ``max_requests`` caps endpoints
+    too heavy to repeat ``--requests`` times.
+    """
+
+    def __init__(self, name, path, method="GET", data=None, json=False, **options):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.data = data
+        self.json = json
+        self.max_requests = options.get("max_requests")
+
+    def build(self, ctx):
+        """Return ``(method, path, body, content_type)`` for one request."""
+        body, content_type = b"", None
+        if self.data is not None:
+            data = self.data(ctx)
+            if self.json:
+                body, content_type = json.dumps(data).encode(), "application/json"
+            else:
+                body = urlencode(data).encode()
+                content_type = "application/x-www-form-urlencoded"
+        return self.method, self.path(ctx), body, content_type
+
+
+def get_endpoints():
+    from django.urls import reverse
+
+    def url(name, *args):
+        return lambda ctx: reverse(name, args=[arg(ctx) for arg in args])
+
+    def pk(ctx):
+        return ctx.pk()
+
+    def disposable(ctx):
+        return ctx.disposable_pk()
+
+    def query(name, params):
+        return lambda ctx: f"{reverse(name)}?{urlencode(params(ctx))}"
+
+    form = {"title": "Benchmark todo", "description": "Created by the benchmark"}
+    return [
+        Endpoint("todo_list", url("todo_list")),
+        Endpoint("todo_list_last_page", query("todo_list", lambda c: {"page": "last"})),
+        Endpoint(
+            "todo_list_cursor", query("todo_list", lambda c: {"cursor": c.cursor})
+        ),
+        Endpoint("todo_list_search", query("todo_list", lambda c: {"q": "todo 42"})),
+        Endpoint("todo_detail", url("todo_detail", pk)),
+        Endpoint("todo_create_form", url("todo_create")),
+        Endpoint("todo_create", url("todo_create"), "POST", lambda c: form),
+        Endpoint("todo_update_form", url("todo_update", pk)),
+        Endpoint("todo_update", url("todo_update", pk), "POST", lambda c: form),
+        Endpoint("todo_toggle", url("todo_toggle", pk)),
+        Endpoint(
+            "todo_bulk_create",
+            url("todo_bulk_create"),
+            "POST",
+            lambda c: {"todos": [form] * 10},
+            json=True,
+        ),
+        Endpoint(
+            "todo_bulk_complete",
+            url("todo_bulk_complete"),
+            "POST",
+            lambda c: {"ids": [c.pk() for _ in range(100)]},
+            json=True,
+        ),
+        Endpoint("todo_delete_confirm", url("todo_delete", pk)),
+        # The deletes remove the rows the creates above added.
+        Endpoint("todo_delete", url("todo_delete", disposable), "POST", lambda c: {}),
+        Endpoint(
+            "todo_bulk_delete",
+            url("todo_bulk_delete"),
+            "POST",
+            lambda c: {"ids": [c.disposable_pk() for _ in range(10)]},
+            json=True,
+        ),
+        Endpoint("api_list", url("api:todo_list")),
+        Endpoint("api_detail", url("api:todo_detail", pk)),
+        Endpoint("api_toggle", url("api:todo_toggle", pk), "POST"),
+        Endpoint(
+            "api_export",
+            query("api:todo_export", lambda c: {"fields": "id,title"}),
+            max_requests=3,
+        ),
+        Endpoint("admin_changelist", url("admin:todos_todo_changelist")),
+        Endpoint(
+            "admin_search",
+            query("admin:todos_todo_changelist", lambda c: {"q": "todo 42"}),
+        ),
+        Endpoint("admin_change", url("admin:todos_todo_change", pk)),
+    ]
+
+
+def login():
+    """Create a superuser and return the session and CSRF cookies."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    user = get_user_model().objects.create_superuser("bench", "", "bench")
+    client = Client()
+    client.force_login(user)
+    client.get(reverse("todo_create"))
+    return {name: client.cookies[name].value for name in ("sessionid", "csrftoken")}
+
+
+def inprocess_sender(cookies):
+    from django.test import Client
+
+    client = Client()
+    for name, value in cookies.items():
+        client.cookies[name] = value
+
+    def send(method, path, body, content_type):
+        response = client.generic(method, path, body, content_type or "")
+        for _ in response:
+            pass
+        return response.status_code
+
+    return send
+
+
+def server_sender(address, cookies):
+    cookie_header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+    def send(method, path, body, content_type):
+        headers = {"Cookie": cookie_header, "X-CSRFToken": cookies["csrftoken"]}
+        if content_type:
+            headers["Content-Type"] = content_type
+        connection = http.client.HTTPConnection(*address, timeout=300)
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        finally:
+            connection.close()
+
+    return send
+
+
+def drive(make_sender, requests, concurrency):
+    """Send ``requests`` from ``concurrency`` threads, one sender each.
+
+    Returns ``(latencies, errors, elapsed)``.
+    """
+    latencies, errors = [], []
+    lock = threading.Lock()
+    queue = iter(requests)
+
+    def client():
+        send = make_sender()
+        while True:
+            with lock:
+                request = next(queue, None)
+            if request is None:
+                return
+            started = time.perf_counter()
+            status = send(*request)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path, sqlite_profile=False):
+    """Start ``benchmarks.serve`` and return ``(process, address)`` once up."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.serve",
+            f"--db={db_path}",
+            f"--port={port}",
+            *(["--sqlite-profile"] if sqlite_profile else []),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, ("127.0.0.1", port)
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("benchmark server did not start")
+
+
+def run_size(rows, modes, requests, concurrency, sqlite_profile=False):
+    """Seed ``rows`` todos and drive every endpoint in each mode."""
+    from todo_project.sqlite import production_database
+
+    db_path = setup_django(
+        database=production_database(None) if sqlite_profile else None
+    )
+    seed_todos(rows)
+    from todos.models import Todo
+    from todos.pagination import encode_cursor
+
+    middle = Todo.objects.order_by("-created_at", "-id")[rows // 2]
+    ctx = Context(rows, encode_cursor(middle))
+    cookies = login()
+    endpoints = get_endpoints()
+
+    results = []
+    for mode in modes:
+        server = None
+        if mode == "server":
+            server, address = start_server(db_path, sqlite_profile)
+            make_sender = lambda: server_sender(address, cookies)  # noqa: E731
+        else:
+            make_sender = lambda: inprocess_sender(cookies)  # noqa: E731
+        try:
+            for endpoint in endpoints:
+                count = min(requests, endpoint.max_requests or requests)
+                ctx.load_disposable()
+                batch = [endpoint.build(ctx) for _ in range(count)]
+                latencies, errors, elapsed = drive(make_sender, batch, concurrency)
+                results.append(
+                    {
+                        "rows": rows,
+                        "mode": mode,
+                        "endpoint": endpoint.name,
+                        "requests": count,
+                        "errors": len(errors),
+                        "rps": count / elapsed,
+                        **percentiles(latencies),
+                    }
+                )
+                print(
+                    f"{rows} {mode} {endpoint.name}: "
+                    f"{results[-1]['p95']:.1f} ms p95",
+                    file=sys.stderr,
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    return results
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True
+        ).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return f"{commit}-dirty" if git("status", "--porcelain", "--", ".") else commit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append")
+    parser.add_argument("--mode", choices=MODES, action="append")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sqlite-profile", action="store_true")
+    parser.add_argument("--output", help="defaults to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="a saved run to compare against")
+    args = parser.parse_args(argv)
+
+    import django
+
+    commit = git_commit()
+    results = []
+    for rows in args.rows or [10_000, 100_000]:
+        results.extend(
+            run_size(
+                rows,
+                args.mode or MODES,
+                args.requests,
+                args.concurrency,
+                args.sqlite_profile,
+            )
+        )
+
+    run = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "sqlite_profile": args.sqlite_profile,
+        "results": results,
+    }
+    output = Path(args.output or RESULTS_DIR / f"{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2) + "\n")
+
+    print_table(
+        ("rows", "mode", "endpoint", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors"),
+        [
+            (
+                r["rows"],
+                r["mode"],
+                r["endpoint"],
+                f"{r['rps']:,.0f}",
+                f"{r['p50']:.1f}",
+                f"{r['p95']:.1f}",
+                f"{r['p99']:.1f}",
+                r["errors"],
+            )
+            for r in results
+        ],
+    )
+    print(f"\nSaved to {output}")
+
+    if args.compare:
+        from benchmarks import compare
+
+        compare.main([args.compare, str(output)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare loading full todos with the list page's lean queryset.
+
+    python -m benchmarks.list_fields --rows 10000 --description-kb 8
+
+Seeds todos whose descriptions are ``--description-kb`` KB long, then
+loads one list page of each ``--page-size`` two ways: ``full`` selects
+every column, as the list view used to, and ``lean`` selects only
+``TodoListView.fields``, with the stored excerpt instead of the
+description. The report shows the median time per page, the bytes of
+column data SQLite hands back and the peak Python memory while the page
+is loaded.
+"""
+
+import argparse
+import tracemalloc
+
+from benchmarks.utils import print_table, seed_todos, setup_django, timed
+
+
+def page_bytes(queryset):
+    """Return the bytes of column data fetched by ``queryset``."""
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(value.encode()) if isinstance(value, str) else 8
+            for row in cursor.fetchall()
+            for value in row
+            if value is not None
+        )
+
+
+def peak_memory(queryset):
+    """Return the peak bytes allocated while loading ``queryset``."""
+    tracemalloc.start()
+    try:
+        list(queryset.all())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--description-kb", type=float, default=8)
+    parser.add_argument("--page-size", type=int, action="append")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    words = int(args.description_kb * 1024 / 6)
+    seed_todos(args.rows, description=" ".join(["lorem"] * words))
+
+    from todos.models import Todo
+    from todos.views import TodoListView
+
+    querysets = {
+        "full": Todo.objects.all(),
+        "lean": Todo.objects.only(*TodoListView.fields),
+    }
+    results = []
+    for page_size in args.page_size or [10, 100]:
+        for name, queryset in querysets.items():
+            page = queryset[:page_size]
+            results.append(
+                [
+                    page_size,
+                    name,
+                    f"{timed(lambda: list(page.all()), repeat=9):.2f}",
+                    f"{page_bytes(page) / 1024:,.1f}",
+                    f"{peak_memory(page) / 1024:,.1f}",
+                ]
+            )
+    print_table(["page size", "columns", "ms", "fetched KB", "peak KB"], results)
+
+
+if __name__ == "__main__":
+    main()
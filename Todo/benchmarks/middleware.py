@@ -0,0 +1,101 @@
+"""Measure per-request middleware overhead with and without lean paths.
+
+    python -m benchmarks.middleware --repeat 2000
+
+Sends requests straight to Django's WSGI handler, without a server, under
+two setups: ``full`` runs every request through all of ``MIDDLEWARE`` (as
+with ``TODOS_LEAN_PATHS=0``), ``lean`` skips the session, auth and message
+middleware on ``/todos/``. Each setup is timed for a todo detail page,
+the list page served from the page cache, and the detail page requested
+with a signed-in admin's session cookie. The report shows the median
+time per request and the queries per request.
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import print_table, seed_todos, setup_django
+
+SETUPS = {"full": [], "lean": ["/todos/"]}
+
+
+def session_cookie():
+    """Return a ``Cookie`` header for a signed-in superuser."""
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    user = User.objects.create_superuser("bench", "bench@example.com", "bench")
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f"{name}={client.cookies[name].value}"
+
+
+def measure(handler, path, cookie, repeat):
+    """Return ``{setup: (median ms, queries)}`` for GETs of ``path``.
+
+    The setups take turns request by request, so drift in the machine's
+    speed affects them alike.
+    """
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from todos import instrumentation
+
+    headers = {"cookie": cookie} if cookie else {}
+    environ = RequestFactory().get(path, headers=headers).environ
+
+    def start_response(status, response_headers):
+        assert status.startswith("200"), (path, status)
+
+    samples = {setup: [] for setup in SETUPS}
+    queries = {}
+    for _ in range(repeat):
+        for setup, paths in SETUPS.items():
+            settings.TODOS_LEAN_PATHS = paths
+            with instrumentation.collect() as stats:
+                started = time.perf_counter()
+                response = handler(dict(environ), start_response)
+                b"".join(response)
+                response.close()
+                samples[setup].append((time.perf_counter() - started) * 1000)
+            queries[setup] = stats.queries
+    return {
+        setup: (statistics.median(samples[setup]), queries[setup]) for setup in SETUPS
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    seed_todos(100)
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.urls import reverse
+
+    handler = WSGIHandler()
+    cookie = session_cookie()
+    requests = {
+        "detail": (reverse("todo_detail", args=[1]), ""),
+        "list (cached)": (reverse("todo_list"), ""),
+        "detail, signed in": (reverse("todo_detail", args=[1]), cookie),
+    }
+    results = []
+    for name, (path, cookie) in requests.items():
+        measure(handler, path, cookie, args.repeat // 10)  # Warm up.
+        timings = measure(handler, path, cookie, args.repeat)
+        for setup, (ms, queries) in timings.items():
+            saved = ""
+            if setup == "lean":
+                saved = f"{timings['full'][0] - ms:.3f}"
+            results.append([name, setup, f"{ms:.3f}", saved, queries])
+    print_table(["request", "stack", "ms", "saved ms", "queries"], results)
+
+
+if __name__ == "__main__":
+    main()
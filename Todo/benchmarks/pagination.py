@@ -0,0 +1,61 @@
+"""Compare offset and keyset pagination latency at increasing page depths.
+
+    python -m benchmarks.pagination --rows 1000000 --per-page 10
+
+Offset pages pay for a ``COUNT(*)`` and an ``OFFSET`` scan that grows with
+depth; keyset pages should stay flat.
+"""
+
+import argparse
+
+from benchmarks.utils import print_table, seed_todos, setup_django, timed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.core.paginator import Paginator
+
+    from todos.models import Todo
+    from todos.pagination import KeysetPaginator, encode_cursor
+
+    seed_todos(args.rows)
+    queryset = Todo.objects.all()
+    ordered = queryset.order_by(*KeysetPaginator.ordering)
+
+    results = []
+    depth = 1
+    while depth * args.per_page < args.rows:
+        offset = (depth - 1) * args.per_page
+
+        def offset_page(number=depth):
+            paginator = Paginator(queryset, args.per_page)
+            list(paginator.page(number).object_list)
+
+        cursor = None
+        if offset:
+            cursor = encode_cursor(ordered[offset - 1])
+
+        def keyset_page(cursor=cursor):
+            list(KeysetPaginator(queryset, args.per_page).page(cursor).object_list)
+
+        results.append(
+            (
+                depth,
+                f"{timed(offset_page, args.repeat):.2f}",
+                f"{timed(keyset_page, args.repeat):.2f}",
+            )
+        )
+        depth *= 10
+
+    print(f"{args.rows} rows, {args.per_page} per page (median ms)")
+    print_table(("page", "offset", "keyset"), results)
+
+
+if __name__ == "__main__":
+    main()
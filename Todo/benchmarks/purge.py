@@ -0,0 +1,138 @@
+"""Measure deletes and cleanup against concurrent foreground writes.
+
+    python -m benchmarks.purge --rows 50000 --deleted 0.5
+
+First seeds ``--rows`` todos and times deleting one the way
+``TodoDeleteView`` does: ``hard`` removes the row, its index entries and
+its search index entry, ``soft`` only sets ``deleted_at``.
+
+Then seeds the todos afresh, marks the ``--deleted`` fraction of them
+deleted and removes those while a foreground thread keeps toggling live
+todos, as requests would. ``one-shot`` deletes them in a single
+transaction, as a cleanup script would; ``purge`` runs
+``todos.purge.purge()`` with ``--chunk-size`` and ``--rate``. The report
+shows how long the cleanup took and the latency of the foreground writes
+meanwhile. Both run on the SQLite production profile.
+"""
+
+import argparse
+import threading
+import time
+from datetime import timedelta
+
+from benchmarks.utils import percentiles, print_table, seed_todos, setup_django, timed
+
+MODES = ("one-shot", "purge")
+
+
+def single_delete(repeat):
+    """Return ``[[kind, ms]]`` for hard and soft deletes of one todo."""
+    from todos.models import Todo
+
+    pks = iter(Todo.objects.order_by("pk").values_list("pk", flat=True))
+    results = []
+    for kind in ("hard", "soft"):
+
+        def delete():
+            todo = Todo.objects.get(pk=next(pks))
+            if kind == "hard":
+                todo.hard_delete()
+            else:
+                todo.delete()
+
+        results.append([kind, f"{timed(delete, repeat=repeat):.2f}"])
+    return results
+
+
+def foreground(stop, latencies):
+    """Toggle live todos until ``stop`` is set, recording each write's time."""
+    from django.db import connection
+
+    from todos.models import Todo
+
+    pks = list(Todo.objects.order_by("pk").values_list("pk", flat=True)[:1000])
+    i = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        Todo.objects.filter(pk=pks[i % len(pks)]).toggle_completed()
+        latencies.append(time.perf_counter() - started)
+        i += 1
+        time.sleep(0.001)
+    connection.close()
+
+
+def run(mode, rows, deleted, chunk_size, rate):
+    from todo_project.sqlite import production_database
+
+    setup_django(database=production_database(None))
+    seed_todos(rows, description="Something to do " * 64)
+
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from todos import purge
+    from todos.models import Todo
+
+    count = int(rows * deleted)
+    Todo.objects.filter(pk__gt=rows - count).update(
+        deleted_at=timezone.now() - timedelta(days=30)
+    )
+    connection.close()
+
+    stop = threading.Event()
+    latencies = []
+    thread = threading.Thread(target=foreground, args=(stop, latencies))
+    thread.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    if mode == "one-shot":
+        with transaction.atomic():
+            Todo.all_objects.filter(deleted_at__isnull=False).hard_delete()
+    else:
+        purge.purge(chunk_size=chunk_size, rate=rate)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    thread.join()
+    stats = percentiles(latencies)
+    return [
+        mode,
+        f"{elapsed:.2f}",
+        f"{count / elapsed:,.0f}",
+        len(latencies),
+        f"{stats['p50']:.1f}",
+        f"{stats['p95']:.1f}",
+        f"{max(latencies) * 1000:.1f}",
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--deleted", type=float, default=0.5)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument(
+        "--rate", type=float, help="Rows/s; 0 = no limit. Defaults to the setting."
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--mode", choices=MODES, action="append")
+    args = parser.parse_args(argv)
+
+    from todo_project.sqlite import production_database
+
+    setup_django(database=production_database(None))
+    seed_todos(args.rows, description="Something to do " * 64)
+    print_table(["delete", "ms"], single_delete(args.repeat))
+    print()
+
+    results = [
+        run(mode, args.rows, args.deleted, args.chunk_size, args.rate)
+        for mode in args.mode or MODES
+    ]
+    print_table(
+        ["cleanup", "s", "rows/s", "fg writes", "p50 ms", "p95 ms", "max ms"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Measure list and detail reads under concurrent writes, with and without a replica.
+
+    python -m benchmarks.replica --readers 8 --writers 4 --seconds 5
+
+Seeds ``--rows`` todos, then for ``--seconds`` runs ``--writers`` threads
+toggling random todos on the primary and ``--readers`` threads loading
+the list page (uncached) and a detail page through Django's test client.
+``primary`` serves the reads from ``default``, as without
+``TODOS_REPLICAS``; ``replica`` serves them from a copy refreshed by
+``replica.sync()`` every ``--interval`` seconds in another thread. The
+report shows reads and writes per second, read latency percentiles,
+failed requests and, for the replica, the mean and largest lag seen.
+
+``--sqlite-profile`` uses the production profile (WAL) for both files.
+Without it, SQLite's default rollback journal makes every write lock out
+readers, which is where moving reads off the primary helps most.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.utils import percentiles, print_table, seed_todos, setup_django
+
+MODES = ("primary", "replica")
+
+
+def database_settings(profile, name=None):
+    from todo_project.sqlite import production_database
+
+    if profile:
+        return production_database(name)
+    return {"ENGINE": "django.db.backends.sqlite3", "NAME": name}
+
+
+def add_replica(profile, path):
+    """Add a ``replica`` alias at ``path`` and route reads to it."""
+    from django.conf import settings
+    from django.db import connections
+
+    # configure_settings() fills in the defaults, but insists on a "default".
+    connections.settings["replica"] = connections.configure_settings(
+        {"default": database_settings(profile, str(path))}
+    )["default"]
+    settings.TODOS_REPLICAS = {"default": "replica"}
+
+
+def reader(seed, deadline, rows, results, lock):
+    from django.db import connections
+    from django.test import Client
+    from django.urls import reverse
+
+    rng = random.Random(seed)
+    client = Client()
+    latencies = []
+    failed = 0
+    while time.perf_counter() < deadline:
+        if rng.random() < 0.5:
+            url = reverse("todo_list")
+        else:
+            url = reverse("todo_detail", args=[rng.randint(1, rows)])
+        started = time.perf_counter()
+        if client.get(url).status_code != 200:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    connections.close_all()
+    with lock:
+        results["reads"].extend(latencies)
+        results["failed"] += failed
+
+
+def writer(seed, deadline, rows, results, lock):
+    from django.db import OperationalError, connections
+
+    from todos.models import Todo
+
+    rng = random.Random(seed)
+    writes = failed = 0
+    while time.perf_counter() < deadline:
+        pk = rng.randint(1, rows)
+        try:
+            Todo.objects.filter(pk=pk).toggle_completed()
+        except OperationalError:
+            failed += 1
+            continue
+        writes += 1
+    connections.close_all()
+    with lock:
+        results["writes"] += writes
+        results["failed"] += failed
+
+
+def syncer(interval, deadline, results):
+    from django.db import connections
+
+    from todos import replica
+
+    while time.perf_counter() < deadline:
+        replica.sync()
+        time.sleep(interval)
+        results["lags"].append(replica.get_status()["lag_seconds"])
+    connections.close_all()
+
+
+def run(mode, readers, writers, seconds, rows, interval, profile):
+    db_path = setup_django(database=database_settings(profile))
+    seed_todos(rows)
+
+    from django.conf import settings
+    from django.db import connections
+
+    # Every read renders the page; the cache would hide the database.
+    settings.TODOS_PAGE_CACHE_TIMEOUT = 0
+    settings.TODOS_REPLICAS = {}
+    if mode == "replica":
+        add_replica(profile, db_path.with_name("replica.sqlite3"))
+        from todos import replica
+
+        replica.sync()
+    connections.close_all()
+
+    results = {"reads": [], "writes": 0, "failed": 0, "lags": []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=reader, args=(i, deadline, rows, results, lock))
+        for i in range(readers)
+    ] + [
+        threading.Thread(target=writer, args=(i, deadline, rows, results, lock))
+        for i in range(writers)
+    ]
+    if mode == "replica":
+        pool.append(threading.Thread(target=syncer, args=(interval, deadline, results)))
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if mode == "replica":
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        settings.TODOS_REPLICAS = {}
+
+    reads = results["reads"]
+    stats = percentiles(reads) if reads else {"p50": 0, "p95": 0}
+    lags = [lag for lag in results["lags"] if lag is not None]
+    lag = "-"
+    if lags:
+        lag = f"{statistics.mean(lags):.2f} / {max(lags):.2f}"
+    return [
+        mode,
+        f"{len(reads) / elapsed:,.0f}",
+        f"{results['writes'] / elapsed:,.0f}",
+        f"{stats['p50']:.1f}",
+        f"{stats['p95']:.1f}",
+        results["failed"],
+        lag,
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between copies."
+    )
+    parser.add_argument("--sqlite-profile", action="store_true")
+    parser.add_argument("--mode", choices=MODES, action="append")
+    args = parser.parse_args(argv)
+
+    results = [
+        run(
+            mode,
+            args.readers,
+            args.writers,
+            args.seconds,
+            args.rows,
+            args.interval,
+            args.sqlite_profile,
+        )
+        for mode in args.mode or MODES
+    ]
+    print_table(
+        [
+            "reads from",
+            "reads/s",
+            "writes/s",
+            "read p50 ms",
+            "read p95 ms",
+            "failed",
+            "lag s (mean / max)",
+        ],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
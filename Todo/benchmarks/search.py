@@ -0,0 +1,74 @@
+"""Compare full-text search against the ``icontains`` (``LIKE``) path.
+
+    python -m benchmarks.search --rows 100000 --rows 1000000
+
+The ``LIKE '%q%'`` path scans every row; the FTS5 index looks terms up.
+"""
+
+import argparse
+import random
+
+from benchmarks.utils import print_table, seed_todos, setup_django, timed
+
+SYLLABLES = "ka lo mi nu pe ra si to vu ze ba de fi go hu".split()
+_rng = random.Random(0)
+# A few thousand pseudo-words, so terms are as selective as real prose.
+WORDS = sorted({"".join(_rng.choices(SYLLABLES, k=3)) for _ in range(5000)})
+
+
+def description(i):
+    rng = random.Random(i)
+    return " ".join(rng.choice(WORDS) for _ in range(30))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, action="append", help="Table sizes (repeatable)."
+    )
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--query", default=f"{WORDS[7]} {WORDS[42]}")
+    args = parser.parse_args(argv)
+    sizes = args.rows or [100_000, 1_000_000]
+
+    results = []
+    for rows in sizes:
+        setup_django()
+        from django.db.models import Q
+        from django.db import connections
+
+        from todos import search
+        from todos.models import Todo
+
+        seed_todos(rows, description=description)
+
+        def like_page():
+            queryset = Todo.objects.all()
+            for word in args.query.split():
+                queryset = queryset.filter(
+                    Q(title__icontains=word) | Q(description__icontains=word)
+                )
+            list(queryset[: args.per_page])
+            queryset.count()
+
+        def fts_page():
+            queryset = search.search(Todo.objects.all(), args.query)
+            list(queryset[: args.per_page])
+            queryset.count()
+
+        results.append(
+            (
+                rows,
+                f"{timed(like_page, args.repeat):.2f}",
+                f"{timed(fts_page, args.repeat):.2f}",
+            )
+        )
+        connections.close_all()
+
+    print(f"query {args.query!r}, first page + count (median ms)")
+    print_table(("rows", "like", "fts5"), results)
+
+
+if __name__ == "__main__":
+    main()
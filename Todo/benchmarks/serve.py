@@ -0,0 +1,33 @@
+"""Serve the project over HTTP from a benchmark database.
+
+    python -m benchmarks.serve --db /tmp/bench.sqlite3 --port 8765
+
+Runs Django's threaded WSGI server (what ``runserver`` uses, without the
+autoreloader) with ``DEBUG`` off. ``benchmarks.endpoints`` starts it in a
+subprocess for its ``server`` mode.
+"""
+
+import argparse
+
+from benchmarks.utils import setup_django
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sqlite-profile", action="store_true")
+    args = parser.parse_args(argv)
+
+    from todo_project.sqlite import production_database
+
+    setup_django(args.db, production_database(None) if args.sqlite_profile else None)
+    from django.core.servers.basehttp import run
+    from django.core.wsgi import get_wsgi_application
+
+    run(args.host, args.port, get_wsgi_application(), threading=True)
+
+
+if __name__ == "__main__":
+    main()
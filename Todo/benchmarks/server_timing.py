@@ -0,0 +1,75 @@
+"""Measure the overhead of ServerTimingMiddleware.
+
+    python -m benchmarks.server_timing --rows 10000 --rounds 15
+
+Times the list and detail pages in-process without the middleware, with
+it and sampling off, and with every request profiled. With sampling off
+the overhead should stay under 1%.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.utils import print_table, seed_todos, setup_django
+
+SETUPS = (("without", None), ("sampling off", 0.0), ("every request", 1.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    seed_todos(args.rows)
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+
+    middleware = list(settings.MIDDLEWARE)
+    settings.TODOS_PAGE_CACHE_TIMEOUT = 0
+    settings.TODOS_PROFILE_DIR = tempfile.mkdtemp(prefix="todo-profiles-")
+    paths = [reverse("todo_list"), reverse("todo_detail", args=[args.rows // 2])]
+
+    clients = {}
+    for name, rate in SETUPS:
+        settings.MIDDLEWARE = middleware
+        if rate is not None:
+            settings.MIDDLEWARE = ["todos.middleware.ServerTimingMiddleware"]
+            settings.MIDDLEWARE += middleware
+        clients[name] = Client()
+        # The test client loads MIDDLEWARE on its first request.
+        clients[name].get(paths[0])
+
+    def run(name, rate):
+        settings.TODOS_PROFILE_SAMPLE_RATE = rate or 0.0
+        client = clients[name]
+        started = time.perf_counter()
+        for i in range(args.requests):
+            client.get(paths[i % len(paths)])
+        return (time.perf_counter() - started) / args.requests * 1e6
+
+    # Interleave rounds, rotating the order, so drift and leftover garbage
+    # from the previous setup affect every setup alike.
+    samples = {name: [] for name, _ in SETUPS}
+    for i in range(args.rounds):
+        for name, rate in SETUPS[i % 3 :] + SETUPS[: i % 3]:
+            samples[name].append(run(name, rate))
+    median = {name: statistics.median(times) for name, times in samples.items()}
+
+    baseline = median["without"]
+    print_table(
+        ("setup", "us/request", "overhead"),
+        [
+            (name, f"{median[name]:.0f}", f"{median[name] / baseline - 1:+.1%}")
+            for name, _ in SETUPS
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Measure write throughput as todos are spread over more shards.
+
+    python -m benchmarks.sharding --shards 1 --shards 2 --shards 4
+
+For each shard count, sets up that many SQLite files with the production
+profile (``default`` and ``shard1`` on), migrates them with
+``migrate_shards`` and runs ``--threads`` worker threads for
+``--seconds``. Each worker stands in for a client: it alternately saves
+a new todo, which ``ShardRouter`` puts on the next shard, and toggles one
+of its todos on the shard holding it, as ``toggle_todo`` does. The
+report shows committed writes per second, latency percentiles and
+failed writes.
+
+``--synchronous`` sets ``PRAGMA synchronous``. The production profile's
+``NORMAL`` doesn't sync WAL commits, so the write lock is held only
+briefly; ``FULL`` syncs every commit, as a deployment that can't lose a
+committed write would, and makes the lock the bottleneck that sharding
+relieves.
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.utils import percentiles, print_table, setup_django
+
+
+def setup_shards(count, synchronous):
+    """Configure ``count`` fresh shard databases and migrate them."""
+    from todo_project.sqlite import production_database
+
+    pragmas = {"synchronous": synchronous}
+    directory = Path(tempfile.mkdtemp(prefix="todo-bench-shards-"))
+    setup_django(directory / "db.sqlite3", database=production_database(None, pragmas))
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    shards = ["default"]
+    for i in range(1, count):
+        alias = f"shard{i}"
+        database = production_database(str(directory / f"db.{alias}.sqlite3"), pragmas)
+        # configure_settings() fills in the defaults, but insists on a "default".
+        connections.settings[alias] = connections.configure_settings(
+            {"default": database}
+        )["default"]
+        shards.append(alias)
+    settings.TODOS_SHARDS = shards
+    call_command("migrate_shards", verbosity=0)
+    for alias in shards:
+        connections[alias].close()
+
+
+def drop_shards():
+    """Remove the shard aliases ``setup_shards()`` added."""
+    from django.conf import settings
+    from django.db import connections
+
+    for alias in settings.TODOS_SHARDS[1:]:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+    settings.TODOS_SHARDS = ["default"]
+
+
+def worker(seed, deadline, results, lock):
+    from django.db import OperationalError, connections
+
+    from todos import page_cache, sharding
+    from todos.models import Todo
+
+    rng = random.Random(seed)
+    pks = []
+    latencies = []
+    failed = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if not pks or rng.random() < 0.5:
+                todo = Todo(title=f"Todo from worker {seed}")
+                todo.save()
+                pks.append(todo.pk)
+            else:
+                pk = rng.choice(pks)
+                sharding.for_pk(pk).filter(pk=pk).toggle_completed()
+                page_cache.bump_generation(sharding.db_for_pk(pk))
+        except OperationalError:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    connections.close_all()
+    with lock:
+        results["latencies"].extend(latencies)
+        results["failed"] += failed
+
+
+def run(shards, threads, seconds, synchronous):
+    setup_shards(shards, synchronous)
+
+    from todos import sharding
+    from todos.models import Todo
+
+    results = {"latencies": [], "failed": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=worker, args=(i, deadline, results, lock))
+        for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    todos = sharding.scatter(Todo.objects.all()).count()
+    drop_shards()
+    latencies = results["latencies"]
+    stats = percentiles(latencies) if latencies else {"p50": 0, "p95": 0}
+    return [
+        shards,
+        f"{len(latencies) / elapsed:,.0f}",
+        f"{stats['p50']:.1f}",
+        f"{stats['p95']:.1f}",
+        results["failed"],
+        f"{todos:,}",
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, action="append")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--synchronous", choices=("OFF", "NORMAL", "FULL"), default="FULL"
+    )
+    args = parser.parse_args(argv)
+
+    results = [
+        run(shards, args.threads, args.seconds, args.synchronous)
+        for shards in args.shards or [1, 2, 4]
+    ]
+    print_table(["shards", "writes/s", "p50 ms", "p95 ms", "failed", "todos"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Load-test the default SQLite settings against the production profile.
+
+    python -m benchmarks.sqlite_profile --threads 8 --seconds 10
+
+Each profile gets a fresh database seeded with ``--rows`` todos. Worker
+threads then mix list reads, inserts and read-then-write updates (load a
+todo inside a transaction, then save it) for ``--seconds``. The report
+shows committed writes per second and how many operations failed with
+``database is locked``.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from benchmarks.utils import print_table, seed_todos, setup_django
+
+PROFILES = ("default", "production")
+
+
+def worker(seed, deadline, rows, counts, lock):
+    from django.db import OperationalError, connection, transaction
+
+    from todos.models import Todo
+
+    rng = random.Random(seed)
+    local = {"reads": 0, "writes": 0, "locked": 0, "errors": 0}
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        try:
+            if roll < 0.5:
+                list(Todo.objects.only("id", "title", "completed")[:20])
+                local["reads"] += 1
+            elif roll < 0.8:
+                Todo.objects.create(title=f"Load {seed}")
+                local["writes"] += 1
+            else:
+                with transaction.atomic():
+                    todo = Todo.objects.get(pk=rng.randint(1, rows))
+                    todo.completed = not todo.completed
+                    todo.save(update_fields=["completed", "updated_at"])
+                local["writes"] += 1
+        except OperationalError as e:
+            local["locked" if "locked" in str(e) else "errors"] += 1
+    connection.close()
+    with lock:
+        for key, value in local.items():
+            counts[key] += value
+
+
+def run(profile, threads, seconds, rows):
+    from todo_project.sqlite import production_database
+
+    if profile == "production":
+        database = production_database(None)
+    else:
+        database = {"ENGINE": "django.db.backends.sqlite3"}
+    setup_django(database=database)
+    seed_todos(rows)
+
+    from django.db import connection
+
+    connection.close()
+    counts = {"reads": 0, "writes": 0, "locked": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=worker, args=(i, deadline, rows, counts, lock))
+        for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return [
+        profile,
+        f"{counts['writes'] / elapsed:,.0f}",
+        f"{counts['reads'] / elapsed:,.0f}",
+        counts["locked"],
+        counts["errors"],
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--profile", choices=PROFILES, action="append")
+    args = parser.parse_args(argv)
+
+    results = [
+        run(profile, args.threads, args.seconds, args.rows)
+        for profile in args.profile or PROFILES
+    ]
+    print_table(["profile", "writes/s", "reads/s", "locked", "other errors"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Time rendering the list fragment at 10, 100 and 1000 rows per page.
+
+    python -m benchmarks.templates --rows-per-page 10 --rows-per-page 1000
+
+Renders ``todos/todo_list_page.html`` the way the list view does, looking
+the template up through the engine on every render, under three engine
+setups:
+
+* ``uncached``: plain filesystem and app loaders with template debugging
+  on, so the template is read and compiled for every render.
+* ``default``: ``settings.TEMPLATES`` as shipped, with ``APP_DIRS`` and
+  template debugging on (from ``DEBUG``). Django caches compiled
+  templates here too.
+* ``production``: ``todo_project.templating.production_templates()``.
+
+Each setup renders the current fragment, which builds row links on
+``todo_url_prefix``, and a copy with the four per-row ``{% url %}`` tags
+it used to have.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.utils import print_table, seed_todos, setup_django, timed
+
+FRAGMENT = "todos/todo_list_page.html"
+URL_TAGS = "bench/todo_list_page_url_tags.html"
+
+# How the fragment linked each row before todo_url_prefix.
+PREFIX_LINKS = {
+    "{{ todo_url_prefix }}{{ todo.pk }}/toggle/": "{% url 'todo_toggle' todo.pk %}",
+    "{{ todo_url_prefix }}{{ todo.pk }}/update/": "{% url 'todo_update' todo.pk %}",
+    "{{ todo_url_prefix }}{{ todo.pk }}/delete/": "{% url 'todo_delete' todo.pk %}",
+    "{{ todo_url_prefix }}{{ todo.pk }}/": "{% url 'todo_detail' todo.pk %}",
+}
+
+
+def write_url_tags_template(directory):
+    """Write the fragment with ``{% url %}`` links into ``directory``."""
+    from django.template.loader import get_template
+
+    source = Path(get_template(FRAGMENT).origin.name).read_text()
+    for prefixed, tag in PREFIX_LINKS.items():
+        if prefixed not in source:
+            raise SystemExit(f"{FRAGMENT} no longer contains {prefixed!r}")
+        source = source.replace(prefixed, tag)
+    path = Path(directory) / URL_TAGS
+    path.parent.mkdir(parents=True)
+    path.write_text(source)
+
+
+def engines(directory):
+    """Return ``{name: template backend}`` for each setup."""
+    from django.conf import settings
+    from todo_project.templating import LOADERS, production_templates
+    from todos.instrumentation import DjangoTemplates
+
+    [default] = settings.TEMPLATES
+    setups = {
+        "uncached": {
+            **default,
+            "APP_DIRS": False,
+            "OPTIONS": {**default["OPTIONS"], "loaders": LOADERS, "debug": True},
+        },
+        # Template debug follows DEBUG, which settings.py turns on.
+        "default": {**default, "OPTIONS": {**default["OPTIONS"], "debug": True}},
+        "production": production_templates([default])[0],
+    }
+    backends = {}
+    for name, params in setups.items():
+        params = {**params, "NAME": name, "DIRS": [directory]}
+        del params["BACKEND"]
+        backends[name] = DjangoTemplates(params)
+    return backends
+
+
+def page_context(rows):
+    from django.core.paginator import Paginator
+    from todos.models import Todo
+    from todos.views import TodoListView, todo_url_prefix
+
+    paginator = Paginator(Todo.objects.only(*TodoListView.fields), rows)
+    page = paginator.page(2)
+    page.object_list = list(page.object_list)
+    return {
+        "paginator": paginator,
+        "page_obj": page,
+        "is_paginated": True,
+        "todos": page.object_list,
+        "todo_url_prefix": todo_url_prefix(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows-per-page", type=int, action="append")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    sizes = args.rows_per_page or [10, 100, 1000]
+
+    setup_django()
+    seed_todos(max(sizes) * 2, description="Something to do " * 20)
+    directory = tempfile.mkdtemp(prefix="todo-bench-templates-")
+    write_url_tags_template(directory)
+    backends = engines(directory)
+
+    results = []
+    for rows in sizes:
+        context = page_context(rows)
+        for setup, backend in backends.items():
+            for links, name in (("{% url %}", URL_TAGS), ("prefix", FRAGMENT)):
+
+                def render():
+                    return backend.get_template(name).render(context)
+
+                render()  # Warm the cache, for the setups that have one.
+                ms = timed(render, repeat=args.repeat)
+                results.append([rows, setup, links, f"{ms:.2f}"])
+    print_table(["rows", "engine", "links", "ms/render"], results)
+
+
+if __name__ == "__main__":
+    main()
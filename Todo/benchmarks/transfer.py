@@ -0,0 +1,69 @@
+"""Measure export_todos / import_todos throughput and memory.
+
+    python -m benchmarks.transfer --rows 1000000
+
+Peak RSS should stay roughly flat as --rows grows, since both directions
+stream.
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.utils import print_table, seed_todos, setup_django
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--description", default="lorem ipsum dolor sit amet " * 8)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.db import connection
+
+    from todos import transfer
+    from todos.models import Todo
+
+    seed_todos(args.rows, description=args.description)
+    workdir = Path(tempfile.mkdtemp(prefix="todo-transfer-"))
+    results = []
+    for fmt in transfer.FORMATS:
+        path = workdir / f"todos.{fmt}"
+        started = time.perf_counter()
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            transfer.export_rows(out, fmt)
+        export_s = time.perf_counter() - started
+
+        # A plain DELETE: QuerySet.delete() would load every row to send signals.
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {Todo._meta.db_table}")
+        started = time.perf_counter()
+        with open(path, newline="", encoding="utf-8") as stream:
+            transfer.import_records(transfer.read_records(stream, fmt), keep_ids=True)
+        import_s = time.perf_counter() - started
+
+        results.append(
+            (
+                fmt,
+                f"{path.stat().st_size / 1e6:.0f}",
+                f"{args.rows / export_s:,.0f}",
+                f"{args.rows / import_s:,.0f}",
+                f"{peak_rss_mb():.0f}",
+            )
+        )
+
+    print(f"{args.rows} rows")
+    print_table(
+        ("format", "file MB", "export rows/s", "import rows/s", "peak RSS MB"), results
+    )
+
+
+if __name__ == "__main__":
+    main()
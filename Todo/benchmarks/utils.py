@@ -0,0 +1,105 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def setup_django(db_path=None, database=None):
+    """Configure Django against a fresh SQLite file and migrate it.
+
+    ``database`` optionally replaces the ``default`` database settings,
+    for example with a profile from ``todo_project.sqlite``; its ``NAME``
+    is overridden. Returns the path of the database file.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_project.settings")
+    from django.apps import apps
+    from django.conf import settings
+    from django.db import connections
+
+    if apps.ready:
+        # Called again for another dataset: drop the old connection.
+        connections["default"].close()
+        del connections["default"]
+
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp(prefix="todo-bench-")) / "bench.sqlite3"
+    if database is not None:
+        settings.DATABASES["default"] = dict(database)
+        connections.settings = connections.configure_settings(settings.DATABASES)
+    settings.DATABASES["default"]["NAME"] = db_path
+    # DEBUG keeps a log of every query, which skews time and memory.
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["*"]
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+    return db_path
+
+
+def seed_todos(rows, batch_size=5000, description="", completed_every=3):
+    """Insert ``rows`` todos, one second apart, the newest created now.
+
+    ``description`` is either a string used for every row or a callable
+    taking the row number.
+    """
+    from django.db import connection, transaction
+
+    from todos.models import Todo
+
+    with transaction.atomic():
+        for offset in range(0, rows, batch_size):
+            Todo.objects.bulk_create(
+                Todo(
+                    title=f"Todo {i}",
+                    description=(
+                        description(i) if callable(description) else description
+                    ),
+                    completed=(i % completed_every == 0),
+                )
+                for i in range(offset, min(offset + batch_size, rows))
+            )
+        # auto_now_add overrides explicit values, so spread timestamps with SQL.
+        top = Todo.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Todo._meta.db_table} "
+                "SET created_at = datetime('now', '-' || (%s - id) || ' seconds')",
+                [top],
+            )
+
+
+def timed(fn, repeat=5):
+    """Call ``fn`` ``repeat`` times and return the median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Return ``{"p50": ms, ...}`` for latency ``samples`` in seconds."""
+    if len(samples) < 2:
+        samples = list(samples) * 2
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{point}": cuts[point - 1] * 1000 for point in points}
+
+
+def print_table(headers, rows):
+    """Print ``rows`` as a fixed-width text table."""
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows)) if rows else len(str(h))
+        for i, h in enumerate(headers)
+    ]
+    line = "  ".join(str(h).rjust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
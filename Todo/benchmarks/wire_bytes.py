@@ -0,0 +1,80 @@
+"""Report the bytes on the wire for a list page, before and after compression.
+
+    python -m benchmarks.wire_bytes --rows 100
+
+Seeds ``--rows`` todos, collects static files with
+``CompressedManifestStaticFilesStorage`` and loads the first list page
+(10 todos) with its stylesheet, counting response body bytes (Bootstrap
+comes from a CDN and is left out):
+
+* ``before``: the page as it used to be sent on every visit, uncompressed
+  with its CSS inlined; counted as the plain HTML plus the plain CSS.
+* ``after, first visit``: gzipped HTML plus the precompressed stylesheet.
+* ``after, repeat visit``: gzipped HTML only; the hashed stylesheet is
+  cached for a year.
+"""
+
+import argparse
+import tempfile
+
+from benchmarks.utils import print_table, seed_todos, setup_django
+
+
+def collect_static():
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.STATIC_ROOT = tempfile.mkdtemp(prefix="todo-bench-static-")
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "todo_project.staticfiles.CompressedManifestStaticFilesStorage"
+        },
+    }
+    call_command("collectstatic", "--noinput", "--ignore", "admin", verbosity=0)
+
+
+def body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    seed_todos(args.rows, description="Pick up groceries on the way home " * 8)
+    collect_static()
+
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.test import Client, RequestFactory
+    from django.urls import reverse
+
+    from todo_project import staticfiles
+
+    url = reverse("todo_list")
+    css = staticfiles_storage.stored_name("todos/todos.css")
+
+    def page(**headers):
+        return body_size(Client().get(url, headers=headers))
+
+    def stylesheet(**headers):
+        request = RequestFactory().get(f"/static/{css}", headers=headers)
+        return body_size(staticfiles.serve(request, css))
+
+    gzip = {"accept-encoding": "gzip"}
+    html, css_bytes = page(), stylesheet()
+    html_gz, css_gz = page(**gzip), stylesheet(**gzip)
+    rows = [
+        ["before", f"{html + css_bytes:,}", "inline", f"{html + css_bytes:,}"],
+        ["after, first visit", f"{html_gz:,}", f"{css_gz:,}", f"{html_gz + css_gz:,}"],
+        ["after, repeat visit", f"{html_gz:,}", "cached", f"{html_gz:,}"],
+    ]
+    print_table(["visit", "HTML bytes", "CSS bytes", "total bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare direct toggles and edits with the write-behind queue.
+
+    python -m benchmarks.write_behind --threads 16 --seconds 5
+
+Worker threads stand in for concurrent requests: each repeatedly toggles
+a random todo or updates its title, for ``--seconds``. ``direct`` commits
+every write on its own, like the views do by default; ``write-behind``
+hands them to ``todos.write_behind`` and waits for the batch to commit,
+like the views do with ``TODOS_WRITE_BEHIND`` on. The report shows
+committed writes per second, latency percentiles, failed writes and,
+for the queue, the average batch size.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from benchmarks.utils import percentiles, print_table, seed_todos, setup_django
+
+MODES = ("direct", "write-behind")
+
+
+def direct_write(pk, fields):
+    from todos import page_cache
+    from todos.models import Todo
+
+    todos = Todo.objects.filter(pk=pk)
+    if fields is None:
+        todos.toggle_completed()
+    else:
+        # What TodoUpdateView's form.save() costs: a lookup and a save.
+        todo = todos.get()
+        for name, value in fields.items():
+            setattr(todo, name, value)
+        todo.save()
+    page_cache.bump_generation()
+
+
+def worker(seed, write, deadline, rows, results, lock):
+    from django.db import OperationalError, connection
+
+    rng = random.Random(seed)
+    latencies = []
+    failed = 0
+    while time.perf_counter() < deadline:
+        pk = rng.randint(1, rows)
+        fields = None if rng.random() < 0.8 else {"title": f"Edited {seed}"}
+        started = time.perf_counter()
+        try:
+            write(pk, fields)
+        except OperationalError:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+    with lock:
+        results["latencies"].extend(latencies)
+        results["failed"] += failed
+
+
+def run(mode, threads, seconds, rows, interval, profile):
+    from todo_project.sqlite import production_database
+
+    if profile:
+        database = production_database(None)
+    else:
+        database = {"ENGINE": "django.db.backends.sqlite3"}
+    setup_django(database=database)
+    seed_todos(rows)
+
+    from django.db import connection
+
+    from todos.write_behind import WriteBehindQueue
+
+    connection.close()
+    write_queue = None
+    write = direct_write
+    if mode == "write-behind":
+        write_queue = WriteBehindQueue(interval=interval / 1000)
+
+        def write(pk, fields):
+            write_queue.submit(pk, fields).result(30)
+
+    results = {"latencies": [], "failed": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=worker, args=(i, write, deadline, rows, results, lock))
+        for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    batch = "-"
+    if write_queue is not None:
+        write_queue.close()
+        batch = f"{write_queue.operations / max(write_queue.batches, 1):.1f}"
+    latencies = results["latencies"]
+    stats = percentiles(latencies) if latencies else {"p50": 0, "p95": 0}
+    return [
+        mode,
+        f"{len(latencies) / elapsed:,.0f}",
+        f"{stats['p50']:.1f}",
+        f"{stats['p95']:.1f}",
+        results["failed"],
+        batch,
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--interval", type=float, default=2, help="Queue interval in ms."
+    )
+    parser.add_argument("--sqlite-profile", action="store_true")
+    parser.add_argument("--mode", choices=MODES, action="append")
+    args = parser.parse_args(argv)
+
+    results = [
+        run(
+            mode,
+            args.threads,
+            args.seconds,
+            args.rows,
+            args.interval,
+            args.sqlite_profile,
+        )
+        for mode in args.mode or MODES
+    ]
+    print_table(
+        ["mode", "writes/s", "p50 ms", "p95 ms", "failed", "ops/batch"], results
+    )
+
+
+if __name__ == "__main__":
+    main()
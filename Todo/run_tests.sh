@@ -1,5 +1,11 @@
 #!/bin/bash
 # Quick test runner script
+#
+#   ./run_tests.sh              # all tests, one xdist worker per core
+#   ./run_tests.sh -n 1         # serially, to compare
+#   ./run_tests.sh -m "not large"   # skip the large dataset tier
+#
+# Extra arguments are passed to pytest.
 
 echo "================================"
 echo "Todo App - Test Suite"
@@ -9,22 +15,40 @@ echo ""
 # Activate virtual environment
 source .venv/bin/activate
 
+WORKERS=()
+if python -c "import xdist" 2>/dev/null; then
+    # loadscope keeps each test class on one worker, so class-scoped
+    # fixtures like large_todos are seeded once.
+    WORKERS=(-n auto --dist loadscope)
+else
+    echo "⚠️  pytest-xdist is not installed; running serially."
+    echo ""
+fi
+
 echo "📊 Running all tests with coverage..."
 echo ""
 
+STARTED=$(date +%s%N)
 pytest todos/tests/ \
+    "${WORKERS[@]}" \
     --cov=todos \
     --cov-report=html \
     --cov-report=term-missing \
-    --verbose
+    --durations=10 \
+    --verbose \
+    "$@"
+STATUS=$?
+ELAPSED_MS=$(( ($(date +%s%N) - STARTED) / 1000000 ))
 
 echo ""
 echo "================================"
 echo "Test Summary"
 echo "================================"
 echo ""
+printf "⏱️  Wall-clock time: %d.%03ds on %s cores\n" $((ELAPSED_MS / 1000)) $((ELAPSED_MS % 1000)) "$(nproc)"
 echo "✅ Coverage HTML Report: htmlcov/index.html"
 echo "Run: open htmlcov/index.html"
 echo ""
 echo "📚 Testing Documentation: TESTING.md"
 echo ""
+exit $STATUS
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todo_project.settings')
+# Use the native async todo views; see todos/async_views.py.
+os.environ.setdefault('TODOS_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
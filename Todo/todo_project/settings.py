@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from datetime import timedelta
 from pathlib import Path
 
+from .sqlite import production_database
+from .templating import production_templates
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,20 +46,45 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its query/time measurements cover the whole request.
+    "todos.middleware.BudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Before anything else that reads or changes the response body.
+    "todos.middleware.HTMLGZipMiddleware",
+    "todos.middleware.FullStackSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "todos.middleware.FullStackAuthenticationMiddleware",
+    "todos.middleware.FullStackMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "todos.middleware.ReplicaStickinessMiddleware",
 ]
 
+# Paths served without the session, auth and message middleware (the
+# FullStack* entries above), which the todo views don't use; /admin/ keeps
+# them. CSRF stays on for these paths, with the token in a cookie, so
+# CSRF_USE_SESSIONS must stay off. Set TODOS_LEAN_PATHS=0 to disable.
+TODOS_LEAN_PATHS = [] if os.environ.get("TODOS_LEAN_PATHS") == "0" else ["/todos/"]
+CSRF_USE_SESSIONS = False
+
+# HTML responses of at least this many bytes are gzipped for clients that
+# accept it.
+TODOS_GZIP_MIN_LENGTH = 1024
+
+# Opt-in Server-Timing headers (db, template, total) and sampled cProfile
+# dumps of TODOS_PROFILE_SAMPLE_RATE of the requests into TODOS_PROFILE_DIR.
+# Summarize the dumps with "python manage.py summarize_profiles".
+if os.environ.get("TODOS_SERVER_TIMING") == "1":
+    MIDDLEWARE.insert(0, "todos.middleware.ServerTimingMiddleware")
+TODOS_PROFILE_SAMPLE_RATE = float(os.environ.get("TODOS_PROFILE_SAMPLE_RATE", 0))
+TODOS_PROFILE_DIR = BASE_DIR / "profiles"
+
 ROOT_URLCONF = "todo_project.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django's backend, plus per-request render timing for the budgets.
+        "BACKEND": "todos.instrumentation.DjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -67,6 +97,12 @@ TEMPLATES = [
     },
 ]
 
+# Set TODOS_TEMPLATE_PROFILE=production to compile templates once through
+# explicit cached loaders, with template debugging off; see
+# todo_project/templating.py.
+if os.environ.get("TODOS_TEMPLATE_PROFILE") == "production":
+    TEMPLATES = production_templates(TEMPLATES)
+
 WSGI_APPLICATION = "todo_project.wsgi.application"
 
 
@@ -80,6 +116,87 @@ DATABASES = {
     }
 }
 
+# Set TODOS_SQLITE_PROFILE=production to serve from WAL mode with tuned
+# pragmas and persistent connections; see todo_project/sqlite.py.
+if os.environ.get("TODOS_SQLITE_PROFILE") == "production":
+    DATABASES["default"] = production_database(BASE_DIR / "db.sqlite3")
+
+# Set TODOS_SHARDS=N to spread todos over N SQLite files, db.sqlite3 and
+# db.shard1.sqlite3 on, so their writes don't queue for one lock; migrate
+# them with "python manage.py migrate_shards". See todos/sharding.py.
+TODOS_SHARDS = ["default"]
+for i in range(1, int(os.environ.get("TODOS_SHARDS", 1))):
+    DATABASES[f"shard{i}"] = dict(
+        DATABASES["default"], NAME=BASE_DIR / f"db.shard{i}.sqlite3"
+    )
+    TODOS_SHARDS.append(f"shard{i}")
+
+# Set TODOS_REPLICA=1 to serve the todo list and detail pages from a copy
+# of each database (db.replica.sqlite3, db.shard1_replica.sqlite3...),
+# refreshed by "python manage.py sync_replica --every 1". A client that
+# writes reads from the primary for the next TODOS_REPLICA_STICKY_SECONDS.
+# See todos/replica.py.
+TODOS_REPLICAS = {}
+if os.environ.get("TODOS_REPLICA") == "1":
+    for alias in TODOS_SHARDS:
+        name = "replica" if alias == "default" else f"{alias}_replica"
+        TODOS_REPLICAS[alias] = name
+        DATABASES[name] = dict(DATABASES[alias], NAME=BASE_DIR / f"db.{name}.sqlite3")
+TODOS_REPLICA_STICKY_SECONDS = 5
+
+DATABASE_ROUTERS = ["todos.sharding.ShardRouter", "todos.replica.ReplicaRouter"]
+
+
+# Serve the todo list, detail and toggle views as native async views.
+# todo_project/asgi.py turns this on; WSGI keeps the sync views.
+TODOS_ASYNC_VIEWS = os.environ.get("TODOS_ASYNC_VIEWS", "") == "1"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Rendered todo list pages are cached for this many seconds (0 disables).
+# Any write to a todo invalidates them immediately, but only in the cache
+# it wrote to: the generation counter lives in TODOS_PAGE_CACHE_ALIAS. So
+# the cache is off by default, and should only be turned on, e.g. with
+# TODOS_PAGE_CACHE_TIMEOUT=300, once that alias is a cache every worker
+# process shares (Redis, Memcached, the database or file-based cache).
+# With the local-memory cache above, each process would keep serving its
+# own pages after another process's writes.
+TODOS_PAGE_CACHE_TIMEOUT = int(os.environ.get("TODOS_PAGE_CACHE_TIMEOUT", "0"))
+TODOS_PAGE_CACHE_ALIAS = "default"
+
+# Set TODOS_WRITE_BEHIND=1 to commit toggles and edits in batches from a
+# background thread, every TODOS_WRITE_BEHIND_INTERVAL ms or
+# TODOS_WRITE_BEHIND_BATCH_SIZE writes; see todos/write_behind.py.
+TODOS_WRITE_BEHIND = os.environ.get("TODOS_WRITE_BEHIND", "") == "1"
+TODOS_WRITE_BEHIND_INTERVAL = 2
+TODOS_WRITE_BEHIND_BATCH_SIZE = 200
+
+# Deleted todos are only marked deleted; purge_deleted_todos removes those
+# deleted over TODOS_PURGE_AFTER ago, TODOS_PURGE_CHUNK_SIZE rows per
+# transaction and at most TODOS_PURGE_RATE rows/s; see todos/purge.py.
+TODOS_PURGE_AFTER = timedelta(days=7)
+TODOS_PURGE_CHUNK_SIZE = 500
+TODOS_PURGE_RATE = 2000
+
+# archive_todos moves todos completed and unchanged for TODOS_ARCHIVE_AFTER
+# into todos_todoarchive, TODOS_ARCHIVE_CHUNK_SIZE rows per transaction and
+# at most TODOS_ARCHIVE_RATE rows/s; see todos/archive.py.
+TODOS_ARCHIVE_AFTER = timedelta(days=30)
+TODOS_ARCHIVE_CHUNK_SIZE = 500
+TODOS_ARCHIVE_RATE = 2000
+
+# Per-URL query and time budgets, merged over todos.budgets.DEFAULT_BUDGETS.
+# Requests over budget are logged to the "todos.budgets" logger.
+TODOS_BUDGETS = {}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,6 +233,21 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Set TODOS_STATIC_PROFILE=production to collect static files under hashed
+# names with gzipped copies, and serve them from STATIC_ROOT with
+# far-future cache headers; run "python manage.py collectstatic" first.
+# See todo_project/staticfiles.py.
+TODOS_SERVE_STATIC = False
+if os.environ.get("TODOS_STATIC_PROFILE") == "production":
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "todo_project.staticfiles.CompressedManifestStaticFilesStorage"
+        },
+    }
+    TODOS_SERVE_STATIC = True
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
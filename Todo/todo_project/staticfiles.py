@@ -0,0 +1,108 @@
+"""Hashed, precompressed static files and a view that serves them.
+
+With ``TODOS_STATIC_PROFILE=production``, ``collectstatic`` goes through
+``CompressedManifestStaticFilesStorage``: every file is copied under a
+name with a hash of its content (``todos.css`` becomes
+``todos.4f1c2e8a9b3d.css``), and text files also get a gzipped copy next
+to the hashed one (``todos.4f1c2e8a9b3d.css.gz``), compressed once at
+deploy time.
+
+``serve()`` serves ``STATIC_ROOT`` for deployments without a front-end
+server doing it. It sends the ``.gz`` copy to clients that accept gzip,
+and marks hashed files cacheable for a year: a changed file gets a new
+name, so a cached one never goes stale. A web server can do the same
+with the ``.gz`` files (nginx's ``gzip_static on``, for one).
+"""
+
+import gzip
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.http import Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import content_disposition_header
+from django.views import static
+
+# Text formats that shrink when gzipped; images and fonts are already
+# compressed.
+COMPRESSIBLE = {".css", ".js", ".mjs", ".map", ".svg", ".txt", ".json", ".html"}
+# Files smaller than this gain nothing from compression.
+MIN_SIZE = 256
+
+# Hashed names get this max-age; anything else is revalidated.
+FAR_FUTURE = 365 * 24 * 60 * 60
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def compress(path):
+    """Write ``path.gz`` next to ``path`` if it saves bytes.
+
+    Returns whether it did.
+    """
+    path = Path(path)
+    if path.suffix not in COMPRESSIBLE or path.stat().st_size < MIN_SIZE:
+        return False
+    data = path.read_bytes()
+    # mtime=0 keeps the output identical between deploys.
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data):
+        return False
+    path.with_name(path.name + ".gz").write_bytes(compressed)
+    return True
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """``ManifestStaticFilesStorage`` that also gzips the hashed files."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and processed and not isinstance(processed, Exception):
+                hashed.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed):
+            if compress(self.path(hashed_name)):
+                yield hashed_name, hashed_name + ".gz", True
+
+
+def is_hashed(path):
+    """Return whether ``path`` is a content-hashed name from the manifest."""
+    hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+    return path in hashed_files.values()
+
+
+def serve(request, path):
+    """Serve ``path`` from ``STATIC_ROOT``, precompressed and cached."""
+    root = settings.STATIC_ROOT
+    if not root:
+        raise Http404("STATIC_ROOT is not set.")
+    response = None
+    if ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+        try:
+            # Served as the original type with Content-Encoding: gzip.
+            response = static.serve(request, path + ".gz", document_root=root)
+        except Http404:
+            pass
+        else:
+            response["Content-Disposition"] = content_disposition_header(
+                False, Path(path).name
+            )
+    if response is None:
+        response = static.serve(request, path, document_root=root)
+    if Path(path).suffix in COMPRESSIBLE:
+        patch_vary_headers(response, ["Accept-Encoding"])
+    if is_hashed(path):
+        patch_cache_control(response, public=True, max_age=FAR_FUTURE, immutable=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
@@ -15,10 +15,19 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from . import staticfiles
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("todos/", include("todos.urls")),
 ]
+
+if settings.TODOS_SERVE_STATIC:
+    prefix = re.escape(settings.STATIC_URL.lstrip("/"))
+    urlpatterns.append(re_path(rf"^{prefix}(?P<path>.*)$", staticfiles.serve))
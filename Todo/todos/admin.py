@@ -1,5 +1,6 @@
-from django.contrib import admin
-from .models import Todo
+from django.contrib import admin, messages
+from .models import Todo, TodoArchive
+from . import bulk, search
 
 
 @admin.register(Todo)
@@ -8,6 +9,7 @@ class TodoAdmin(admin.ModelAdmin):
     list_filter = ("completed", "created_at")
     search_fields = ("title", "description")
     readonly_fields = ("created_at", "updated_at")
+    actions = ("mark_completed", "mark_pending", "delete_in_batches")
     fieldsets = (
         ("Task Information", {"fields": ("title", "description")}),
         ("Status", {"fields": ("completed",)}),
@@ -16,3 +18,49 @@ class TodoAdmin(admin.ModelAdmin):
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the full-text index, best matches first.
+
+        The rank ordering from ``search.search`` takes precedence over the
+        changelist ordering.
+        """
+        if not search_term.strip() or not search.is_supported():
+            return super().get_search_results(request, queryset, search_term)
+        return search.search(queryset, search_term), False
+
+    @admin.action(
+        description="Mark selected todos as completed", permissions=["change"]
+    )
+    def mark_completed(self, request, queryset):
+        ids = queryset.values_list("pk", flat=True)
+        updated = bulk.bulk_set_completed(ids, completed=True)
+        self.message_user(request, f"{updated} todos marked as completed.")
+
+    @admin.action(description="Mark selected todos as pending", permissions=["change"])
+    def mark_pending(self, request, queryset):
+        ids = queryset.values_list("pk", flat=True)
+        updated = bulk.bulk_set_completed(ids, completed=False)
+        self.message_user(request, f"{updated} todos marked as pending.")
+
+    @admin.action(
+        description="Delete selected todos in batches", permissions=["delete"]
+    )
+    def delete_in_batches(self, request, queryset):
+        deleted = bulk.bulk_delete(queryset.values_list("pk", flat=True))
+        self.message_user(request, f"{deleted} todos deleted.", messages.SUCCESS)
+
+
+@admin.register(TodoArchive)
+class TodoArchiveAdmin(admin.ModelAdmin):
+    """Archived todos, read-only; ``archive_todos`` moves them here."""
+
+    list_display = ("title", "created_at", "updated_at", "archived_at")
+    list_filter = ("archived_at",)
+    search_fields = ("title",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
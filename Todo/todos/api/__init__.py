@@ -0,0 +1 @@
+"""JSON API for todos, mounted under ``/todos/api/``."""
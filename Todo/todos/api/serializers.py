@@ -0,0 +1,23 @@
+"""Field projection and JSON serialization of todos."""
+
+FIELDS = ("id", "title", "description", "completed", "created_at", "updated_at")
+
+
+def parse_fields(value):
+    """Return the fields named in a ``?fields=`` value, in ``FIELDS`` order.
+
+    An empty value selects every field. Raises ``ValueError`` for unknown
+    field names.
+    """
+    if not value:
+        return FIELDS
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return tuple(name for name in FIELDS if name in requested)
+
+
+def serialize(todo, fields=FIELDS):
+    """Return ``fields`` of ``todo`` as a dict ready for ``JsonResponse``."""
+    return {name: getattr(todo, name) for name in fields}
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("todos/", views.TodoCollectionView.as_view(), name="todo_list"),
+    path("todos/export/", views.TodoExportView.as_view(), name="todo_export"),
+    path("todos/<int:pk>/", views.TodoResourceView.as_view(), name="todo_detail"),
+    path("todos/<int:pk>/toggle/", views.TodoToggleView.as_view(), name="todo_toggle"),
+    path("replica/", views.ReplicaStatusView.as_view(), name="replica_status"),
+]
@@ -0,0 +1,199 @@
+"""JSON views for todos.
+
+Every view accepts ``?fields=id,title,...`` to choose the fields returned;
+only those columns (plus whatever pagination needs) are loaded, so
+``description`` is never read unless asked for. Like the bulk endpoints,
+writes skip the CSRF token, so every method other than GET, HEAD, OPTIONS
+and TRACE must be sent as ``application/json``, body or not: browsers
+won't send that cross-site without a CORS preflight, while a plain HTML
+form can post anywhere.
+"""
+
+import json
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from .. import page_cache, replica, search, sharding
+from ..forms import TodoForm
+from ..models import Todo
+from ..pagination import InvalidCursor, KeysetPaginator
+from ..views import json_body
+from .serializers import parse_fields, serialize
+
+# Fields the keyset cursor is built from, loaded whatever was asked for.
+CURSOR_FIELDS = ("id", "created_at")
+
+
+def error(message, status=400):
+    return JsonResponse({"errors": {"__all__": [message]}}, status=status)
+
+
+def not_found():
+    return JsonResponse({"detail": "Not found."}, status=404)
+
+
+def form_errors(form):
+    return JsonResponse(
+        {"errors": {field: list(messages) for field, messages in form.errors.items()}},
+        status=400,
+    )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ApiView(View):
+    """Base view turning bad input into 400 and missing todos into 404."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in replica.SAFE_METHODS
+            and request.content_type != "application/json"
+        ):
+            return error("Expected an application/json request.")
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Todo.DoesNotExist:
+            return not_found()
+        except (InvalidCursor, ValueError, TypeError) as e:
+            return error(str(e))
+
+    def get_fields(self):
+        return parse_fields(self.request.GET.get("fields", ""))
+
+    def get_int_param(self, name, default, maximum):
+        value = int(self.request.GET.get(name, default))
+        if not 1 <= value <= maximum:
+            raise ValueError(f"'{name}' must be between 1 and {maximum}.")
+        return value
+
+    def save_form(self, data, instance=None, status=200):
+        form = TodoForm(data=data, instance=instance)
+        if not form.is_valid():
+            return form_errors(form)
+        return JsonResponse(serialize(form.save()), status=status)
+
+
+class TodoCollectionView(ApiView):
+    """List todos newest first, or create one."""
+
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        fields = self.get_fields()
+        queryset = Todo.objects.only(*set(fields).union(CURSOR_FIELDS))
+        query = request.GET.get("q", "").strip()
+        if query:
+            # Ranked results can't be cursor-paginated; return the top matches.
+            queryset = sharding.scatter(search.search(queryset, query))
+            todos = list(queryset[: self.get_limit()])
+            next_cursor = previous_cursor = None
+        else:
+            queryset = sharding.scatter(queryset)
+            page = KeysetPaginator(queryset, self.get_limit()).page(
+                request.GET.get("cursor")
+            )
+            todos = page.object_list
+            next_cursor, previous_cursor = page.next_cursor, page.previous_cursor
+        return JsonResponse(
+            {
+                "results": [serialize(todo, fields) for todo in todos],
+                "next": next_cursor,
+                "previous": previous_cursor,
+            }
+        )
+
+    def get_limit(self):
+        return self.get_int_param("limit", self.default_limit, self.max_limit)
+
+    def post(self, request):
+        return self.save_form(json_body(request), status=201)
+
+
+class TodoResourceView(ApiView):
+    """Read, replace, partially update or delete one todo, on its shard."""
+
+    def get(self, request, pk):
+        fields = self.get_fields()
+        todo = sharding.for_pk(pk).only(*fields).get(pk=pk)
+        return JsonResponse(serialize(todo, fields))
+
+    def put(self, request, pk):
+        return self.save_form(json_body(request), sharding.for_pk(pk).get(pk=pk))
+
+    def patch(self, request, pk):
+        todo = sharding.for_pk(pk).get(pk=pk)
+        data = {name: getattr(todo, name) for name in TodoForm.Meta.fields}
+        data.update(json_body(request))
+        return self.save_form(data, todo)
+
+    def delete(self, request, pk):
+        sharding.for_pk(pk).get(pk=pk).delete()
+        return HttpResponse(status=204)
+
+
+class TodoToggleView(ApiView):
+    """Flip ``completed`` atomically and return the todo."""
+
+    def post(self, request, pk):
+        if not sharding.for_pk(pk).filter(pk=pk).toggle_completed():
+            return not_found()
+        page_cache.bump_generation(sharding.db_for_pk(pk))
+        fields = self.get_fields()
+        todo = sharding.for_pk(pk).only(*fields).get(pk=pk)
+        return JsonResponse(serialize(todo, fields))
+
+
+class TodoExportView(ApiView):
+    """Stream every todo as newline-delimited JSON, in constant memory.
+
+    Rows are read with ``.values().iterator()`` in ``?chunk_size=`` batches
+    and written out as they arrive, so memory use doesn't grow with the
+    table. Shards are read one after the other, which keeps the rows in id
+    order.
+    """
+
+    default_chunk_size = 2000
+    max_chunk_size = 10000
+
+    def get(self, request):
+        fields = self.get_fields()
+        chunk_size = self.get_int_param(
+            "chunk_size", self.default_chunk_size, self.max_chunk_size
+        )
+        rows = chain.from_iterable(
+            Todo.objects.using(alias)
+            .order_by("pk")
+            .values(*fields)
+            .iterator(chunk_size)
+            for alias in sharding.get_shards()
+        )
+        response = StreamingHttpResponse(
+            (json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = 'attachment; filename="todos.ndjson"'
+        return response
+
+
+class ReplicaStatusView(ApiView):
+    """Report how far each read replica is behind, and who reads from it.
+
+    ``replicas`` has ``replica.get_status()`` for each primary; ``reads``
+    counts the list and detail requests this process served from a
+    replica, and from the primary because the client had just written.
+    """
+
+    def get(self, request):
+        return JsonResponse(
+            {
+                "replicas": [
+                    replica.get_status(primary) for primary in replica.get_replicas()
+                ],
+                "reads": replica.stats.as_dict(),
+            }
+        )
@@ -0,0 +1,145 @@
+"""Move old completed todos out of ``todos_todo`` into an archive table.
+
+Completed todos that haven't changed for ``TODOS_ARCHIVE_AFTER`` (default
+30 days) are rarely looked at again, but every list query, count and
+index seek on ``todos_todo`` pays for them. ``archive()``, which the
+``archive_todos`` command runs from cron or in a loop of its own, moves
+them into ``todos_todoarchive`` in transactions of ``chunk_size`` rows at
+up to ``rate`` rows per second, as ``todos.purge`` does for deleted todos.
+The live table then only grows with the todos still in use.
+
+Archived todos keep their ids. The detail page falls back to the archive
+when a todo isn't in ``todos_todo``, and ``with_archived()`` gives the
+list page its "include archived" view with ``?archived=1``. Archived
+todos are no longer searched, toggled or edited, and the counters row
+counts them in ``archived`` rather than ``total`` and ``completed``.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Value
+from django.utils import timezone
+
+from . import page_cache, search
+from .models import Todo, TodoArchive
+from .transfer import Progress
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_RATE = 2000
+DEFAULT_AGE = timedelta(days=30)
+
+ARCHIVED_FIELDS = [
+    field.name
+    for field in TodoArchive._meta.concrete_fields
+    if field.name != "archived_at"
+]
+
+
+def get_chunk_size():
+    return getattr(settings, "TODOS_ARCHIVE_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def get_rate():
+    """Return the most rows per second to archive; 0 means no limit."""
+    return getattr(settings, "TODOS_ARCHIVE_RATE", DEFAULT_RATE)
+
+
+def get_age():
+    """Return how long a todo stays completed and unchanged before it's archived."""
+    return getattr(settings, "TODOS_ARCHIVE_AFTER", DEFAULT_AGE)
+
+
+def archivable(before, using=DEFAULT_DB_ALIAS):
+    """Return the completed todos last changed before ``before``, oldest first."""
+    return (
+        Todo.objects.using(using)
+        .filter(completed=True, updated_at__lt=before)
+        .order_by("updated_at")
+    )
+
+
+def archive_chunk(before, chunk_size, using=DEFAULT_DB_ALIAS):
+    """Move up to ``chunk_size`` archivable todos in one transaction.
+
+    Returns the number of todos archived.
+    """
+    # Picked outside the transaction, so it only holds the write lock
+    # for the copy and the delete.
+    pks = list(archivable(before, using).values_list("pk", flat=True)[:chunk_size])
+    if not pks:
+        return 0
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        # Filtered again in case a todo was reopened or edited meanwhile.
+        rows = list(
+            archivable(before, using).filter(pk__in=pks).values(*ARCHIVED_FIELDS)
+        )
+        if not rows:
+            return 0
+        TodoArchive.objects.using(using).bulk_create(
+            TodoArchive(**row, archived_at=now) for row in rows
+        )
+        moved = Todo.all_objects.using(using).filter(pk__in=[row["id"] for row in rows])
+        # Marked deleted first, so the delete signal doesn't bump the page
+        # cache generation once per row; it's bumped once below instead.
+        moved.update(deleted_at=now)
+        moved.only("pk", "deleted_at").hard_delete()
+        page_cache.bump_generation(using)
+    return len(rows)
+
+
+def archive(
+    older_than=None,
+    chunk_size=None,
+    rate=None,
+    using=DEFAULT_DB_ALIAS,
+    report=None,
+    sleep=time.sleep,
+):
+    """Archive todos completed and unchanged for more than ``older_than``.
+
+    Works in transactions of ``chunk_size`` rows, sleeping after each one
+    as long as it takes to keep to ``rate`` rows per second (``0`` for no
+    limit). The defaults come from the ``TODOS_ARCHIVE_*`` settings.
+    If any were, the search index is merged afterwards, or searches would
+    keep reading past the archived rows. Returns a ``transfer.Progress``
+    with the rows archived.
+    """
+    older_than = get_age() if older_than is None else older_than
+    chunk_size = chunk_size or get_chunk_size()
+    rate = get_rate() if rate is None else rate
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    before = timezone.now() - older_than
+    progress = Progress(report)
+    while True:
+        started = time.perf_counter()
+        archived = archive_chunk(before, chunk_size, using)
+        if not archived:
+            break
+        progress.add(
+            archived, f"archiving todos completed before {before:%Y-%m-%d %H:%M}"
+        )
+        if rate:
+            sleep(max(archived / rate - (time.perf_counter() - started), 0))
+    if progress.rows:
+        search.optimize(connections[using])
+    return progress
+
+
+def with_archived(queryset, fields):
+    """Return ``queryset``'s todos followed by the archived ones, newest first.
+
+    One ``UNION ALL`` of ``queryset.only(*fields)`` and the archive, run on
+    ``queryset``'s database. Every row is a ``Todo``; archived ones have
+    ``is_archived`` set. The result can be sliced and counted, but not
+    filtered any further.
+    """
+    live = queryset.order_by().only(*fields).annotate(is_archived=Value(False))
+    archived = (
+        TodoArchive.objects.order_by().only(*fields).annotate(is_archived=Value(True))
+    )
+    return live.union(archived, all=True).order_by("-created_at", "-id")
@@ -0,0 +1,177 @@
+"""Native async versions of the list, detail and toggle views.
+
+Under ASGI a sync view runs in a worker thread handed off through
+``sync_to_async``. These views stay on the event loop and query through
+the async ORM (``aaggregate``, ``aget``, ``async for``) instead. They
+render the same templates, share the page cache and answer conditional
+GETs exactly like their sync counterparts in ``todos/views.py``.
+
+``todos/urls.py`` routes to them when ``TODOS_ASYNC_VIEWS`` is set, which
+``todo_project/asgi.py`` does by default.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Count, Max
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.views import View
+
+from . import archive, page_cache, replica, search, sharding, write_behind
+from .models import Todo, TodoArchive
+from .pagination import InvalidCursor, KeysetPaginator
+from .views import (
+    TodoDetailView,
+    TodoListView,
+    add_archived,
+    detail_etag,
+    get_list_counts,
+    get_pagination_mode,
+    get_search_query,
+    include_archived,
+    list_etag,
+    not_modified,
+    set_validators,
+    todo_url_prefix,
+)
+
+
+class AsyncTodoListView(View):
+    """Display all todos; async version of ``TodoListView``.
+
+    The ETag query also counts the rows, so offset pagination reuses that
+    count instead of running its own ``COUNT(*)``.
+    """
+
+    template_name = TodoListView.template_name
+    fragment_template_name = TodoListView.fragment_template_name
+    paginate_by = TodoListView.paginate_by
+    fields = TodoListView.fields
+
+    async def get(self, request):
+        query = get_search_query(request)
+        archived = include_archived(request)
+        queryset = Todo.objects.only(*self.fields)
+        if query:
+            queryset = search.search(queryset, query)
+        elif archived:
+            queryset = archive.with_archived(queryset, self.fields)
+        queryset = sharding.scatter(queryset)
+
+        if query:
+            stats = await queryset.order_by().aaggregate(
+                last=Max("updated_at"), count=Count("pk")
+            )
+        else:
+            stats = await sharding.aget_list_stats()
+            if archived:
+                stats = add_archived(stats)
+        etag = list_etag(request, stats)
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+
+        cache_key = fragment = None
+        if page_cache.is_enabled():
+            variant = replica.cache_variant(get_pagination_mode(request), etag)
+            cache_key = page_cache.page_key(request, variant)
+            fragment = page_cache.get_fragment(cache_key)
+        cache_status = "hit"
+        if fragment is None:
+            cache_status = "miss"
+            context = await self.get_page_context(queryset, stats["count"])
+            context["search_query"] = query
+            context["include_archived"] = archived
+            fragment = render_to_string(self.fragment_template_name, context, request)
+            if cache_key:
+                page_cache.set_fragment(cache_key, fragment)
+
+        response = render(
+            request,
+            self.template_name,
+            {
+                "page_fragment": fragment,
+                "search_query": query,
+                "include_archived": archived,
+                "counts": get_list_counts(stats),
+            },
+        )
+        if cache_key:
+            response["X-Page-Cache"] = cache_status
+        return set_validators(response, etag, None)
+
+    async def get_page_context(self, queryset, count):
+        """Return the fragment's context, as ``ListView`` would build it."""
+        if get_pagination_mode(self.request) == "keyset":
+            paginator = KeysetPaginator(queryset, self.paginate_by)
+            try:
+                page = await paginator.apage(self.request.GET.get("cursor"))
+            except InvalidCursor as e:
+                raise Http404(str(e))
+        else:
+            paginator = Paginator(queryset, self.paginate_by)
+            paginator.count = count
+            page = self.get_offset_page(paginator)
+            page.object_list = [todo async for todo in page.object_list]
+        return {
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": page.object_list,
+            "todos": page.object_list,
+            "todo_url_prefix": todo_url_prefix(),
+        }
+
+    def get_offset_page(self, paginator):
+        page = self.request.GET.get("page") or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page != "last":
+                raise Http404("Page is not “last”, nor can it be converted to an int.")
+            page_number = paginator.num_pages
+        try:
+            return paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(f"Invalid page ({page_number}): {e}")
+
+
+class AsyncTodoDetailView(View):
+    """Display a single todo; async version of ``TodoDetailView``.
+
+    The row is loaded once and its ``updated_at`` validates the request,
+    saving a second round trip through the ORM's thread. A todo missing
+    from the live table is looked up in the archive.
+    """
+
+    template_name = TodoDetailView.template_name
+
+    async def get(self, request, pk):
+        alias = replica.read_alias(sharding.db_for_pk(pk))
+        try:
+            todo = await Todo.objects.using(alias).aget(pk=pk)
+        except Todo.DoesNotExist:
+            todo = await TodoArchive.objects.using(alias).filter(pk=pk).afirst()
+            if todo is None:
+                raise Http404("No Todo matches the given query.")
+        etag = detail_etag(pk, todo.updated_at)
+        response = not_modified(request, etag, todo.updated_at)
+        if response is not None:
+            return response
+        response = render(request, self.template_name, {"todo": todo, "object": todo})
+        return set_validators(response, etag, todo.updated_at)
+
+
+async def toggle_todo(request, pk):
+    """Toggle the completed status of a todo."""
+    replica.mark_written(request)
+    if write_behind.is_enabled():
+        if not await write_behind.atoggle(pk):
+            raise Http404("No Todo matches the given query.")
+        return redirect("todo_list")
+    if not await sharding.for_pk(pk).filter(pk=pk).atoggle_completed():
+        raise Http404("No Todo matches the given query.")
+    # Registering the on-commit bump needs the database connection.
+    await sync_to_async(page_cache.bump_generation)(sharding.db_for_pk(pk))
+    return redirect("todo_list")
@@ -0,0 +1,81 @@
+"""Declarative per-URL query and time budgets.
+
+Each entry maps a URL name (``resolver_match.view_name``) to limits on
+``queries``, ``db_ms`` and ``render_ms``; any limit may be left out.
+``settings.TODOS_BUDGETS`` is merged over ``DEFAULT_BUDGETS``, and setting
+an entry to ``None`` removes it. Bulk endpoints and the export aren't
+budgeted, since their cost grows with the request.
+
+``BudgetMiddleware`` (in ``todos/middleware.py``) checks every request,
+logs violations to the ``todos.budgets`` logger and sends
+``budget_exceeded``; the test suite turns that signal into failures.
+"""
+
+import logging
+
+from django.conf import settings
+from django.dispatch import Signal
+
+logger = logging.getLogger("todos.budgets")
+
+# Sent with ``view_name``, ``request``, ``stats`` and ``violations``.
+budget_exceeded = Signal()
+
+# Query counts exclude transaction control; see todos/instrumentation.py.
+DEFAULT_BUDGETS = {
+    # One validator query (MAX and the counters row), reused by the
+    # paginator, and the page.
+    "todo_list": {"queries": 2, "db_ms": 100, "render_ms": 100},
+    "todo_detail": {"queries": 2, "db_ms": 50, "render_ms": 50},
+    "todo_create": {"queries": 1, "db_ms": 50, "render_ms": 50},
+    "todo_update": {"queries": 2, "db_ms": 50, "render_ms": 50},
+    "todo_delete": {"queries": 2, "db_ms": 50, "render_ms": 50},
+    "todo_toggle": {"queries": 1, "db_ms": 50},
+    "api:todo_list": {"queries": 1, "db_ms": 100},
+    "api:todo_detail": {"queries": 2, "db_ms": 50},
+    "api:todo_toggle": {"queries": 2, "db_ms": 50},
+}
+
+LIMITS = ("queries", "db_ms", "render_ms")
+
+
+def get_budgets():
+    budgets = {**DEFAULT_BUDGETS, **getattr(settings, "TODOS_BUDGETS", {})}
+    return {name: budget for name, budget in budgets.items() if budget is not None}
+
+
+def check(view_name, stats):
+    """Return a message for each limit of ``view_name``'s budget exceeded."""
+    budget = get_budgets().get(view_name)
+    if not budget:
+        return []
+    measured = stats.as_dict()
+    return [
+        f"{limit} {round(measured[limit], 1):g} > {budget[limit]:g}"
+        for limit in LIMITS
+        if limit in budget and measured[limit] > budget[limit]
+    ]
+
+
+def report(request, stats):
+    """Check the request's view against its budget and report violations."""
+    match = request.resolver_match
+    if match is None:
+        return []
+    violations = check(match.view_name, stats)
+    if violations:
+        logger.warning(
+            "%s %s (%s) over budget: %s",
+            request.method,
+            request.path,
+            match.view_name,
+            ", ".join(violations),
+        )
+        budget_exceeded.send(
+            sender=None,
+            view_name=match.view_name,
+            request=request,
+            stats=stats,
+            violations=violations,
+        )
+    return violations
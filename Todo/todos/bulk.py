@@ -0,0 +1,132 @@
+"""Batched create, complete and delete operations on todos.
+
+Each operation runs in a single transaction and touches the database in
+batches of ``batch_size`` rows, so importing or cleaning up thousands of
+todos costs a handful of queries instead of one transaction per row.
+With ``TODOS_SHARDS`` set, the ids are grouped by shard and each shard
+gets its own batches, all in transactions committed together at the end;
+see ``todos.sharding``.
+"""
+
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.utils import timezone
+
+from . import page_cache, sharding
+from .forms import TodoForm
+from .models import Todo
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 10000
+
+
+def get_batch_size(batch_size=None):
+    """Return ``batch_size``, or the ``TODOS_BULK_BATCH_SIZE`` setting.
+
+    Raises ``ValueError`` unless it's an integer from 1 to ``MAX_BATCH_SIZE``.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "TODOS_BULK_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    if (
+        isinstance(batch_size, bool)
+        or not isinstance(batch_size, int)
+        or not 1 <= batch_size <= MAX_BATCH_SIZE
+    ):
+        raise ValueError(f"batch_size must be an integer from 1 to {MAX_BATCH_SIZE}.")
+    return batch_size
+
+
+def chunked(items, size):
+    """Yield successive lists of at most ``size`` items."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def build_todos(items):
+    """Validate dicts of todo fields and return unsaved ``Todo`` objects.
+
+    Raises ``ValidationError`` mapping each bad item's index to its errors.
+    """
+    todos = []
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[str(index)] = ["Expected an object of todo fields."]
+            continue
+        form = TodoForm(data=item)
+        if form.is_valid():
+            todos.append(form.save(commit=False))
+        else:
+            errors[str(index)] = [
+                f"{field}: {message}"
+                for field, messages in form.errors.items()
+                for message in messages
+            ]
+    if errors:
+        raise ValidationError(errors)
+    return todos
+
+
+def atomic(aliases):
+    """Return a context manager running a transaction on each of ``aliases``."""
+    stack = ExitStack()
+    for alias in aliases:
+        stack.enter_context(transaction.atomic(using=alias))
+    return stack
+
+
+def bulk_create_todos(items, batch_size=None):
+    """Create todos from dicts of field values and return them.
+
+    Each todo goes to the database ``save()`` would pick, so new todos
+    are spread over the shards in turn.
+    """
+    batch_size = get_batch_size(batch_size)
+    todos = build_todos(items)
+    groups = {}
+    for todo in todos:
+        groups.setdefault(router.db_for_write(Todo, instance=todo), []).append(todo)
+    with atomic(groups):
+        for alias, group in groups.items():
+            Todo.objects.using(alias).bulk_create(group, batch_size=batch_size)
+            page_cache.bump_generation(alias)
+    return todos
+
+
+def bulk_set_completed(ids, completed=True, batch_size=None):
+    """Set ``completed`` on the todos with the given ids.
+
+    Returns the number of rows updated.
+    """
+    batch_size = get_batch_size(batch_size)
+    now = timezone.now()
+    updated = 0
+    groups = sharding.group_by_shard(ids)
+    with atomic(groups):
+        for alias, pks in groups.items():
+            for chunk in chunked(pks, batch_size):
+                updated += (
+                    Todo.objects.using(alias)
+                    .filter(pk__in=chunk)
+                    .update(completed=completed, updated_at=now)
+                )
+            page_cache.bump_generation(alias)
+    return updated
+
+
+def bulk_delete(ids, batch_size=None):
+    """Delete the todos with the given ids and return how many were deleted."""
+    batch_size = get_batch_size(batch_size)
+    deleted = 0
+    groups = sharding.group_by_shard(ids)
+    with atomic(groups):
+        for alias, pks in groups.items():
+            for chunk in chunked(pks, batch_size):
+                count, _ = Todo.objects.using(alias).filter(pk__in=chunk).delete()
+                deleted += count
+            page_cache.bump_generation(alias)
+    return deleted
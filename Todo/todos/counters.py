@@ -0,0 +1,138 @@
+"""Denormalized todo counts, kept exact by SQLite triggers.
+
+``todos_todocounters`` holds one row with the total and completed number
+of todos, not counting soft-deleted ones. Triggers on ``todos_todo``
+adjust it inside the same transaction as every insert, delete, soft
+delete and change of ``completed``, whether it comes from
+``save()``, ``toggle_todo``, the bulk operations, an import or raw SQL. So
+the row is exact without any extra locking, and reading it replaces the
+``COUNT(*)`` scans the list page and dashboards would otherwise run.
+
+On other databases, or if the row is missing (after ``flush``, say), the
+counts are computed with ``COUNT(*)`` instead. ``reconcile()`` and the
+``reconcile_counters`` command recompute the row from the table.
+
+The row also counts archived todos, in ``archived``, with triggers on
+``todos_todoarchive``; see ``todos.archive``. The migrations create the
+triggers, each with the SQL as it stood then: ``0006_todocounters``,
+``0008_todo_deleted_at`` for soft deletes and ``0010_todoarchive``.
+"""
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Count, F, Max, Q, Subquery
+
+from .models import Todo, TodoArchive, TodoCounters
+
+COUNTERS_TABLE = "todos_todocounters"
+CONTENT_TABLE = "todos_todo"
+ARCHIVE_TABLE = "todos_todoarchive"
+ROW_ID = 1
+
+CREATE_ROW_SQL = (
+    f"INSERT OR IGNORE INTO {COUNTERS_TABLE} (id, total, completed) "
+    f"VALUES ({ROW_ID}, 0, 0)"
+)
+
+RECONCILE_SQL = f"""
+UPDATE {COUNTERS_TABLE} SET
+    total = (SELECT COUNT(*) FROM {CONTENT_TABLE} WHERE deleted_at IS NULL),
+    completed = (
+        SELECT COUNT(*) FROM {CONTENT_TABLE}
+        WHERE completed AND deleted_at IS NULL
+    )
+WHERE id = {ROW_ID}
+"""
+
+ARCHIVE_RECONCILE_SQL = f"""
+UPDATE {COUNTERS_TABLE} SET archived = (SELECT COUNT(*) FROM {ARCHIVE_TABLE})
+WHERE id = {ROW_ID}
+"""
+
+
+def is_supported(using_connection=None):
+    """Return whether the connection maintains the counters with triggers."""
+    return (using_connection or connection).vendor == "sqlite"
+
+
+def reconcile(using=DEFAULT_DB_ALIAS):
+    """Recompute the counters row from ``todos_todo`` and the archive.
+
+    Returns the ``(before, after)`` counters, ``before`` being ``None`` if
+    the row was missing.
+    """
+    if not is_supported(connections[using]):
+        return None, get_counts(using)
+    with transaction.atomic(using=using):
+        before = TodoCounters.objects.using(using).filter(pk=ROW_ID).first()
+        with connections[using].cursor() as cursor:
+            cursor.execute(CREATE_ROW_SQL)
+            cursor.execute(RECONCILE_SQL)
+            cursor.execute(ARCHIVE_RECONCILE_SQL)
+        after = TodoCounters.objects.using(using).get(pk=ROW_ID)
+    return before, after
+
+
+def count_todos(queryset):
+    """Return a ``TodoCounters`` computed with ``COUNT(*)`` over ``queryset``."""
+    counts = queryset.order_by().aggregate(
+        total=Count("pk"), completed=Count("pk", filter=Q(completed=True))
+    )
+    archived = TodoArchive.objects.using(queryset.db).count()
+    return TodoCounters(**counts, archived=archived)
+
+
+def get_counts(using=DEFAULT_DB_ALIAS):
+    """Return the current ``TodoCounters`` (total, completed, pending)."""
+    if is_supported(connections[using]):
+        counts = TodoCounters.objects.using(using).filter(pk=ROW_ID).first()
+        if counts is not None:
+            return counts
+    return count_todos(Todo.objects.using(using))
+
+
+FALLBACK_AGGREGATES = {
+    "last": Max("updated_at"),
+    "count": Count("pk"),
+    "completed": Count("pk", filter=Q(completed=True)),
+}
+
+
+def list_stats_queryset(using=DEFAULT_DB_ALIAS):
+    """Return the counters row annotated with ``MAX(updated_at)``.
+
+    One query that reads the row and seeks the ``updated_at`` index.
+    """
+    latest = Todo.objects.using(using).order_by("-updated_at").values("updated_at")
+    return (
+        TodoCounters.objects.using(using)
+        .filter(pk=ROW_ID)
+        .annotate(last=Subquery(latest[:1]))
+        .values("last", "completed", "archived", count=F("total"))
+    )
+
+
+def get_list_stats(using=DEFAULT_DB_ALIAS):
+    """Return ``{"last": MAX(updated_at), "count": ..., "completed": ...}``.
+
+    ``count`` is the total number of todos, as in ``views.list_etag()``.
+    ``archived`` is the number of archived todos, which ``count`` leaves
+    out.
+    """
+    if is_supported(connections[using]):
+        stats = list_stats_queryset(using).first()
+        if stats is not None:
+            return stats
+    stats = Todo.objects.using(using).order_by().aggregate(**FALLBACK_AGGREGATES)
+    stats["archived"] = TodoArchive.objects.using(using).count()
+    return stats
+
+
+async def aget_list_stats(using=DEFAULT_DB_ALIAS):
+    """Async version of ``get_list_stats()``."""
+    if is_supported(connections[using]):
+        stats = await list_stats_queryset(using).afirst()
+        if stats is not None:
+            return stats
+    stats = await Todo.objects.using(using).order_by().aaggregate(**FALLBACK_AGGREGATES)
+    stats["archived"] = await TodoArchive.objects.using(using).acount()
+    return stats
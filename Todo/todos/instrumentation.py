@@ -0,0 +1,129 @@
+"""Per-request SQL and template timing.
+
+``collect()`` starts a ``RequestStats`` for the current context. While it
+is active, every query on any database connection and every top-level
+template render adds to it:
+
+* Queries are counted through an execute wrapper that ``install()`` adds
+  to each new connection (it is connected to ``connection_created``).
+  Transaction control (``BEGIN``, ``SAVEPOINT``, ``RELEASE``...) is timed
+  but not counted, so counts don't depend on whether a view runs inside
+  a test's transaction.
+* Templates are timed by the ``DjangoTemplates`` backend below, which
+  ``settings.TEMPLATES`` uses instead of Django's. Render time includes
+  any queries the template itself triggers.
+
+Outside ``collect()`` both hooks only do one context variable lookup.
+The stats follow the context into ``sync_to_async`` threads, so async
+views are measured too.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+_current = contextvars.ContextVar("todos_request_stats", default=None)
+
+TRANSACTION_STATEMENTS = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+
+
+class RequestStats:
+    """Queries, DB time and render time of one request; times in seconds."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.started = time.perf_counter()
+        self.total_time = None
+        self._render_depth = 0
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def as_dict(self):
+        """Return the stats with times in milliseconds."""
+        total = self.total_time
+        if total is None:
+            total = time.perf_counter() - self.started
+        return {
+            "queries": self.queries,
+            "db_ms": self.db_time * 1000,
+            "render_ms": self.render_time * 1000,
+            "total_ms": total * 1000,
+        }
+
+
+def current():
+    """Return the ``RequestStats`` being collected, or ``None``."""
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Collect a ``RequestStats`` for the code run inside the block.
+
+    Nested blocks share the outer block's stats.
+    """
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        stats.finish()
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - started
+        if not sql.lstrip()[:9].upper().startswith(TRANSACTION_STATEMENTS):
+            stats.queries += 1
+
+
+def install(sender=None, connection=None, **kwargs):
+    """Add ``record_query`` to ``connection``; a ``connection_created`` receiver."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return super().render(context, request)
+        # Only the outermost render is timed; nested ones are part of it.
+        stats._render_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats._render_depth -= 1
+            if not stats._render_depth:
+                stats.render_time += time.perf_counter() - started
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Django's template backend, with render time recorded per request."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
@@ -0,0 +1,79 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from todos import archive, purge
+
+
+def age(value):
+    try:
+        return purge.parse_age(value)
+    except ValueError as e:
+        raise CommandError(e)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move todos that have been completed for a while into the archive "
+        "table, in small transactions at a limited rate, so the live table "
+        "only holds the todos still in use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=age,
+            help=(
+                "Only archive todos completed and unchanged for longer than "
+                "this, e.g. 12h or 30d. Defaults to TODOS_ARCHIVE_AFTER (30 days)."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per transaction. Defaults to TODOS_ARCHIVE_CHUNK_SIZE (500).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help=(
+                "Most rows to archive per second; 0 for no limit. "
+                "Defaults to TODOS_ARCHIVE_RATE (2000)."
+            ),
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            help="Keep running, archiving again every this many seconds.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to archive. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.archive(options)
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def archive(self, options):
+        try:
+            progress = archive.archive(
+                older_than=options["older_than"],
+                chunk_size=options["chunk_size"],
+                rate=options["rate"],
+                using=options["database"],
+                report=self.stderr.write,
+            )
+        except ValueError as e:
+            raise CommandError(e)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Archived {progress.rows} completed todos "
+                f"({progress.rate:,.0f} rows/s)."
+            )
+        )
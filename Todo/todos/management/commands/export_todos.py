@@ -0,0 +1,62 @@
+from argparse import BooleanOptionalAction
+
+from django.core.management.base import BaseCommand
+
+from todos import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream todos to a CSV or NDJSON file in primary key order, in "
+        "constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output", nargs="?", default="-", help="File to write, or - for stdout."
+        )
+        parser.add_argument(
+            "--format",
+            choices=transfer.FORMATS,
+            help="Output format. Defaults to the file extension, else csv.",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Resume after this id, appending to the output file.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--include-archived",
+            action=BooleanOptionalAction,
+            default=True,
+            help="Export archived todos too, with their archived_at (the default).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = options["format"] or transfer.guess_format(output)
+        resuming = options["after_id"] > 0
+        if output == "-":
+            out = self.stdout
+        else:
+            out = open(output, "a" if resuming else "w", newline="", encoding="utf-8")
+        try:
+            progress = transfer.export_rows(
+                out,
+                fmt,
+                after_id=options["after_id"],
+                chunk_size=options["chunk_size"],
+                header=not resuming,
+                include_archived=options["include_archived"],
+                report=self.stderr.write,
+            )
+        finally:
+            if out is not self.stdout:
+                out.close()
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Exported {progress.rows} todos ({progress.rate:,.0f} rows/s)."
+            )
+        )
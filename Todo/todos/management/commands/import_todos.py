@@ -0,0 +1,62 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from todos import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import todos from a CSV or NDJSON export, reading the file "
+        "incrementally and inserting in batched transactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="File to read, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=transfer.FORMATS,
+            help="Input format. Defaults to the file extension, else csv.",
+        )
+        parser.add_argument(
+            "--skip",
+            type=int,
+            default=0,
+            help="Skip this many records, to resume an interrupted import.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT."
+        )
+        parser.add_argument(
+            "--transaction-size",
+            type=int,
+            default=20000,
+            help="Rows per transaction.",
+        )
+        parser.add_argument(
+            "--keep-ids",
+            action="store_true",
+            help="Keep the exported ids instead of assigning new ones.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["input"]
+        fmt = options["format"] or transfer.guess_format(path)
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            progress = transfer.import_records(
+                transfer.read_records(stream, fmt),
+                skip=options["skip"],
+                batch_size=options["batch_size"],
+                transaction_size=options["transaction_size"],
+                keep_ids=options["keep_ids"],
+                report=self.stderr.write,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Imported {progress.rows} todos ({progress.rate:,.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from todos import sharding
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate every database in TODOS_SHARDS and make sure each hands out "
+        "todo ids from its own range."
+    )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+        for alias in sharding.get_shards():
+            if verbosity:
+                self.stdout.write(f"Migrating {alias}...")
+            call_command(
+                "migrate",
+                database=alias,
+                interactive=False,
+                verbosity=max(verbosity - 1, 0),
+                stdout=self.stdout,
+                stderr=self.stderr,
+            )
+            sharding.reserve_id_range(connections[alias])
+        if verbosity:
+            self.stdout.write(
+                self.style.SUCCESS(f"Migrated {len(sharding.get_shards())} shard(s).")
+            )
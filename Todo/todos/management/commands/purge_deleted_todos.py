@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from todos import purge
+
+
+def age(value):
+    try:
+        return purge.parse_age(value)
+    except ValueError as e:
+        raise CommandError(e)
+
+
+class Command(BaseCommand):
+    help = (
+        "Hard-delete soft-deleted todos in small transactions, at a limited "
+        "rate, so the purge never holds up other writes for long."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=age,
+            help=(
+                "Only purge todos deleted longer ago than this, e.g. 12h or 7d. "
+                "Defaults to TODOS_PURGE_AFTER (7 days)."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per transaction. Defaults to TODOS_PURGE_CHUNK_SIZE (500).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help=(
+                "Most rows to delete per second; 0 for no limit. "
+                "Defaults to TODOS_PURGE_RATE (2000)."
+            ),
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            help="Keep running, purging again every this many seconds.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to purge. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.purge(options)
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def purge(self, options):
+        try:
+            progress = purge.purge(
+                older_than=options["older_than"],
+                chunk_size=options["chunk_size"],
+                rate=options["rate"],
+                using=options["database"],
+                report=self.stderr.write,
+            )
+        except ValueError as e:
+            raise CommandError(e)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Purged {progress.rows} deleted todos ({progress.rate:,.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from todos import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the todos table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to rebuild the index in. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if not search.is_supported(connection):
+            raise CommandError("Full-text search requires an SQLite database.")
+        search.rebuild(connection)
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
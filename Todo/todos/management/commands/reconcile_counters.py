@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from todos import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the todo counters row from the todos table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to reconcile the counters in. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        before, after = counters.reconcile(options["database"])
+        if before is None:
+            self.stdout.write("Counters row was missing; created it.")
+        elif (before.total, before.completed, before.archived) != (
+            after.total,
+            after.completed,
+            after.archived,
+        ):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Counters had drifted: total {before.total} -> {after.total}, "
+                    f"completed {before.completed} -> {after.completed}, "
+                    f"archived {before.archived} -> {after.archived}."
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(f"Counters reconciled: {after}."))
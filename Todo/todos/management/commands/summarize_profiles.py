@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from todos import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the hottest functions across the request profiles written "
+        "by ServerTimingMiddleware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir", help="Profile directory. Defaults to TODOS_PROFILE_DIR."
+        )
+        parser.add_argument(
+            "--match",
+            default="",
+            help="Only include profiles whose file name contains this, e.g. GET-todos.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=profiling.SORT_KEYS,
+            default="cumulative",
+            help="Sort by cumulative time (default), own time or call count.",
+        )
+        parser.add_argument("--limit", type=int, default=20)
+
+    def handle(self, *args, **options):
+        paths = profiling.find_profiles(options["dir"], options["match"])
+        if not paths:
+            raise CommandError("No profiles found.")
+        self.stdout.write(f"{len(paths)} profiles")
+        self.stdout.write(profiling.summarize(paths, options["sort"], options["limit"]))
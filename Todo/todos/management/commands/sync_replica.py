@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todos import replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy each database in TODOS_REPLICAS over its read replica, once or "
+        "periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every",
+            type=float,
+            help="Keep running, copying again every this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if not replica.get_replicas():
+            raise CommandError("No replicas configured; set TODOS_REPLICAS.")
+        while True:
+            self.sync()
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def sync(self):
+        for primary, alias in replica.get_replicas().items():
+            started = time.perf_counter()
+            replica.sync(primary)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stderr.write(
+                self.style.SUCCESS(f"Copied {primary} to {alias} in {elapsed:.1f} ms.")
+            )
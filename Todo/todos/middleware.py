@@ -0,0 +1,175 @@
+"""Middleware for the todos app."""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.gzip import GZipMiddleware
+from django.utils.deprecation import MiddlewareMixin
+
+from . import budgets, instrumentation, profiling, replica
+
+
+def is_lean_path(path):
+    """Return whether ``path`` is served by the lean middleware stack.
+
+    That is, whether it starts with one of ``TODOS_LEAN_PATHS``. Never
+    true with ``CSRF_USE_SESSIONS``, since CSRF checks then need the
+    session.
+    """
+    if settings.CSRF_USE_SESSIONS:
+        return False
+    return path.startswith(tuple(getattr(settings, "TODOS_LEAN_PATHS", ())))
+
+
+class BudgetMiddleware:
+    """Measure each request and check it against its URL's budget.
+
+    Put it first in ``MIDDLEWARE`` so the measurements cover the whole
+    request. The stats are left on ``request.todos_stats``. It runs
+    natively under ASGI, so it doesn't cost the async views a thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with instrumentation.collect() as stats:
+            request.todos_stats = stats
+            response = self.get_response(request)
+        budgets.report(request, stats)
+        return response
+
+    async def __acall__(self, request):
+        with instrumentation.collect() as stats:
+            request.todos_stats = stats
+            response = await self.get_response(request)
+        budgets.report(request, stats)
+        return response
+
+
+class ServerTimingMiddleware:
+    """Add a ``Server-Timing`` header and profile a sample of requests.
+
+    The header breaks each response down into ``db`` (with the query
+    count), ``template`` and ``total`` milliseconds, which browser dev
+    tools show next to the request. ``TODOS_PROFILE_SAMPLE_RATE`` of the
+    requests are also profiled with cProfile; see ``todos/profiling.py``.
+    Async requests get the header but are not profiled, since a profile
+    would mix in every other task running on the event loop.
+
+    It is opt-in: ``settings.py`` adds it, first in ``MIDDLEWARE``, when
+    ``TODOS_SERVER_TIMING=1`` is set in the environment.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = profiling.start() if profiling.should_sample() else None
+        try:
+            with instrumentation.collect() as stats:
+                response = self.get_response(request)
+        finally:
+            if profile is not None:
+                profiling.stop(profile)
+        if profile is not None:
+            profiling.dump(profile, request, stats.as_dict()["total_ms"])
+        return self.add_header(response, stats)
+
+    async def __acall__(self, request):
+        with instrumentation.collect() as stats:
+            response = await self.get_response(request)
+        return self.add_header(response, stats)
+
+    def add_header(self, response, stats):
+        timings = stats.as_dict()
+        response["Server-Timing"] = (
+            f"db;dur={timings['db_ms']:.1f};desc=\"{timings['queries']} queries\", "
+            f"template;dur={timings['render_ms']:.1f}, "
+            f"total;dur={timings['total_ms']:.1f}"
+        )
+        return response
+
+
+def get_gzip_min_length():
+    return getattr(settings, "TODOS_GZIP_MIN_LENGTH", 1024)
+
+
+class HTMLGZipMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` for HTML responses of ``TODOS_GZIP_MIN_LENGTH`` bytes or more.
+
+    Smaller pages fit in a packet or two either way, so compressing them
+    only costs CPU. JSON and the streamed exports are left alone too.
+    Static files come precompressed; see ``todo_project/staticfiles.py``.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or not response.get("Content-Type", "").startswith("text/html")
+            or len(response.content) < get_gzip_min_length()
+        ):
+            return response
+        return super().process_response(request, response)
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """Keep clients that just changed something on the primary database.
+
+    Successful requests other than GET, HEAD, OPTIONS and TRACE, and those
+    flagged with ``replica.mark_written()``, get the cookie that
+    ``replica.read_only()`` checks. Does nothing without ``TODOS_REPLICAS``.
+    """
+
+    def process_response(self, request, response):
+        if (
+            replica.get_replicas()
+            and replica.wrote(request)
+            and response.status_code < 400
+        ):
+            replica.stick_to_primary(response)
+        return response
+
+
+class FullStackOnlyMixin:
+    """Skip a middleware on the paths in ``TODOS_LEAN_PATHS``.
+
+    The todo pages never look at ``request.user``, the session or
+    messages, so on those paths the middleware that provide them just
+    pass the request through. Subclassing the originals keeps the
+    admin's system checks, which look for them in ``MIDDLEWARE``, happy.
+    """
+
+    def __call__(self, request):
+        # Under ASGI this returns the coroutine for the caller to await.
+        if is_lean_path(request.path_info):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class FullStackSessionMiddleware(FullStackOnlyMixin, SessionMiddleware):
+    """``SessionMiddleware``, skipped on the lean paths."""
+
+
+class FullStackAuthenticationMiddleware(FullStackOnlyMixin, AuthenticationMiddleware):
+    """``AuthenticationMiddleware``, skipped on the lean paths."""
+
+
+class FullStackMessageMiddleware(FullStackOnlyMixin, MessageMiddleware):
+    """``MessageMiddleware``, skipped on the lean paths."""
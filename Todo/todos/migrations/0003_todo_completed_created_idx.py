@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0002_todo_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['completed', '-created_at', '-id'], name='todo_completed_created_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+# The FTS5 index over todos_todo and the triggers keeping it in sync,
+# frozen as of this migration; todos.search describes them.
+CREATE_SEARCH_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_todo_fts USING fts5(
+        title, description,
+        content='todos_todo', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO todos_todo_fts(todos_todo_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ai AFTER INSERT ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ad AFTER DELETE ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_au
+    AFTER UPDATE OF title, description ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO todos_todo_fts(todos_todo_fts) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX_SQL = [
+    'DROP TRIGGER IF EXISTS todos_todo_fts_ai',
+    'DROP TRIGGER IF EXISTS todos_todo_fts_ad',
+    'DROP TRIGGER IF EXISTS todos_todo_fts_au',
+    'DROP TABLE IF EXISTS todos_todo_fts',
+]
+
+
+def sqlite_only(statements):
+    # FTS5 is SQLite's. Elsewhere there is no index; search.is_supported()
+    # is False and the admin falls back to its own icontains search.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for sql in statements:
+                schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0003_todo_completed_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            sqlite_only(CREATE_SEARCH_INDEX_SQL), sqlite_only(DROP_SEARCH_INDEX_SQL)
+        ),
+    ]
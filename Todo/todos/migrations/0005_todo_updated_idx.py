@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0004_todo_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(fields=["updated_at"], name="todo_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:38
+
+from django.db import migrations, models
+
+# The counters row and the triggers keeping it exact, frozen as of this
+# migration; todos.counters describes them.
+CREATE_COUNTERS_SQL = [
+    "INSERT OR IGNORE INTO todos_todocounters (id, total, completed) VALUES (1, 0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ai
+    AFTER INSERT ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total + 1, completed = completed + new.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ad
+    AFTER DELETE ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total - 1, completed = completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_au
+    AFTER UPDATE OF completed ON todos_todo
+    WHEN new.completed != old.completed BEGIN
+        UPDATE todos_todocounters
+        SET completed = completed + new.completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    UPDATE todos_todocounters SET
+        total = (SELECT COUNT(*) FROM todos_todo),
+        completed = (SELECT COUNT(*) FROM todos_todo WHERE completed)
+    WHERE id = 1
+    """,
+]
+
+DROP_COUNTERS_SQL = [
+    "DROP TRIGGER IF EXISTS todos_todocounters_ai",
+    "DROP TRIGGER IF EXISTS todos_todocounters_ad",
+    "DROP TRIGGER IF EXISTS todos_todocounters_au",
+]
+
+
+def sqlite_only(statements):
+    # The triggers are SQLite's. Elsewhere counters.is_supported() is
+    # False and the counts are queried instead.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements:
+                schema_editor.execute(sql, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0005_todo_updated_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoCounters",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+                ("completed", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "todo counters",
+            },
+        ),
+        migrations.RunPython(
+            sqlite_only(CREATE_COUNTERS_SQL), sqlite_only(DROP_COUNTERS_SQL)
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:53
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+# Rebuilding todos_todo to add or remove the column drops its triggers.
+# These put back the search index's and the counters' triggers, frozen
+# as of this migration.
+CREATE_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ai AFTER INSERT ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ad AFTER DELETE ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_au
+    AFTER UPDATE OF title, description ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ai
+    AFTER INSERT ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total + 1, completed = completed + new.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ad
+    AFTER DELETE ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total - 1, completed = completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_au
+    AFTER UPDATE OF completed ON todos_todo
+    WHEN new.completed != old.completed BEGIN
+        UPDATE todos_todocounters
+        SET completed = completed + new.completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+]
+
+
+def backfill_excerpts(apps, schema_editor):
+    Todo = apps.get_model("todos", "Todo")
+    todos = Todo.objects.using(schema_editor.connection.alias).order_by("pk")
+    last = 0
+    while True:
+        batch = list(todos.filter(pk__gt=last).only("pk", "description")[:BATCH_SIZE])
+        if not batch:
+            break
+        for todo in batch:
+            # models.make_excerpt(), frozen as of this migration.
+            todo.description_excerpt = Truncator(todo.description).words(
+                20, truncate=" …"
+            )
+        Todo.objects.using(schema_editor.connection.alias).bulk_update(
+            batch, ["description_excerpt"]
+        )
+        last = batch[-1].pk
+
+
+def sqlite_only(statements):
+    # The triggers are SQLite's, as 0004 and 0006 only install them there.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements:
+                schema_editor.execute(sql, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0006_todocounters"),
+    ]
+
+    operations = [
+        # Put the triggers back after unapplying, too.
+        migrations.RunPython(
+            migrations.RunPython.noop, sqlite_only(CREATE_TRIGGERS_SQL)
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="description_excerpt",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+        migrations.RunPython(
+            sqlite_only(CREATE_TRIGGERS_SQL), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+# Removing the column rebuilds todos_todo, which drops its triggers; this
+# puts back the ones 0007_todo_description_excerpt installed.
+CREATE_ALL_ROWS_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ai AFTER INSERT ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_ad AFTER DELETE ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todo_fts_au
+    AFTER UPDATE OF title, description ON todos_todo BEGIN
+        INSERT INTO todos_todo_fts(todos_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_todo_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ai
+    AFTER INSERT ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total + 1, completed = completed + new.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ad
+    AFTER DELETE ON todos_todo BEGIN
+        UPDATE todos_todocounters
+        SET total = total - 1, completed = completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_au
+    AFTER UPDATE OF completed ON todos_todo
+    WHEN new.completed != old.completed BEGIN
+        UPDATE todos_todocounters
+        SET completed = completed + new.completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+]
+
+DROP_COUNTERS_SQL = [
+    "DROP TRIGGER IF EXISTS todos_todocounters_ai",
+    "DROP TRIGGER IF EXISTS todos_todocounters_ad",
+    "DROP TRIGGER IF EXISTS todos_todocounters_au",
+]
+
+# Replace the counter triggers with ones that skip soft-deleted rows, and
+# recount without them.
+CREATE_LIVE_COUNTERS_SQL = DROP_COUNTERS_SQL + [
+    "INSERT OR IGNORE INTO todos_todocounters (id, total, completed) VALUES (1, 0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ai
+    AFTER INSERT ON todos_todo WHEN new.deleted_at IS NULL BEGIN
+        UPDATE todos_todocounters
+        SET total = total + 1, completed = completed + new.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ad
+    AFTER DELETE ON todos_todo WHEN old.deleted_at IS NULL BEGIN
+        UPDATE todos_todocounters
+        SET total = total - 1, completed = completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_au
+    AFTER UPDATE OF completed, deleted_at ON todos_todo
+    WHEN new.completed != old.completed
+        OR (new.deleted_at IS NULL) != (old.deleted_at IS NULL) BEGIN
+        UPDATE todos_todocounters
+        SET total = total
+                + (new.deleted_at IS NULL) - (old.deleted_at IS NULL),
+            completed = completed
+                + (new.completed AND new.deleted_at IS NULL)
+                - (old.completed AND old.deleted_at IS NULL)
+        WHERE id = 1;
+    END
+    """,
+    """
+    UPDATE todos_todocounters SET
+        total = (SELECT COUNT(*) FROM todos_todo WHERE deleted_at IS NULL),
+        completed = (
+            SELECT COUNT(*) FROM todos_todo
+            WHERE completed AND deleted_at IS NULL
+        )
+    WHERE id = 1
+    """,
+]
+
+
+def sqlite_only(statements):
+    # The triggers are SQLite's, as 0004 and 0006 only install them there.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements:
+                schema_editor.execute(sql, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0007_todo_description_excerpt"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, sqlite_only(CREATE_ALL_ROWS_TRIGGERS_SQL)
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="todo_deleted_idx",
+            ),
+        ),
+        migrations.RunPython(
+            sqlite_only(CREATE_LIVE_COUNTERS_SQL), sqlite_only(DROP_COUNTERS_SQL)
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:12
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, migrations
+
+# sharding.ID_RANGE and sharding.reserve_id_range() as of this migration.
+ID_RANGE = 2**40
+
+RESERVE_SQL = "UPDATE sqlite_sequence SET seq = MAX(seq, %s) WHERE name = %s"
+INSERT_SQL = "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)"
+
+
+def reserve_id_range(apps, schema_editor):
+    # Shard i of TODOS_SHARDS hands out ids from i * ID_RANGE on. A no-op
+    # on default and outside TODOS_SHARDS.
+    connection = schema_editor.connection
+    shards = list(getattr(settings, "TODOS_SHARDS", None) or [DEFAULT_DB_ALIAS])
+    if connection.alias not in shards or connection.vendor != "sqlite":
+        return
+    start = shards.index(connection.alias) * ID_RANGE
+    if not start:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(RESERVE_SQL, [start, "todos_todo"])
+        if not cursor.rowcount:
+            cursor.execute(INSERT_SQL, ["todos_todo", start])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0008_todo_deleted_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(reserve_id_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# The counter triggers as 0008_todo_deleted_at left them. Adding the
+# column rebuilds todos_todocounters, which they update, so they are
+# dropped first and put back once it's done.
+DROP_COUNTERS_SQL = [
+    "DROP TRIGGER IF EXISTS todos_todocounters_ai",
+    "DROP TRIGGER IF EXISTS todos_todocounters_ad",
+    "DROP TRIGGER IF EXISTS todos_todocounters_au",
+]
+
+CREATE_COUNTERS_SQL = [
+    "INSERT OR IGNORE INTO todos_todocounters (id, total, completed) VALUES (1, 0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ai
+    AFTER INSERT ON todos_todo WHEN new.deleted_at IS NULL BEGIN
+        UPDATE todos_todocounters
+        SET total = total + 1, completed = completed + new.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_ad
+    AFTER DELETE ON todos_todo WHEN old.deleted_at IS NULL BEGIN
+        UPDATE todos_todocounters
+        SET total = total - 1, completed = completed - old.completed
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_au
+    AFTER UPDATE OF completed, deleted_at ON todos_todo
+    WHEN new.completed != old.completed
+        OR (new.deleted_at IS NULL) != (old.deleted_at IS NULL) BEGIN
+        UPDATE todos_todocounters
+        SET total = total
+                + (new.deleted_at IS NULL) - (old.deleted_at IS NULL),
+            completed = completed
+                + (new.completed AND new.deleted_at IS NULL)
+                - (old.completed AND old.deleted_at IS NULL)
+        WHERE id = 1;
+    END
+    """,
+    """
+    UPDATE todos_todocounters SET
+        total = (SELECT COUNT(*) FROM todos_todo WHERE deleted_at IS NULL),
+        completed = (
+            SELECT COUNT(*) FROM todos_todo
+            WHERE completed AND deleted_at IS NULL
+        )
+    WHERE id = 1
+    """,
+]
+
+# Count archived todos in the new column.
+CREATE_ARCHIVE_COUNTERS_SQL = CREATE_COUNTERS_SQL + [
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_archive_ai
+    AFTER INSERT ON todos_todoarchive BEGIN
+        UPDATE todos_todocounters SET archived = archived + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_todocounters_archive_ad
+    AFTER DELETE ON todos_todoarchive BEGIN
+        UPDATE todos_todocounters SET archived = archived - 1 WHERE id = 1;
+    END
+    """,
+    """
+    UPDATE todos_todocounters SET archived = (SELECT COUNT(*) FROM todos_todoarchive)
+    WHERE id = 1
+    """,
+]
+
+DROP_ARCHIVE_COUNTERS_SQL = [
+    "DROP TRIGGER IF EXISTS todos_todocounters_archive_ai",
+    "DROP TRIGGER IF EXISTS todos_todocounters_archive_ad",
+] + DROP_COUNTERS_SQL
+
+
+def sqlite_only(statements):
+    # The triggers are SQLite's, as 0006 only installs them there.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements:
+                schema_editor.execute(sql, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0009_shard_id_ranges"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True)),
+                ("description_excerpt", models.TextField(blank=True, editable=False)),
+                ("completed", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at", "-id"], name="todoarchive_created_id_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            sqlite_only(DROP_COUNTERS_SQL), sqlite_only(CREATE_COUNTERS_SQL)
+        ),
+        migrations.AddField(
+            model_name="todocounters",
+            name="archived",
+            field=models.IntegerField(db_default=0, default=0),
+        ),
+        migrations.RunPython(
+            sqlite_only(CREATE_ARCHIVE_COUNTERS_SQL),
+            sqlite_only(DROP_ARCHIVE_COUNTERS_SQL),
+        ),
+    ]
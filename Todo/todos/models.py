@@ -1,4 +1,103 @@
-from django.db import models
+from django.db import models, router
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from . import page_cache
+
+# The list page shows this many words of each description.
+EXCERPT_WORDS = 20
+
+# Todo ids are SQLite INTEGERs, which hold 64 bits.
+MIN_ID = -(2**63)
+MAX_ID = 2**63 - 1
+
+
+def make_excerpt(description):
+    """Return ``description`` as ``truncatewords:20`` would show it."""
+    return Truncator(description).words(EXCERPT_WORDS, truncate=" …")
+
+
+def is_valid_id(value):
+    """Return whether ``value`` is an int that fits in a todo id."""
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and MIN_ID <= value <= MAX_ID
+    )
+
+
+class TodoQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.description_excerpt = make_excerpt(obj.description)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update ``fields`` of ``objs``, and the excerpt along with ``description``.
+
+        As with ``save(update_fields=...)``, a description changed in memory
+        but left out of ``fields`` is not written, and neither is its excerpt.
+        """
+        objs, fields = list(objs), list(fields)
+        if "description" in fields:
+            for obj in objs:
+                obj.description_excerpt = make_excerpt(obj.description)
+            if "description_excerpt" not in fields:
+                fields.append("description_excerpt")
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if isinstance(kwargs.get("description"), str):
+            kwargs["description_excerpt"] = make_excerpt(kwargs["description"])
+        return super().update(**kwargs)
+
+    async def aupdate(self, **kwargs):
+        if isinstance(kwargs.get("description"), str):
+            kwargs["description_excerpt"] = make_excerpt(kwargs["description"])
+        return await super().aupdate(**kwargs)
+
+    def toggle_completed(self):
+        """Flip ``completed`` on every row in one ``UPDATE``.
+
+        Returns the number of rows changed. Concurrent toggles can't
+        overwrite each other and no other column is rewritten.
+        """
+        return self.update(completed=~F("completed"), updated_at=timezone.now())
+
+    async def atoggle_completed(self):
+        """Async version of ``toggle_completed()``."""
+        return await self.aupdate(completed=~F("completed"), updated_at=timezone.now())
+
+    def delete(self):
+        """Soft-delete the todos: set ``deleted_at`` in one ``UPDATE``.
+
+        Returns ``(count, {"todos.Todo": count})`` like ``QuerySet.delete()``.
+        The rows stay in the table, hidden by ``Todo.objects``, until the
+        ``purge_deleted_todos`` command removes them.
+        """
+        count = self.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        if count:
+            page_cache.bump_generation(self.db)
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        """Delete the rows for good, as ``QuerySet.delete()`` does."""
+        return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+
+class TodoManager(models.Manager.from_queryset(TodoQuerySet)):
+    """The default manager: todos that haven't been soft-deleted."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Todo(models.Model):
@@ -6,12 +105,117 @@ class Todo(models.Model):
 
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
+    # The start of the description, kept for the list page so it never has
+    # to load descriptions that may run to many KB.
+    description_excerpt = models.TextField(blank=True, editable=False)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set instead of deleting the row; see TodoQuerySet.delete().
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TodoManager()
+    # Includes soft-deleted todos, for purging and restoring them.
+    all_objects = TodoQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Serves the default ordering and keyset pagination on (created_at, id).
+            models.Index(fields=["-created_at", "-id"], name="todo_created_id_idx"),
+            # Serves completed/pending filters, in order, without a temp sort.
+            models.Index(
+                fields=["completed", "-created_at", "-id"],
+                name="todo_completed_created_idx",
+            ),
+            # Makes MAX(updated_at), the list page's ETag validator, a seek.
+            models.Index(fields=["updated_at"], name="todo_updated_idx"),
+            # Finds soft-deleted rows for the purge. Live rows, the vast
+            # majority, are left out, so it stays small.
+            models.Index(
+                fields=["deleted_at"],
+                name="todo_deleted_idx",
+                condition=Q(deleted_at__isnull=False),
+            ),
+        ]
+
+    is_archived = False
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.description_excerpt = make_excerpt(self.description)
+        if update_fields is not None and "description" in update_fields:
+            update_fields = {*update_fields, "description_excerpt"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        """Soft-delete the todo; see ``TodoQuerySet.delete()``."""
+        using = using or router.db_for_write(type(self), instance=self)
+        now = timezone.now()
+        count = (
+            type(self).objects.using(using).filter(pk=self.pk).update(deleted_at=now)
+        )
+        if count:
+            self.deleted_at = now
+            page_cache.bump_generation(using)
+        return count, {self._meta.label: count}
+
+    def hard_delete(self, using=None):
+        """Delete the row for good."""
+        return super().delete(using=using)
+
+
+class TodoArchive(models.Model):
+    """A completed todo moved out of ``todos_todo`` by ``todos.archive``.
+
+    Keeps the todo's id and fields, in the same order, so the list can
+    show archived todos after the live ones in one ``UNION ALL``.
+    """
+
+    # The id the todo had; never reused, since todo ids are AUTOINCREMENT.
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    description_excerpt = models.TextField(blank=True, editable=False)
+    completed = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="todoarchive_created_id_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class TodoCounters(models.Model):
+    """Running totals of todos, in a single row kept exact by triggers.
+
+    Read it through ``todos.counters`` rather than directly; see there.
+    """
+
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    # Todos in todos_todoarchive; not part of total or completed. The
+    # database default lets counters.CREATE_ROW_SQL leave it out.
+    archived = models.IntegerField(default=0, db_default=0)
+
+    class Meta:
+        verbose_name_plural = "todo counters"
+
+    def __str__(self):
+        return f"{self.completed} of {self.total} done"
+
+    @property
+    def pending(self):
+        return self.total - self.completed
@@ -0,0 +1,111 @@
+"""Cache of rendered todo list pages, invalidated by a generation counter.
+
+Every rendered page fragment is stored under a key that includes the
+current "todo generation". Any write to a todo bumps the generation, so
+later requests look up fresh keys and stale fragments are never read
+again; they simply expire.
+
+The generation is bumped as soon as the write happens and again when its
+transaction commits. The second bump closes the window where another
+request renders the pre-commit data and caches it under the new
+generation.
+"""
+
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+GENERATION_KEY = "todos:generation"
+
+
+class PageCacheStats:
+    """Process-wide hit/miss counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+stats = PageCacheStats()
+
+
+def get_cache():
+    return caches[getattr(settings, "TODOS_PAGE_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    """Return how long fragments live, in seconds; 0 disables the cache."""
+    return getattr(settings, "TODOS_PAGE_CACHE_TIMEOUT", 0)
+
+
+def is_enabled():
+    return bool(get_timeout())
+
+
+def initial_generation():
+    # Derived from the clock so a generation lost to eviction restarts above
+    # any value that cached fragments may still be keyed on.
+    return time.time_ns() // 1000
+
+
+def get_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, initial_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _incr_generation():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, initial_generation(), timeout=None)
+
+
+def bump_generation(using=None):
+    """Invalidate every cached page after a write to the todos table."""
+    _incr_generation()
+    transaction.on_commit(_incr_generation, using=using)
+
+
+def page_key(request, variant=""):
+    """Return the cache key for the page ``request`` asks for."""
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    digest = hashlib.md5(
+        f"{variant}?{query}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"todos:page:{get_generation()}:{digest}"
+
+
+def get_fragment(key):
+    fragment = get_cache().get(key)
+    stats.record(hit=fragment is not None)
+    return fragment
+
+
+def set_fragment(key, fragment):
+    get_cache().set(key, fragment, get_timeout())
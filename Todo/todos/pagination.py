@@ -0,0 +1,158 @@
+"""Keyset (cursor) pagination for Todo querysets.
+
+Offset pagination needs a ``COUNT(*)`` and an ``OFFSET n`` scan on every
+page, so deep pages get slower as the table grows. Keyset pagination
+instead remembers the ``(created_at, id)`` of the last row shown and asks
+for rows strictly after it, which the ``(created_at, id)`` index answers
+in constant time at any depth.
+
+Cursors are opaque, URL-safe tokens; clients should only pass back what
+they were given.
+"""
+
+import base64
+import json
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import is_valid_id
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidCursor(InvalidPage):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(obj, direction=NEXT):
+    """Return an opaque token pointing just past ``obj`` in ``direction``."""
+    payload = json.dumps(
+        [direction, obj.created_at.isoformat(), obj.pk], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return ``(direction, created_at, pk)`` for a token from ``encode_cursor``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        direction, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = parse_datetime(created_at)
+    except (TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor.")
+    if direction not in (NEXT, PREVIOUS) or created_at is None or not is_valid_id(pk):
+        raise InvalidCursor("Invalid cursor.")
+    return direction, created_at, pk
+
+
+class KeysetPage:
+    """A page of results from ``KeysetPaginator``.
+
+    Mirrors the parts of ``django.core.paginator.Page`` that templates use,
+    but exposes cursors instead of page numbers.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return encode_cursor(self.object_list[-1], NEXT)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return encode_cursor(self.object_list[0], PREVIOUS)
+
+
+class KeysetPaginator:
+    """Paginate a queryset newest-first by ``(created_at, id)``.
+
+    No ``COUNT(*)`` is issued; one extra row is fetched to tell whether
+    another page exists in the direction of travel. The redundant
+    ``created_at`` bound on each cursor query lets SQLite seek into the
+    index instead of scanning it from the start.
+    """
+
+    ordering = ("-created_at", "-id")
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def page(self, cursor=None):
+        """Return the ``KeysetPage`` for ``cursor`` (the first page if empty)."""
+        direction, rows = self.get_rows(cursor)
+        return self.make_page(direction, list(rows))
+
+    async def apage(self, cursor=None):
+        """Async version of ``page()``."""
+        direction, rows = self.get_rows(cursor)
+        return self.make_page(direction, [row async for row in rows])
+
+    def get_rows(self, cursor):
+        """Return ``(direction, queryset)`` for one row more than a page.
+
+        ``direction`` is ``None`` for the first page.
+        """
+        if not cursor:
+            return None, self.queryset.order_by(*self.ordering)[: self.per_page + 1]
+
+        direction, created_at, pk = decode_cursor(cursor)
+        if direction == NEXT:
+            return (
+                direction,
+                self.queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk),
+                    created_at__lte=created_at,
+                ).order_by(*self.ordering)[: self.per_page + 1],
+            )
+
+        return (
+            direction,
+            self.queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk),
+                created_at__gte=created_at,
+            ).order_by("created_at", "id")[: self.per_page + 1],
+        )
+
+    def make_page(self, direction, rows):
+        """Build the ``KeysetPage`` from the rows ``get_rows()`` returned."""
+        if direction == PREVIOUS:
+            page_rows = rows[: self.per_page]
+            page_rows.reverse()
+            return KeysetPage(
+                page_rows,
+                has_next=True,
+                has_previous=len(rows) > self.per_page,
+            )
+        return KeysetPage(
+            rows[: self.per_page],
+            has_next=len(rows) > self.per_page,
+            has_previous=direction is not None,
+        )
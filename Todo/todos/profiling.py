@@ -0,0 +1,95 @@
+"""Sampled cProfile dumps of requests.
+
+``ServerTimingMiddleware`` profiles a ``TODOS_PROFILE_SAMPLE_RATE`` share
+of requests (0 turns sampling off) and writes each profile to
+``TODOS_PROFILE_DIR`` as a ``.prof`` file, which ``pstats``, snakeviz and
+the ``summarize_profiles`` command can read.
+
+Only one request is profiled at a time: from Python 3.12 a second
+``cProfile`` profiler can't be enabled while one is active, so a request
+sampled while another is being profiled just isn't.
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+# Held from start() to stop() by the request being profiled.
+_profiling = threading.Lock()
+
+
+def get_sample_rate():
+    return getattr(settings, "TODOS_PROFILE_SAMPLE_RATE", 0.0)
+
+
+def get_profile_dir():
+    return Path(getattr(settings, "TODOS_PROFILE_DIR", "profiles"))
+
+
+def should_sample():
+    rate = get_sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+def start():
+    """Start profiling this thread; return the profile, or ``None`` if busy.
+
+    Returns ``None`` if another request is being profiled, or if another
+    profiling tool, such as a debugger or coverage, is active.
+    """
+    if not _profiling.acquire(blocking=False):
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        _profiling.release()
+        return None
+    return profile
+
+
+def stop(profile):
+    """Stop ``profile``, letting the next sampled request be profiled."""
+    profile.disable()
+    _profiling.release()
+
+
+def dump(profile, request, total_ms):
+    """Write out the stopped ``profile``; return the file's path.
+
+    The name records when, which URL and how long, e.g.
+    ``20261017T101500-123456-GET-todos-42.1ms.prof``.
+    """
+    directory = get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "root"
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    micros = time.time_ns() // 1000 % 1_000_000
+    path = directory / (
+        f"{stamp}-{micros:06d}-{request.method}-{slug[:80]}-{total_ms:.1f}ms.prof"
+    )
+    profile.dump_stats(path)
+    return path
+
+
+def find_profiles(directory=None, match=""):
+    """Return the ``.prof`` files in ``directory`` whose name contains ``match``."""
+    directory = Path(directory) if directory else get_profile_dir()
+    return sorted(path for path in directory.glob("*.prof") if match in path.name)
+
+
+def summarize(paths, sort="cumulative", limit=20):
+    """Return a report of the hottest ``limit`` functions across ``paths``."""
+    stream = io.StringIO()
+    stats = pstats.Stats(*map(str, paths), stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
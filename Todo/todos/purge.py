@@ -0,0 +1,115 @@
+"""Hard-delete soft-deleted todos in small, rate-limited transactions.
+
+Deleting a todo only sets ``deleted_at`` (see ``TodoQuerySet.delete()``),
+so the request never holds SQLite's write lock for more than one row.
+The rows are removed later by ``purge()``, which the ``purge_deleted_todos``
+command runs from cron or in a loop of its own. It deletes ``chunk_size``
+rows per transaction and sleeps between chunks to stay under ``rate`` rows
+per second, so foreground writes only ever wait for one short chunk.
+"""
+
+import re
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .models import Todo
+from .transfer import Progress
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_RATE = 2000
+DEFAULT_RETENTION = timedelta(days=7)
+
+AGE_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def get_chunk_size():
+    return getattr(settings, "TODOS_PURGE_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def get_rate():
+    """Return the most rows per second to purge; 0 means no limit."""
+    return getattr(settings, "TODOS_PURGE_RATE", DEFAULT_RATE)
+
+
+def get_retention():
+    """Return how long soft-deleted todos are kept before being purged."""
+    return getattr(settings, "TODOS_PURGE_AFTER", DEFAULT_RETENTION)
+
+
+def parse_age(value):
+    """Parse ``"90s"``, ``"30m"``, ``"12h"`` or ``"7d"`` into a ``timedelta``.
+
+    A bare number is a number of days.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid age {value!r}; use e.g. 90s, 30m, 12h or 7d.")
+    number, unit = match.groups()
+    return timedelta(**{AGE_UNITS[unit or "d"]: float(number)})
+
+
+def purgeable(before, using=DEFAULT_DB_ALIAS):
+    """Return the todos soft-deleted before ``before``, oldest first."""
+    return (
+        Todo.all_objects.using(using)
+        .filter(deleted_at__lt=before)
+        .order_by("deleted_at")
+    )
+
+
+def purge_chunk(before, chunk_size, using=DEFAULT_DB_ALIAS):
+    """Hard-delete up to ``chunk_size`` purgeable todos in one transaction.
+
+    Returns the number of todos deleted.
+    """
+    # Picked outside the transaction, so it only holds the write lock
+    # for the DELETE itself.
+    pks = list(purgeable(before, using).values_list("pk", flat=True)[:chunk_size])
+    if not pks:
+        return 0
+    with transaction.atomic(using=using):
+        # Filtered again in case a todo was restored in the meantime.
+        _, deleted = (
+            purgeable(before, using)
+            .filter(pk__in=pks)
+            .only("pk", "deleted_at")
+            .hard_delete()
+        )
+    return deleted.get(Todo._meta.label, 0)
+
+
+def purge(
+    older_than=None,
+    chunk_size=None,
+    rate=None,
+    using=DEFAULT_DB_ALIAS,
+    report=None,
+    sleep=time.sleep,
+):
+    """Hard-delete todos soft-deleted more than ``older_than`` ago.
+
+    Works in transactions of ``chunk_size`` rows, sleeping after each one
+    as long as it takes to keep to ``rate`` rows per second (``0`` for no
+    limit). The defaults come from the ``TODOS_PURGE_*`` settings.
+    Returns a ``transfer.Progress`` with the rows deleted.
+    """
+    older_than = get_retention() if older_than is None else older_than
+    chunk_size = chunk_size or get_chunk_size()
+    rate = get_rate() if rate is None else rate
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    before = timezone.now() - older_than
+    progress = Progress(report)
+    while True:
+        started = time.perf_counter()
+        deleted = purge_chunk(before, chunk_size, using)
+        if not deleted:
+            break
+        progress.add(deleted, f"purging todos deleted before {before:%Y-%m-%d %H:%M}")
+        if rate:
+            sleep(max(deleted / rate - (time.perf_counter() - started), 0))
+    return progress
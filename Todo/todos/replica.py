@@ -0,0 +1,269 @@
+"""Serve the todo list and detail pages from a read replica.
+
+``TODOS_REPLICAS`` maps a database alias to the alias of its replica, a
+copy of the SQLite file that ``sync()`` refreshes with SQLite's online
+backup API; ``python manage.py sync_replica --every 1`` keeps doing it.
+Page reads then stop competing with writes for the primary.
+
+* Views wrapped in ``read_only()`` (the list and detail pages, in
+  ``todos/urls.py``) read from the replica: through ``ReplicaRouter``
+  for plain querysets, and through ``read_alias()`` where code names a
+  database, as ``todos.sharding`` does.
+* Any other request that changes something, i.e. isn't a GET, HEAD,
+  OPTIONS or TRACE, and succeeds sets a cookie that keeps that client
+  on the primary for ``TODOS_REPLICA_STICKY_SECONDS`` (default 5), so it
+  sees its own write until the replica has caught up.
+  ``ReplicaStickinessMiddleware`` sets it, also for GETs that write,
+  such as the toggle link, once they call ``mark_written()``.
+* ``get_status()`` reports how far each replica is behind, and
+  ``/todos/api/replica/`` returns it as JSON.
+
+Everything else, writes included, uses the primary.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.utils import timezone
+
+from . import counters
+
+STICKY_COOKIE = "todos_primary_until"
+# Written into each replica after a copy; the primary never has it.
+SYNC_TABLE = "todos_replica_sync"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_reading = contextvars.ContextVar("todos_replica_reading", default=False)
+
+
+class ReplicaStats:
+    """Process-wide counts of reads served by the replica and the primary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.replica = 0
+            self.sticky = 0
+
+    def record(self, sticky):
+        with self._lock:
+            if sticky:
+                self.sticky += 1
+            else:
+                self.replica += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {"replica": self.replica, "primary_sticky": self.sticky}
+
+
+stats = ReplicaStats()
+
+
+def get_replicas():
+    """Return ``{primary alias: replica alias}``."""
+    return getattr(settings, "TODOS_REPLICAS", {})
+
+
+def get_sticky_seconds():
+    return getattr(settings, "TODOS_REPLICA_STICKY_SECONDS", 5)
+
+
+def is_reading():
+    """Return whether this request reads from the replicas."""
+    return _reading.get()
+
+
+def read_alias(alias=DEFAULT_DB_ALIAS):
+    """Return the alias to read ``alias``'s data from in this context."""
+    if _reading.get():
+        return get_replicas().get(alias, alias)
+    return alias
+
+
+def primary_alias(alias):
+    """Return the primary of replica ``alias``, or ``alias`` itself."""
+    for primary, replica in get_replicas().items():
+        if replica == alias:
+            return primary
+    return alias
+
+
+@contextmanager
+def reading_from_replicas():
+    """Send todo reads in this block to the replicas."""
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def is_sticky(request):
+    """Return whether ``request``'s client wrote recently."""
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+@contextmanager
+def reads_for(request):
+    """Read from the replicas in this block, unless the client just wrote."""
+    if not get_replicas():
+        yield
+        return
+    sticky = is_sticky(request)
+    stats.record(sticky)
+    if sticky:
+        yield
+    else:
+        with reading_from_replicas():
+            yield
+
+
+def read_only(view):
+    """Serve ``view`` from the replicas, unless the client just wrote."""
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            with reads_for(request):
+                return await view(request, *args, **kwargs)
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with reads_for(request):
+                return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def cache_variant(variant, etag):
+    """Return the page cache ``variant`` for a list page with ``etag``.
+
+    A replica can be behind the page cache's generation, so fragments
+    read from one are also keyed by the data they were rendered from.
+    """
+    return f"{variant}:{etag}" if _reading.get() else variant
+
+
+def mark_written(request):
+    """Flag ``request`` as a write even though its method is safe."""
+    request._todos_wrote = True
+
+
+def wrote(request):
+    """Return whether ``request`` may have changed something."""
+    return request.method not in SAFE_METHODS or getattr(request, "_todos_wrote", False)
+
+
+def stick_to_primary(response):
+    """Keep the client on the primary for the next few seconds."""
+    seconds = get_sticky_seconds()
+    response.set_cookie(
+        STICKY_COOKIE,
+        f"{time.time() + seconds:.3f}",
+        max_age=seconds,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+class ReplicaRouter:
+    """Send todo reads to the replica while ``reading_from_replicas()``.
+
+    Replicas are copies, so they are never migrated or written to.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != "todos" or not _reading.get():
+            return None
+        return get_replicas().get(DEFAULT_DB_ALIAS)
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            primary = primary_alias(instance._state.db)
+            if primary != instance._state.db:
+                return primary
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in get_replicas().values():
+            return False
+        return None
+
+
+def sync(primary=DEFAULT_DB_ALIAS):
+    """Copy ``primary`` over its replica; return when the copy was taken.
+
+    Readers of the replica keep reading while it's copied and see the
+    new copy as a whole once it's done. Can't run inside a transaction
+    on ``primary``, whose pending writes would block the copy.
+    """
+    source = connections[primary]
+    target = connections[get_replicas()[primary]]
+    if source.in_atomic_block:
+        raise RuntimeError(f"Can't copy {primary!r} inside a transaction.")
+    source.ensure_connection()
+    target.ensure_connection()
+    synced_at = timezone.now()
+    source.connection.backup(target.connection)
+    with target.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {SYNC_TABLE} (synced_at text NOT NULL)")
+        cursor.execute(
+            f"INSERT INTO {SYNC_TABLE} (synced_at) VALUES (%s)",
+            [synced_at.isoformat()],
+        )
+    return synced_at
+
+
+def get_synced_at(replica):
+    """Return when ``replica``'s copy was taken, or ``None`` if it never was."""
+    try:
+        with connections[replica].cursor() as cursor:
+            cursor.execute(f"SELECT synced_at FROM {SYNC_TABLE}")
+            row = cursor.fetchone()
+    except OperationalError:
+        return None
+    return datetime.fromisoformat(row[0]) if row else None
+
+
+def get_status(primary=DEFAULT_DB_ALIAS):
+    """Return how far ``primary``'s replica is behind.
+
+    ``age_seconds`` is how old the copy is. ``lag_seconds`` is 0 while
+    the primary hasn't changed since, and the age otherwise: the longest
+    a write may have gone unseen. Whether it changed is decided the way
+    the list page's ETag is, from ``MAX(updated_at)`` and the counts.
+    Both are ``None`` before the first copy.
+    """
+    replica = get_replicas()[primary]
+    synced_at = get_synced_at(replica)
+    status = {
+        "primary": primary,
+        "replica": replica,
+        "synced_at": synced_at,
+        "age_seconds": None,
+        "lag_seconds": None,
+        "behind": True,
+    }
+    if synced_at is None:
+        return status
+    age = (timezone.now() - synced_at).total_seconds()
+    behind = counters.get_list_stats(primary) != counters.get_list_stats(replica)
+    status.update(age_seconds=age, lag_seconds=age if behind else 0.0, behind=behind)
+    return status
@@ -0,0 +1,66 @@
+"""Full-text search over todos, backed by an SQLite FTS5 index.
+
+``todos_todo_fts`` is an external-content FTS5 table over the title and
+description of ``todos_todo``. Triggers on ``todos_todo`` keep it in sync,
+so bulk operations and raw SQL are indexed as well as ``save()``. Results
+are ranked with BM25, weighting title matches above description matches.
+Migration ``0004_todo_search_index`` creates the table and its triggers,
+on SQLite only; ``is_supported()`` tells whether a connection has them.
+"""
+
+from django.db import connection
+
+FTS_TABLE = "todos_todo_fts"
+CONTENT_TABLE = "todos_todo"
+
+
+def is_supported(using_connection=None):
+    """Return whether the connection can host the FTS5 index."""
+    return (using_connection or connection).vendor == "sqlite"
+
+
+def rebuild(using_connection=None):
+    """Rebuild the whole index from ``todos_todo``."""
+    with (using_connection or connection).cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def optimize(using_connection=None):
+    """Merge the index into one b-tree, dropping entries of deleted rows.
+
+    FTS5 only marks deleted rows in the index, so after many deletes
+    queries still read past them until it's merged.
+    """
+    if not is_supported(using_connection):
+        return
+    with (using_connection or connection).cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def to_match_query(text):
+    """Turn free text into an FTS5 query matching every word.
+
+    Each word is quoted so FTS5 operators in user input are treated as
+    plain text; the last word also matches as a prefix.
+    """
+    terms = ['"%s"' % word.replace('"', '""') for word in text.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search(queryset, text):
+    """Filter ``queryset`` to rows matching ``text``, best matches first.
+
+    Each row gets a ``search_rank`` attribute; lower is a better match.
+    """
+    match = to_match_query(text)
+    if not match:
+        return queryset.none()
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE}.rowid = {CONTENT_TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+        params=[match],
+        select={"search_rank": f"{FTS_TABLE}.rank"},
+        order_by=["search_rank", "-created_at", "-id"],
+    )
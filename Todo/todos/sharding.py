@@ -0,0 +1,316 @@
+"""Spread todos over several SQLite databases.
+
+A SQLite file has a single writer lock, so however many workers run,
+their writes queue for it. With more than one database alias in
+``TODOS_SHARDS``, todos are spread over them, and writes to different
+shards no longer wait for each other:
+
+* Shard ``i`` of ``TODOS_SHARDS`` hands out ids from ``i * ID_RANGE`` up
+  (``reserve_id_range()``), so a todo's shard follows from its id with no
+  lookup. Shard 0 is ``default``, which keeps the todos it had before.
+* ``ShardRouter`` sends each new todo saved with ``save()`` to the next
+  shard in turn, and ``save()`` and ``delete()`` of an existing todo to
+  its shard. Querysets give the router nothing to go on, so views look a
+  todo up with ``for_pk()``.
+* ``scatter()`` runs a queryset on every shard and merges the rows in the
+  queryset's order; the list view pages through that.
+* Each shard keeps its own counters row, which ``get_list_stats()`` adds
+  up.
+* Under ``replica.read_only()``, ``scatter()`` and ``get_list_stats()``
+  read each shard's replica instead.
+
+The todo pages, the async views, the JSON API and the bulk endpoints all
+go through ``for_pk()``, ``scatter()`` and ``group_by_shard()``, and
+``export_todos`` and ``import_todos`` cover every shard. Migrate the
+shards with ``python manage.py migrate_shards``. The admin and the other
+management commands work on one database, ``default`` unless given
+another.
+"""
+
+import heapq
+import itertools
+from itertools import islice
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Max
+
+from . import counters, replica
+from .models import Todo
+
+# Ids per shard; 2**40 leaves room for a trillion todos in each.
+ID_RANGE = 2**40
+
+_next_shard = itertools.count()
+
+
+def get_shards():
+    """Return the database aliases holding todos, ``default`` first."""
+    return list(getattr(settings, "TODOS_SHARDS", None) or [DEFAULT_DB_ALIAS])
+
+
+def is_enabled():
+    return len(get_shards()) > 1
+
+
+def db_for_pk(pk):
+    """Return the alias of the shard holding todo ``pk``."""
+    shards = get_shards()
+    return shards[min(int(pk) // ID_RANGE, len(shards) - 1)]
+
+
+def for_pk(pk):
+    """Return ``Todo.objects`` on the shard holding todo ``pk``."""
+    return Todo.objects.using(db_for_pk(pk))
+
+
+def next_shard():
+    """Return the shard for a new todo, taking the shards in turn."""
+    shards = get_shards()
+    return shards[next(_next_shard) % len(shards)]
+
+
+class ShardRouter:
+    """Route todos to their shards; see the module docstring."""
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get("instance")
+        if model is not Todo or instance is None or not is_enabled():
+            return None
+        if instance.pk is None:
+            return next_shard()
+        return db_for_pk(instance.pk)
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if model is not Todo or instance is None or instance.pk is None:
+            return None
+        return db_for_pk(instance.pk) if is_enabled() else None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The other shards only hold the todos app.
+        if db != DEFAULT_DB_ALIAS and db in get_shards():
+            return app_label == "todos"
+        return None
+
+
+def reserve_id_range(connection):
+    """Make ``connection``'s shard hand out ids from its own range on.
+
+    Safe to call again; ``migrate_shards`` does after every migration,
+    since rebuilding an empty ``todos_todo`` would reset its sequence.
+    """
+    shards = get_shards()
+    if connection.alias not in shards or connection.vendor != "sqlite":
+        return
+    start = shards.index(connection.alias) * ID_RANGE
+    if not start:
+        return
+    table = Todo._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, %s) WHERE name = %s",
+            [start, table],
+        )
+        if not cursor.rowcount:
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                [table, start],
+            )
+
+
+class SortKey:
+    """Compare rows by ``ordering``, field by field, as the database did."""
+
+    __slots__ = ("values", "descending")
+
+    def __init__(self, values, descending):
+        self.values = values
+        self.descending = descending
+
+    def __lt__(self, other):
+        for a, b, descending in zip(self.values, other.values, self.descending):
+            if a != b:
+                return a > b if descending else a < b
+        return False
+
+
+def get_ordering(queryset):
+    """Return the field names ``queryset`` is ordered by, e.g. ``-created_at``."""
+    query = queryset.query
+    if query.extra_order_by:
+        return list(query.extra_order_by)
+    if query.order_by:
+        return list(query.order_by)
+    return list(queryset.model._meta.ordering) if query.default_ordering else []
+
+
+class ShardedQuerySet:
+    """A queryset run on every shard, with the rows merged in its ordering.
+
+    Supports what the list views, the API and the paginators use:
+    ``filter()``, ``order_by()``, ``only()``, ``count()``, ``aggregate()``
+    of ``Max`` and ``Count``, their async versions, and iteration, sync or
+    ``async for``. Slicing is lazy, like a queryset's, and the rows are
+    fetched once. ``[start:stop]`` reads the first ``stop`` rows of each
+    shard, so deep offset pages cost more; keyset pagination reads one
+    page from each.
+    """
+
+    ordered = True
+
+    def __init__(self, queryset, shards=None, start=0, stop=None):
+        self.queryset = queryset
+        self.model = queryset.model
+        if shards is None:
+            shards = [replica.read_alias(alias) for alias in get_shards()]
+        self.shards = shards
+        self.start = start
+        self.stop = stop
+        self._result_cache = None
+
+    def is_sliced(self):
+        return bool(self.start) or self.stop is not None
+
+    def _chain(self, queryset):
+        if self.is_sliced():
+            raise TypeError("Cannot change a ShardedQuerySet once it is sliced.")
+        return type(self)(queryset, self.shards)
+
+    def filter(self, *args, **kwargs):
+        return self._chain(self.queryset.filter(*args, **kwargs))
+
+    def order_by(self, *fields):
+        return self._chain(self.queryset.order_by(*fields))
+
+    def only(self, *fields):
+        return self._chain(self.queryset.only(*fields))
+
+    def count(self):
+        return sum(self.queryset.using(alias).count() for alias in self.shards)
+
+    async def acount(self):
+        """Async version of ``count()``."""
+        return sum([await self.queryset.using(alias).acount() for alias in self.shards])
+
+    def aggregate(self, **aggregates):
+        """Aggregate on each shard and combine: ``Max`` by max, others by sum."""
+        results = [
+            self.queryset.using(alias).aggregate(**aggregates) for alias in self.shards
+        ]
+        return combine_aggregates(aggregates, results)
+
+    async def aaggregate(self, **aggregates):
+        """Async version of ``aggregate()``."""
+        results = [
+            await self.queryset.using(alias).aaggregate(**aggregates)
+            for alias in self.shards
+        ]
+        return combine_aggregates(aggregates, results)
+
+    def sort_key(self):
+        ordering = get_ordering(self.queryset)
+        names = ["pk" if f.lstrip("-") == "id" else f.lstrip("-") for f in ordering]
+        descending = [f.startswith("-") for f in ordering]
+        return lambda row: SortKey([getattr(row, n) for n in names], descending)
+
+    def shard_querysets(self):
+        """Return the queryset on each shard, limited to ``stop`` rows."""
+        querysets = [self.queryset.using(alias) for alias in self.shards]
+        if self.stop is not None:
+            querysets = [queryset[: self.stop] for queryset in querysets]
+        return querysets
+
+    def merge(self, shard_rows):
+        """Merge each shard's rows in order and cut ``[start:stop]`` out."""
+        merged = heapq.merge(*shard_rows, key=self.sort_key())
+        return list(islice(merged, self.start, self.stop))
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            self._result_cache = self.merge(self.shard_querysets())
+        return self._result_cache
+
+    def __iter__(self):
+        return iter(self._fetch_all())
+
+    def __aiter__(self):
+        async def generator():
+            if self._result_cache is None:
+                shard_rows = [
+                    [row async for row in queryset]
+                    for queryset in self.shard_querysets()
+                ]
+                self._result_cache = self.merge(shard_rows)
+            for row in self._result_cache:
+                yield row
+
+        return generator()
+
+    def __len__(self):
+        return len(self._fetch_all())
+
+    def __bool__(self):
+        return bool(self._fetch_all())
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("ShardedQuerySet only supports slices without a step.")
+        if self.is_sliced():
+            raise TypeError("Cannot slice a ShardedQuerySet twice.")
+        return type(self)(self.queryset, self.shards, key.start or 0, key.stop)
+
+
+def combine_aggregates(aggregates, results):
+    """Combine each shard's ``aggregate()`` results: ``Max`` by max, others by sum."""
+    combined = {}
+    for name, aggregate in aggregates.items():
+        values = [result[name] for result in results if result[name] is not None]
+        if isinstance(aggregate, Max):
+            combined[name] = max(values, default=None)
+        else:
+            combined[name] = sum(values)
+    return combined
+
+
+def scatter(queryset):
+    """Return ``queryset`` run across every shard, or as is without sharding."""
+    return ShardedQuerySet(queryset) if is_enabled() else queryset
+
+
+def get_list_stats():
+    """``counters.get_list_stats()`` over every shard, added up.
+
+    ``last`` is the latest of the shards'. Costs one query per shard.
+    """
+    shards = [replica.read_alias(alias) for alias in get_shards()]
+    if len(shards) == 1:
+        return counters.get_list_stats(shards[0])
+    return combine_list_stats([counters.get_list_stats(alias) for alias in shards])
+
+
+async def aget_list_stats():
+    """Async version of ``get_list_stats()``."""
+    shards = [replica.read_alias(alias) for alias in get_shards()]
+    if len(shards) == 1:
+        return await counters.aget_list_stats(shards[0])
+    return combine_list_stats(
+        [await counters.aget_list_stats(alias) for alias in shards]
+    )
+
+
+def combine_list_stats(stats):
+    return {
+        "last": max((s["last"] for s in stats if s["last"]), default=None),
+        "count": sum(s["count"] for s in stats),
+        "completed": sum(s["completed"] for s in stats),
+        "archived": sum(s["archived"] for s in stats),
+    }
+
+
+def group_by_shard(pks):
+    """Return ``{alias: [pk, ...]}`` for the shards holding todos ``pks``."""
+    groups = {}
+    for pk in pks:
+        groups.setdefault(db_for_pk(pk), []).append(pk)
+    return groups
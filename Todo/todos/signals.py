@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import page_cache
+from .models import Todo
+
+
+@receiver(post_save, sender=Todo, dispatch_uid="todos_bump_generation_on_save")
+@receiver(post_delete, sender=Todo, dispatch_uid="todos_bump_generation_on_delete")
+def bump_page_cache_generation(sender, instance, using, **kwargs):
+    """Invalidate cached list pages whenever a todo changes.
+
+    Purging a soft-deleted todo changes no page, so it doesn't.
+    """
+    if instance.deleted_at is None:
+        page_cache.bump_generation(using)
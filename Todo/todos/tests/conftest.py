@@ -1,7 +1,82 @@
-"""Pytest configuration and fixtures."""
+"""Pytest configuration and fixtures.
+
+Every xdist worker gets its own test database, so the suite can run in
+parallel (``pytest -n auto``). Rows come in three tiers:
+
+* ``todo_factory``, ``sample_todo``... create single todos.
+* ``bulk_todos`` inserts the first ``count`` of the session's
+  ``todo_rows`` with one ``bulk_create``, rolled back after the test.
+* ``large_todos`` inserts ``LARGE_ROWS`` of them once per test class and
+  rolls them back after the class, like ``TestCase.setUpTestData``. Tests
+  using it are marked ``large``; deselect them with ``-m "not large"``.
+"""
+
+import os
 
 import pytest
-from todos.models import Todo
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from todos import counters
+from todos.budgets import budget_exceeded
+from todos.models import Todo, TodoCounters
+from todo_project.sqlite import production_database
+
+LARGE_ROWS = int(os.environ.get("TODOS_TEST_LARGE_ROWS", 10_000))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_password_hasher():
+    """Hash test users' passwords cheaply; the real hashers take ~100 ms."""
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches, since rollbacks don't clear them."""
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def counters_row(request):
+    """Put back the counters row if a transactional test flushed it away.
+
+    pytest-django runs transactional tests last, but under xdist a worker
+    may still get other tests after one.
+    """
+    marker = request.node.get_closest_marker("django_db")
+    if marker is None:
+        return
+    transactional = marker.kwargs.get("transaction", False)
+    request.getfixturevalue("transactional_db" if transactional else "db")
+    if not TodoCounters.objects.filter(pk=counters.ROW_ID).exists():
+        counters.reconcile()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(request):
+    """Fail a test if any request it makes runs over its URL's query budget.
+
+    Budgets live in ``todos/budgets.py``. Time limits are only logged, as
+    test timings are too noisy to fail on. Mark a test with
+    ``allow_budget_violations`` to opt out.
+    """
+    exceeded = []
+
+    def record(sender, view_name, request, violations, **kwargs):
+        exceeded.extend(
+            f"{request.method} {request.path} ({view_name}): {violation}"
+            for violation in violations
+            if violation.startswith("queries")
+        )
+
+    budget_exceeded.connect(record)
+    yield
+    budget_exceeded.disconnect(record)
+    if exceeded and not request.node.get_closest_marker("allow_budget_violations"):
+        pytest.fail("Query budget exceeded:\n" + "\n".join(exceeded))
 
 
 @pytest.fixture
@@ -38,18 +113,85 @@ def completed_todo(db):
     )
 
 
+@pytest.fixture(scope="session")
+def todo_rows():
+    """Field values of ``LARGE_ROWS`` todos, built once per session.
+
+    Row ``i`` is "Todo {i+1}", and every other row from the first on is
+    completed.
+    """
+    return [
+        {
+            "title": f"Todo {i+1}",
+            "description": f"Description {i+1}",
+            "completed": (i % 2 == 0),
+        }
+        for i in range(LARGE_ROWS)
+    ]
+
+
 @pytest.fixture
-def multiple_todos(db):
+def bulk_todos(db, todo_rows):
+    """Factory fixture that inserts the first ``count`` rows in one query."""
+
+    def create_todos(count):
+        return Todo.objects.bulk_create(Todo(**row) for row in todo_rows[:count])
+
+    return create_todos
+
+
+@pytest.fixture
+def multiple_todos(bulk_todos):
     """Fixture that creates multiple todos."""
-    todos = []
-    for i in range(5):
-        todo = Todo.objects.create(
-            title=f"Todo {i+1}",
-            description=f"Description {i+1}",
-            completed=(i % 2 == 0),
-        )
-        todos.append(todo)
-    return todos
+    return bulk_todos(5)
+
+
+@pytest.fixture(scope="class")
+def large_todos(django_db_setup, django_db_blocker, todo_rows):
+    """Fixture that seeds ``LARGE_ROWS`` todos for a whole test class.
+
+    The rows are inserted in an outer transaction that is rolled back
+    after the class; each test runs in a savepoint inside it. Planner
+    statistics are refreshed, so query plans match a real database.
+    Returns the number of rows.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        Todo.objects.bulk_create((Todo(**row) for row in todo_rows), batch_size=2000)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        yield len(todo_rows)
+        transaction.set_rollback(True)
+
+
+@pytest.fixture
+def add_file_database(tmp_path, django_db_blocker):
+    """Factory fixture that adds a migrated file database with the production profile.
+
+    The in-memory test database fails, rather than waits, on conflicting
+    writes from several threads, so concurrent writers use these instead.
+    Returns the alias; the databases are removed after the test. Pass
+    ``migrate=False`` for an empty database.
+    """
+    aliases = []
+
+    def add(alias, migrate=True):
+        database = production_database(str(tmp_path / f"{alias}.sqlite3"))
+        # configure_settings() fills in the defaults, but insists on a "default".
+        connections.settings[alias] = connections.configure_settings(
+            {"default": database}
+        )["default"]
+        aliases.append(alias)
+        if migrate:
+            call_command("migrate", database=alias, verbosity=0)
+        return alias
+
+    with django_db_blocker.unblock():
+        yield add
+        for alias in aliases:
+            connections[alias].close()
+    for alias in aliases:
+        del connections[alias]
+        del connections.settings[alias]
 
 
 @pytest.fixture
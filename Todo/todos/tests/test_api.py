@@ -0,0 +1,183 @@
+"""Tests for the JSON API."""
+
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from todos.models import Todo
+
+
+def send(method, url, data):
+    return getattr(Client(), method)(
+        url, json.dumps(data), content_type="application/json"
+    )
+
+
+def detail_url(todo):
+    return reverse("api:todo_detail", args=[todo.pk])
+
+
+@pytest.mark.django_db
+class TestTodoCollectionApi:
+    """Test cases for listing and creating todos."""
+
+    def test_list(self, multiple_todos):
+        """Test that the list returns todos newest first."""
+        response = Client().get(reverse("api:todo_list"))
+        assert response.status_code == 200
+        titles = [row["title"] for row in response.json()["results"]]
+        assert titles == [f"Todo {i}" for i in range(5, 0, -1)]
+        assert response.json()["next"] is None
+
+    def test_list_field_projection(self, multiple_todos, django_assert_num_queries):
+        """Test that ?fields= limits both the output and the columns loaded."""
+        with django_assert_num_queries(1) as ctx:
+            response = Client().get(reverse("api:todo_list"), {"fields": "title"})
+        assert set(response.json()["results"][0]) == {"title"}
+        assert "description" not in ctx.captured_queries[0]["sql"]
+
+    def test_list_unknown_field(self, db):
+        """Test that an unknown field is a 400."""
+        response = Client().get(reverse("api:todo_list"), {"fields": "title,secret"})
+        assert response.status_code == 400
+
+    def test_list_cursor_pagination(self):
+        """Test that following next cursors walks every todo."""
+        Todo.objects.bulk_create(Todo(title=f"Todo {i}") for i in range(25))
+        client = Client()
+        seen = []
+        params = {"limit": 10, "fields": "id"}
+        while True:
+            data = client.get(reverse("api:todo_list"), params).json()
+            seen.extend(row["id"] for row in data["results"])
+            if not data["next"]:
+                break
+            params["cursor"] = data["next"]
+        assert sorted(seen) == sorted(Todo.objects.values_list("pk", flat=True))
+
+    def test_list_search(self, multiple_todos):
+        """Test that ?q= returns ranked search results."""
+        response = Client().get(reverse("api:todo_list"), {"q": "description 2"})
+        assert [row["title"] for row in response.json()["results"]] == ["Todo 2"]
+
+    def test_list_bad_limit(self, db):
+        """Test that an out-of-range limit is a 400."""
+        response = Client().get(reverse("api:todo_list"), {"limit": 0})
+        assert response.status_code == 400
+
+    def test_create(self, db):
+        """Test creating a todo."""
+        response = send("post", reverse("api:todo_list"), {"title": "From API"})
+        assert response.status_code == 201
+        assert response.json()["title"] == "From API"
+        assert Todo.objects.filter(pk=response.json()["id"]).exists()
+
+    def test_create_invalid(self, db):
+        """Test that a missing title is a 400 with field errors."""
+        response = send("post", reverse("api:todo_list"), {"description": "x"})
+        assert response.status_code == 400
+        assert "title" in response.json()["errors"]
+
+
+@pytest.mark.django_db
+class TestTodoResourceApi:
+    """Test cases for a single todo."""
+
+    def test_detail(self, sample_todo):
+        """Test reading one todo with every field."""
+        data = Client().get(detail_url(sample_todo)).json()
+        assert data["id"] == sample_todo.pk
+        assert data["title"] == "Sample Todo"
+        assert set(data) == {
+            "id",
+            "title",
+            "description",
+            "completed",
+            "created_at",
+            "updated_at",
+        }
+
+    def test_detail_projection(self, sample_todo, django_assert_num_queries):
+        """Test that the detail view only loads the requested columns."""
+        with django_assert_num_queries(1) as ctx:
+            data = Client().get(detail_url(sample_todo), {"fields": "completed"}).json()
+        assert data == {"completed": False}
+        assert "description" not in ctx.captured_queries[0]["sql"]
+
+    def test_detail_404(self, db):
+        """Test that a missing todo is a JSON 404."""
+        response = Client().get(reverse("api:todo_detail", args=[999]))
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Not found."}
+
+    def test_put(self, sample_todo):
+        """Test replacing a todo."""
+        response = send("put", detail_url(sample_todo), {"title": "Replaced"})
+        assert response.status_code == 200
+        sample_todo.refresh_from_db()
+        assert sample_todo.title == "Replaced"
+        assert sample_todo.description == ""
+
+    def test_patch(self, sample_todo):
+        """Test partially updating a todo keeps the other fields."""
+        response = send("patch", detail_url(sample_todo), {"completed": True})
+        assert response.status_code == 200
+        sample_todo.refresh_from_db()
+        assert sample_todo.completed is True
+        assert sample_todo.title == "Sample Todo"
+
+    def test_write_requires_json(self, sample_todo):
+        """Test that a form-encoded body is rejected."""
+        response = Client().put(detail_url(sample_todo), "title=x")
+        assert response.status_code == 400
+
+    def test_delete(self, sample_todo):
+        """Test deleting a todo."""
+        response = Client().delete(
+            detail_url(sample_todo), headers={"content-type": "application/json"}
+        )
+        assert response.status_code == 204
+        assert not Todo.objects.filter(pk=sample_todo.pk).exists()
+
+    def test_toggle(self, sample_todo):
+        """Test toggling a todo returns its new state."""
+        url = reverse("api:todo_toggle", args=[sample_todo.pk])
+        response = Client().post(
+            url + "?fields=completed", content_type="application/json"
+        )
+        assert response.json() == {"completed": True}
+
+    def test_toggle_404(self, db):
+        """Test toggling a missing todo."""
+        response = Client().post(
+            reverse("api:todo_toggle", args=[999]), content_type="application/json"
+        )
+        assert response.status_code == 404
+
+    def test_cross_site_form_rejected(self, sample_todo):
+        """Test that a form-encoded POST, as a cross-site form sends, is rejected."""
+        client = Client(enforce_csrf_checks=True)
+        url = reverse("api:todo_toggle", args=[sample_todo.pk])
+        response = client.post(url, {}, headers={"origin": "https://evil.example"})
+        assert response.status_code == 400
+        assert not Todo.objects.get(pk=sample_todo.pk).completed
+        response = client.delete(detail_url(sample_todo))
+        assert response.status_code == 400
+        assert Todo.objects.filter(pk=sample_todo.pk).exists()
+
+
+@pytest.mark.django_db
+class TestTodoExportApi:
+    """Test cases for the streaming export."""
+
+    def test_export_streams_ndjson(self, multiple_todos):
+        """Test that the export streams one JSON object per line."""
+        response = Client().get(
+            reverse("api:todo_export"), {"fields": "id,title", "chunk_size": 2}
+        )
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert rows == [{"id": t.pk, "title": t.title} for t in multiple_todos]
@@ -0,0 +1,204 @@
+"""Tests for archiving completed todos and reading them back."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.http import Http404
+from django.test import AsyncRequestFactory, Client
+from django.urls import reverse
+from django.utils import timezone
+from todos import archive, async_views, counters, page_cache, search
+from todos.models import Todo, TodoArchive
+
+LIST_URL = reverse("todo_list")
+
+
+def make_old(todos, ago=timedelta(days=31)):
+    """Make ``todos`` look last changed ``ago`` before now."""
+    Todo.objects.filter(pk__in=[t.pk for t in todos]).update(
+        updated_at=timezone.now() - ago
+    )
+
+
+@pytest.fixture
+def todos(todo_factory):
+    """Fixture with an old and a new completed todo and an old pending one."""
+    todos = {
+        "old_done": todo_factory(
+            title="Old done", description="Finished", completed=True
+        ),
+        "old_pending": todo_factory(title="Old pending"),
+        "new_done": todo_factory(title="New done", completed=True),
+    }
+    make_old([todos["old_done"], todos["old_pending"]])
+    return todos
+
+
+@pytest.fixture
+def archived(todos):
+    """Fixture that archives the old completed todo."""
+    archive.archive(rate=0)
+    return todos["old_done"]
+
+
+def titles(response):
+    return [todo.title for todo in response.context["todos"]]
+
+
+@pytest.mark.django_db
+class TestArchive:
+    """Test cases for moving completed todos into the archive."""
+
+    def test_moves_only_old_completed(self, todos):
+        """Test that only completed todos unchanged for long are archived."""
+        assert archive.archive(rate=0).rows == 1
+        old_done = todos["old_done"]
+        archived = TodoArchive.objects.get()
+        assert archived.pk == old_done.pk
+        assert (archived.title, archived.description) == ("Old done", "Finished")
+        assert archived.created_at == old_done.created_at
+        assert not Todo.all_objects.filter(pk=old_done.pk).exists()
+        assert set(Todo.objects.values_list("title", flat=True)) == {
+            "Old pending",
+            "New done",
+        }
+
+    def test_counters(self, archived):
+        """Test that archived todos move from total and completed to archived."""
+        counts = counters.get_counts()
+        assert (counts.total, counts.completed, counts.archived) == (2, 1, 1)
+        _, reconciled = counters.reconcile()
+        assert (reconciled.total, reconciled.completed, reconciled.archived) == (
+            2,
+            1,
+            1,
+        )
+
+    def test_leaves_search_index(self, archived):
+        """Test that archived todos are no longer found by search."""
+        assert not search.search(Todo.objects.all(), "Finished").exists()
+
+    def test_chunks_and_rate_limit(self, bulk_todos):
+        """Test that each chunk is followed by a sleep sized to the rate."""
+        make_old(bulk_todos(20))
+        sleeps = []
+        progress = archive.archive(chunk_size=4, rate=1000, sleep=sleeps.append)
+        assert progress.rows == 10
+        assert len(sleeps) == 3
+        assert all(0 <= s <= 0.004 for s in sleeps)
+        assert TodoArchive.objects.count() == 10
+
+    def test_bumps_page_cache_once_per_chunk(self, bulk_todos):
+        """Test that a chunk invalidates cached pages once, not once per row."""
+        make_old(bulk_todos(10))
+        generation = page_cache.get_generation()
+        archive.archive(rate=0)
+        assert page_cache.get_generation() == generation + 1
+
+    def test_invalid_chunk_size(self):
+        """Test that a chunk size below one is rejected."""
+        with pytest.raises(ValueError):
+            archive.archive(chunk_size=-1)
+
+
+@pytest.mark.django_db
+class TestArchiveTodosCommand:
+    """Test cases for the archive_todos management command."""
+
+    def test_archives(self, todos):
+        """Test that the command archives and reports how many it moved."""
+        err = StringIO()
+        call_command("archive_todos", "--older-than", "30d", "--rate", "0", stderr=err)
+        assert "Archived 1 completed todos" in err.getvalue()
+        assert TodoArchive.objects.count() == 1
+
+    def test_default_age(self, settings, todos):
+        """Test that TODOS_ARCHIVE_AFTER applies without --older-than."""
+        settings.TODOS_ARCHIVE_AFTER = timedelta(days=60)
+        call_command("archive_todos", stderr=StringIO())
+        assert not TodoArchive.objects.exists()
+
+    def test_invalid_age(self):
+        """Test that an unparseable --older-than is an error."""
+        with pytest.raises(CommandError, match="Invalid age"):
+            call_command("archive_todos", "--older-than", "soon")
+
+
+@pytest.mark.django_db
+class TestArchivedViews:
+    """Test cases for reading archived todos from the list and detail pages."""
+
+    def test_list_leaves_out_archived(self, archived):
+        """Test that the list shows only live todos by default."""
+        response = Client().get(LIST_URL)
+        assert titles(response) == ["New done", "Old pending"]
+        assert response.context["counts"].total == 2
+
+    def test_list_includes_archived(self, archived):
+        """Test that ?archived=1 lists archived todos among the rest."""
+        response = Client().get(LIST_URL, {"archived": "1"})
+        assert titles(response) == ["New done", "Old pending", "Old done"]
+        assert [todo.is_archived for todo in response.context["todos"]] == [
+            False,
+            False,
+            True,
+        ]
+        assert response.context["counts"].total == 3
+        content = response.content.decode()
+        assert f"/{archived.pk}/toggle/" not in content
+        assert "Hide archived todos" in content
+
+    def test_archived_list_pages(self, settings, bulk_todos):
+        """Test that pages of the archived list keep ?archived=1."""
+        # Cursors can't page through a UNION, so offset pagination is used.
+        settings.TODOS_PAGINATION_MODE = "keyset"
+        make_old(bulk_todos(12))
+        archive.archive(rate=0)
+        client = Client()
+        first = client.get(LIST_URL, {"archived": "1"})
+        assert len(first.context["todos"]) == 10
+        assert "?page=2&amp;archived=1" in first.content.decode()
+        second = client.get(LIST_URL, {"archived": "1", "page": "2"})
+        assert titles(second) == ["Todo 2", "Todo 1"]
+
+    def test_archiving_changes_etag(self, todos):
+        """Test that archiving a todo changes the archived list's ETag."""
+        client = Client()
+        etag = client.get(LIST_URL, {"archived": "1"})["ETag"]
+        archive.archive(rate=0)
+        response = client.get(
+            LIST_URL, {"archived": "1"}, headers={"if-none-match": etag}
+        )
+        assert response.status_code == 200
+
+    def test_detail_falls_back_to_archive(self, archived):
+        """Test that an archived todo's page is served from the archive."""
+        client = Client()
+        url = reverse("todo_detail", args=[archived.pk])
+        response = client.get(url)
+        assert response.context["todo"].is_archived
+        assert "Old done" in response.content.decode()
+        assert f"/{archived.pk}/toggle/" not in response.content.decode()
+        response = client.get(url, headers={"if-none-match": response["ETag"]})
+        assert response.status_code == 304
+
+    def test_archived_todo_cannot_be_toggled(self, archived):
+        """Test that toggling an archived todo is a 404."""
+        response = Client().post(reverse("todo_toggle", args=[archived.pk]))
+        assert response.status_code == 404
+
+    def test_async_views(self, archived):
+        """Test that the async list and detail views read the archive too."""
+        factory = AsyncRequestFactory()
+        list_view = async_to_sync(async_views.AsyncTodoListView.as_view())
+        detail_view = async_to_sync(async_views.AsyncTodoDetailView.as_view())
+        response = list_view(factory.get(LIST_URL, {"archived": "1"}))
+        assert "Old done" in response.content.decode()
+        url = reverse("todo_detail", args=[archived.pk])
+        response = detail_view(factory.get(url), pk=archived.pk)
+        assert "Old done" in response.content.decode()
+        with pytest.raises(Http404):
+            detail_view(factory.get("/todo/999/"), pk=999)
@@ -0,0 +1,123 @@
+"""Tests for the native async todo views."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import Http404
+from django.test import AsyncRequestFactory, Client, override_settings
+from django.urls import reverse
+from todos import async_views
+from todos.models import Todo
+
+LIST_URL = reverse("todo_list")
+
+list_view = async_views.AsyncTodoListView.as_view()
+detail_view = async_views.AsyncTodoDetailView.as_view()
+
+
+def call(view, path, data=None, method="get", headers=None, **kwargs):
+    """Run an async view to completion on a request for ``path``."""
+    factory = AsyncRequestFactory()
+    request = getattr(factory, method)(path, data, headers=headers)
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.mark.django_db
+class TestAsyncTodoListView:
+    """Test cases for AsyncTodoListView."""
+
+    def test_renders_same_page_as_sync_view(self, multiple_todos):
+        """Test that the async list matches the sync list's HTML and ETag."""
+        expected = Client().get(LIST_URL)
+        response = call(list_view, LIST_URL)
+        assert response.status_code == 200
+        assert response["ETag"] == expected["ETag"]
+        for todo in multiple_todos:
+            assert todo.title in response.content.decode()
+
+    def test_shows_counts(self, multiple_todos):
+        """Test that the totals come from the counters row."""
+        response = call(list_view, LIST_URL)
+        assert "3 of 5 done, 2 pending" in response.content.decode()
+
+    def test_matching_etag_returns_304(self, multiple_todos):
+        """Test that a current ETag gets 304."""
+        etag = call(list_view, LIST_URL)["ETag"]
+        response = call(list_view, LIST_URL, headers={"if-none-match": etag})
+        assert response.status_code == 304
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=300)
+    def test_page_cache_hit(self, multiple_todos):
+        """Test that the second request is served from the page cache."""
+        assert call(list_view, LIST_URL)["X-Page-Cache"] == "miss"
+        assert call(list_view, LIST_URL)["X-Page-Cache"] == "hit"
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=0)
+    def test_offset_pagination(self):
+        """Test that page numbers work, including "last"."""
+        Todo.objects.bulk_create(Todo(title=f"Todo {i}") for i in range(15))
+        html = call(list_view, LIST_URL, {"page": "last"}).content.decode()
+        assert "Page 2 of 2" in html
+        with pytest.raises(Http404):
+            call(list_view, LIST_URL, {"page": 3})
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=0, TODOS_PAGINATION_MODE="keyset")
+    def test_keyset_pagination(self):
+        """Test that keyset mode pages through every todo once."""
+        Todo.objects.bulk_create(Todo(title=f"Item {i:02d}") for i in range(15))
+        html = call(list_view, LIST_URL).content.decode()
+        assert html.count('<h5 class="todo-title">') == 10
+        assert "?cursor=" in html
+        with pytest.raises(Http404):
+            call(list_view, LIST_URL, {"cursor": "bogus"})
+
+    def test_search(self, multiple_todos):
+        """Test that ``?q=`` filters the list."""
+        html = call(list_view, LIST_URL, {"q": "Todo 3"}).content.decode()
+        assert "Todo 3" in html
+        assert "Description 1" not in html
+
+
+@pytest.mark.django_db
+class TestAsyncTodoDetailView:
+    """Test cases for AsyncTodoDetailView."""
+
+    def test_renders_todo(self, sample_todo):
+        """Test that the todo is shown with the sync view's validators."""
+        url = reverse("todo_detail", args=[sample_todo.pk])
+        expected = Client().get(url)
+        response = call(detail_view, url, pk=sample_todo.pk)
+        assert sample_todo.title in response.content.decode()
+        assert response["ETag"] == expected["ETag"]
+        assert response["Last-Modified"] == expected["Last-Modified"]
+
+    def test_matching_etag_returns_304(self, sample_todo):
+        """Test that a current ETag gets 304."""
+        url = reverse("todo_detail", args=[sample_todo.pk])
+        etag = call(detail_view, url, pk=sample_todo.pk)["ETag"]
+        response = call(
+            detail_view, url, headers={"if-none-match": etag}, pk=sample_todo.pk
+        )
+        assert response.status_code == 304
+
+    def test_missing_todo(self, db):
+        """Test that a nonexistent todo is a 404."""
+        with pytest.raises(Http404):
+            call(detail_view, "/todo/999/", pk=999)
+
+
+@pytest.mark.django_db
+class TestAsyncToggleTodo:
+    """Test cases for the async toggle_todo view."""
+
+    def test_toggles_and_redirects(self, sample_todo):
+        """Test that toggling flips completed and redirects to the list."""
+        response = call(async_views.toggle_todo, "/", pk=sample_todo.pk)
+        assert response.status_code == 302
+        assert response.url == LIST_URL
+        sample_todo.refresh_from_db()
+        assert sample_todo.completed is True
+
+    def test_missing_todo(self, db):
+        """Test that toggling a nonexistent todo is a 404."""
+        with pytest.raises(Http404):
+            call(async_views.toggle_todo, "/", pk=999)
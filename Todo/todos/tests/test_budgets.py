@@ -0,0 +1,108 @@
+"""Tests for request instrumentation and per-URL budgets."""
+
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import AsyncRequestFactory, Client, override_settings
+from django.urls import reverse
+from todos import budgets, instrumentation
+from todos.middleware import BudgetMiddleware
+from todos.models import Todo
+
+
+def stats_for(response):
+    return response.wsgi_request.todos_stats.as_dict()
+
+
+@pytest.mark.django_db
+class TestInstrumentation:
+    """Test cases for collecting per-request stats."""
+
+    def test_counts_queries(self, multiple_todos):
+        """Test that queries run inside collect() are counted and timed."""
+        with instrumentation.collect() as stats:
+            list(Todo.objects.all())
+            Todo.objects.count()
+        assert stats.queries == 2
+        assert stats.db_time > 0
+
+    def test_ignores_transaction_control(self, sample_todo):
+        """Test that SAVEPOINT/RELEASE statements are not counted."""
+        from django.db import transaction
+
+        with instrumentation.collect() as stats:
+            with transaction.atomic():
+                Todo.objects.filter(pk=sample_todo.pk).toggle_completed()
+        assert stats.queries == 1
+
+    def test_nothing_recorded_outside_collect(self, sample_todo):
+        """Test that queries outside collect() leave no stats behind."""
+        list(Todo.objects.all())
+        assert instrumentation.current() is None
+
+    def test_nested_collect_shares_stats(self, sample_todo):
+        """Test that a nested collect() adds to the outer stats."""
+        with instrumentation.collect() as outer:
+            with instrumentation.collect() as inner:
+                list(Todo.objects.all())
+        assert inner is outer
+        assert outer.queries == 1
+
+    def test_times_template_rendering(self, sample_todo):
+        """Test that rendering a template adds to render time."""
+        with instrumentation.collect() as stats:
+            render_to_string("todos/todo_detail.html", {"todo": sample_todo})
+        assert stats.render_time > 0
+        assert stats.as_dict()["total_ms"] >= stats.as_dict()["render_ms"]
+
+
+@pytest.mark.django_db
+class TestBudgetMiddleware:
+    """Test cases for measuring views against their budgets."""
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=300)
+    def test_list_page_queries(self, multiple_todos):
+        """Test that the list page runs two queries, then one from the cache."""
+        client = Client()
+        assert stats_for(client.get(reverse("todo_list")))["queries"] == 2
+        assert stats_for(client.get(reverse("todo_list")))["queries"] == 1
+
+    def test_detail_and_toggle_queries(self, sample_todo):
+        """Test the detail page and toggle query counts."""
+        client = Client()
+        response = client.get(reverse("todo_detail", args=[sample_todo.pk]))
+        assert stats_for(response)["queries"] == 2
+        assert stats_for(response)["render_ms"] > 0
+        response = client.get(reverse("todo_toggle", args=[sample_todo.pk]))
+        assert stats_for(response)["queries"] == 1
+
+    @pytest.mark.allow_budget_violations
+    @override_settings(TODOS_BUDGETS={"todo_list": {"queries": 1}})
+    def test_violation_is_logged(self, multiple_todos, caplog):
+        """Test that a request over budget is logged as a warning."""
+        with caplog.at_level(logging.WARNING, logger="todos.budgets"):
+            Client().get(reverse("todo_list"))
+        assert "todo_list" in caplog.text
+        assert "queries 2 > 1" in caplog.text
+
+    @override_settings(TODOS_BUDGETS={"todo_list": None})
+    def test_budget_can_be_removed(self):
+        """Test that a None entry in settings drops the default budget."""
+        assert "todo_list" not in budgets.get_budgets()
+        assert "todo_detail" in budgets.get_budgets()
+
+    def test_async_requests_are_measured(self, sample_todo):
+        """Test that the middleware measures async views without a thread hop."""
+
+        async def view(request):
+            await sync_to_async(list)(Todo.objects.all())
+            await Todo.objects.acount()
+            return HttpResponse()
+
+        middleware = BudgetMiddleware(view)
+        request = AsyncRequestFactory().get("/")
+        async_to_sync(middleware)(request)
+        assert request.todos_stats.queries == 2
@@ -0,0 +1,170 @@
+"""Tests for bulk operations."""
+
+import json
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.test import Client
+from django.urls import reverse
+from todos import bulk
+from todos.models import Todo
+
+
+def post_json(url, data):
+    return Client().post(url, json.dumps(data), content_type="application/json")
+
+
+@pytest.mark.django_db
+class TestBulkOperations:
+    """Test cases for the functions in todos.bulk."""
+
+    def test_bulk_create_todos(self, django_assert_num_queries):
+        """Test that items are created in batches within one transaction."""
+        items = [{"title": f"Todo {i}"} for i in range(7)]
+        # 7 rows in batches of 3, plus SAVEPOINT and RELEASE.
+        with django_assert_num_queries(5):
+            todos = bulk.bulk_create_todos(items, batch_size=3)
+        assert len(todos) == 7
+        assert Todo.objects.count() == 7
+
+    def test_bulk_create_rejects_invalid_items(self):
+        """Test that one invalid item aborts the whole batch."""
+        items = [{"title": "Good"}, {"description": "No title"}]
+        with pytest.raises(ValidationError) as excinfo:
+            bulk.bulk_create_todos(items)
+        assert "1" in excinfo.value.message_dict
+        assert Todo.objects.count() == 0
+
+    def test_bulk_set_completed(self, multiple_todos, django_assert_num_queries):
+        """Test that completion is set with one UPDATE per batch."""
+        ids = [todo.pk for todo in multiple_todos]
+        # Two UPDATEs, plus SAVEPOINT and RELEASE.
+        with django_assert_num_queries(4):
+            updated = bulk.bulk_set_completed(ids, batch_size=3)
+        assert updated == 5
+        assert Todo.objects.filter(completed=True).count() == 5
+
+    def test_bulk_delete(self, multiple_todos):
+        """Test that only the given ids are deleted."""
+        ids = [todo.pk for todo in multiple_todos[:3]]
+        assert bulk.bulk_delete(ids, batch_size=2) == 3
+        assert Todo.objects.count() == 2
+
+    @pytest.mark.parametrize(
+        "batch_size", [0, -1, "x", "5", 2.9, float("inf"), True, 10**6]
+    )
+    def test_invalid_batch_size(self, batch_size):
+        """Test that anything but an integer from 1 to the maximum is rejected."""
+        with pytest.raises(ValueError):
+            bulk.get_batch_size(batch_size)
+
+
+@pytest.mark.django_db
+class TestBulkEndpoints:
+    """Test cases for the bulk JSON endpoints."""
+
+    def test_bulk_create_endpoint(self):
+        """Test creating todos through the endpoint."""
+        response = post_json(
+            reverse("todo_bulk_create"),
+            {"todos": [{"title": "A"}, {"title": "B", "completed": True}]},
+        )
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        assert len(response.json()["ids"]) == 2
+        assert Todo.objects.filter(completed=True).count() == 1
+
+    def test_bulk_create_endpoint_validation_errors(self):
+        """Test that invalid items return 400 with per-item errors."""
+        response = post_json(reverse("todo_bulk_create"), {"todos": [{}]})
+        assert response.status_code == 400
+        assert "0" in response.json()["errors"]
+
+    def test_bulk_complete_endpoint(self, multiple_todos):
+        """Test marking todos pending through the endpoint."""
+        ids = [todo.pk for todo in multiple_todos]
+        response = post_json(
+            reverse("todo_bulk_complete"), {"ids": ids, "completed": False}
+        )
+        assert response.json() == {"updated": 5}
+        assert not Todo.objects.filter(completed=True).exists()
+
+    def test_bulk_delete_endpoint(self, multiple_todos):
+        """Test deleting todos through the endpoint."""
+        ids = [todo.pk for todo in multiple_todos]
+        response = post_json(reverse("todo_bulk_delete"), {"ids": ids})
+        assert response.json() == {"deleted": 5}
+        assert Todo.objects.count() == 0
+
+    def test_bulk_endpoint_requires_json(self, multiple_todos):
+        """Test that form-encoded bodies are rejected."""
+        response = Client().post(reverse("todo_bulk_delete"), {"ids": 1})
+        assert response.status_code == 400
+        assert Todo.objects.count() == 5
+
+    def test_bulk_endpoint_requires_post(self):
+        """Test that GET is not allowed."""
+        response = Client().get(reverse("todo_bulk_delete"))
+        assert response.status_code == 405
+
+    def test_bulk_endpoint_bad_ids(self):
+        """Test that malformed ids return 400."""
+        response = post_json(reverse("todo_bulk_delete"), {"ids": "1,2"})
+        assert response.status_code == 400
+
+    def test_bulk_endpoint_bad_id_items(self, multiple_todos):
+        """Test that ids that aren't 64-bit integers return 400 by index."""
+        ids = [multiple_todos[0].pk, 10**30, "2", True, -(2**64)]
+        response = post_json(reverse("todo_bulk_delete"), {"ids": ids})
+        assert response.status_code == 400
+        assert set(response.json()["errors"]) == {"1", "2", "3", "4"}
+        assert Todo.objects.count() == 5
+
+    def test_bulk_create_endpoint_bad_items(self):
+        """Test that items that aren't objects return 400 by index."""
+        response = post_json(
+            reverse("todo_bulk_create"), {"todos": [{"title": "A"}, "x", [1]]}
+        )
+        assert response.status_code == 400
+        assert set(response.json()["errors"]) == {"1", "2"}
+        assert Todo.objects.count() == 0
+
+    @pytest.mark.parametrize("batch_size", ["1e400", "2.9", "true"])
+    @pytest.mark.parametrize("url", ["todo_bulk_create", "todo_bulk_complete"])
+    def test_bulk_endpoint_bad_batch_size(self, multiple_todos, url, batch_size):
+        """Test that a batch size that isn't a sane integer returns 400."""
+        ids = [todo.pk for todo in multiple_todos]
+        body = (
+            f'{{"todos": [{{"title": "A"}}], "ids": {ids}, "batch_size": {batch_size}}}'
+        )
+        response = Client().post(reverse(url), body, content_type="application/json")
+        assert response.status_code == 400
+        assert "batch_size" in response.json()["errors"]["__all__"][0]
+        assert Todo.objects.count() == 5
+        assert Todo.objects.filter(completed=True).count() == 3
+
+
+@pytest.mark.django_db
+class TestBulkAdminActions:
+    """Test cases for the bulk admin actions."""
+
+    def run_action(self, admin_client, action, todos):
+        return admin_client.post(
+            reverse("admin:todos_todo_changelist"),
+            {"action": action, "_selected_action": [todo.pk for todo in todos]},
+        )
+
+    def test_mark_completed_action(self, admin_client, multiple_todos):
+        """Test the mark completed admin action."""
+        self.run_action(admin_client, "mark_completed", multiple_todos)
+        assert Todo.objects.filter(completed=True).count() == 5
+
+    def test_mark_pending_action(self, admin_client, multiple_todos):
+        """Test the mark pending admin action."""
+        self.run_action(admin_client, "mark_pending", multiple_todos)
+        assert Todo.objects.filter(completed=False).count() == 5
+
+    def test_delete_in_batches_action(self, admin_client, multiple_todos):
+        """Test the batched delete admin action."""
+        self.run_action(admin_client, "delete_in_batches", multiple_todos[:2])
+        assert Todo.objects.count() == 3
@@ -0,0 +1,113 @@
+"""Tests for gzipped HTML responses and precompressed static files."""
+
+import gzip
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from todo_project import staticfiles
+
+LIST_URL = reverse("todo_list")
+GZIP = {"accept-encoding": "gzip, deflate, br"}
+
+
+@pytest.mark.django_db
+class TestHTMLGZipMiddleware:
+    """Test cases for HTMLGZipMiddleware."""
+
+    def test_compresses_list_page(self, multiple_todos):
+        """Test that the list page is gzipped for clients that accept it."""
+        plain = Client().get(LIST_URL)
+        response = Client().get(LIST_URL, headers=GZIP)
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == plain.content
+        assert len(response.content) < len(plain.content) / 2
+
+    def test_not_without_accept_encoding(self, multiple_todos):
+        """Test that clients that don't ask for gzip get plain HTML."""
+        assert not Client().get(LIST_URL).has_header("Content-Encoding")
+
+    def test_below_threshold(self, settings, multiple_todos):
+        """Test that pages under TODOS_GZIP_MIN_LENGTH are sent as is."""
+        settings.TODOS_GZIP_MIN_LENGTH = 1_000_000
+        assert not Client().get(LIST_URL, headers=GZIP).has_header("Content-Encoding")
+
+    def test_json_left_alone(self, multiple_todos):
+        """Test that non-HTML responses are not compressed."""
+        response = Client().get(reverse("api:todo_list"), headers=GZIP)
+        assert not response.has_header("Content-Encoding")
+
+    def test_conditional_get_with_weak_etag(self, multiple_todos):
+        """Test that the ETag of a gzipped page still gets a 304."""
+        client = Client()
+        etag = client.get(LIST_URL, headers=GZIP)["ETag"]
+        assert etag.startswith("W/")
+        response = client.get(LIST_URL, headers={**GZIP, "if-none-match": etag})
+        assert response.status_code == 304
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    """Fixture that runs collectstatic with the compressed manifest storage."""
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "todo_project.staticfiles.CompressedManifestStaticFilesStorage"
+        },
+    }
+    call_command("collectstatic", "--noinput", "--ignore", "admin", verbosity=0)
+    return tmp_path
+
+
+class TestCompressedManifestStaticFilesStorage:
+    """Test cases for hashed, precompressed static files."""
+
+    def test_hashed_and_gzipped(self, collected):
+        """Test that the CSS gets a hashed name and a gzipped copy of it."""
+        name = staticfiles_storage.stored_name("todos/todos.css")
+        assert name != "todos/todos.css"
+        hashed = collected / name
+        compressed = collected / f"{name}.gz"
+        assert gzip.decompress(compressed.read_bytes()) == hashed.read_bytes()
+        assert compressed.stat().st_size < hashed.stat().st_size
+
+    def test_compress_skips_binary_and_tiny_files(self, tmp_path):
+        """Test that only text files worth compressing get a .gz copy."""
+        (tmp_path / "logo.png").write_bytes(b"x" * 4096)
+        (tmp_path / "tiny.css").write_text("a{}")
+        assert not staticfiles.compress(tmp_path / "logo.png")
+        assert not staticfiles.compress(tmp_path / "tiny.css")
+        assert not list(tmp_path.glob("*.gz"))
+
+
+class TestServe:
+    """Test cases for serving collected static files."""
+
+    def serve(self, path, **headers):
+        request = RequestFactory().get(f"/static/{path}", headers=headers)
+        return staticfiles.serve(request, path)
+
+    def test_serves_gzip_with_far_future_caching(self, collected):
+        """Test that hashed files go out precompressed and cacheable."""
+        name = staticfiles_storage.stored_name("todos/todos.css")
+        response = self.serve(name, **GZIP)
+        assert response["Content-Type"] == "text/css"
+        assert response["Content-Encoding"] == "gzip"
+        assert "immutable" in response["Cache-Control"]
+        assert "max-age=31536000" in response["Cache-Control"]
+        assert response["Vary"] == "Accept-Encoding"
+
+    def test_identity_for_clients_without_gzip(self, collected):
+        """Test that the uncompressed file is sent without Accept-Encoding."""
+        name = staticfiles_storage.stored_name("todos/todos.css")
+        response = self.serve(name)
+        assert not response.has_header("Content-Encoding")
+        assert b"".join(response.streaming_content) == (collected / name).read_bytes()
+
+    def test_unhashed_names_are_revalidated(self, collected):
+        """Test that files under their original name aren't cached for long."""
+        assert self.serve("todos/todos.css")["Cache-Control"] == "no-cache"
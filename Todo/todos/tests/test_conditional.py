@@ -0,0 +1,119 @@
+"""Tests for conditional GET (ETag / Last-Modified) handling."""
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from todos.models import Todo
+
+LIST_URL = reverse("todo_list")
+
+
+def detail_url(todo):
+    return reverse("todo_detail", args=[todo.pk])
+
+
+@pytest.mark.django_db
+class TestDetailConditionalGet:
+    """Test cases for conditional GETs on TodoDetailView."""
+
+    def test_sends_validators(self, sample_todo):
+        """Test that a full response carries ETag and Last-Modified."""
+        response = Client().get(detail_url(sample_todo))
+        assert response.status_code == 200
+        assert response.has_header("ETag")
+        assert response.has_header("Last-Modified")
+
+    def test_matching_etag_returns_304(self, sample_todo):
+        """Test that a current ETag gets 304 without rendering."""
+        client = Client()
+        etag = client.get(detail_url(sample_todo))["ETag"]
+        response = client.get(detail_url(sample_todo), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.templates == []
+
+    def test_if_modified_since_returns_304(self, sample_todo):
+        """Test that a current Last-Modified gets 304."""
+        client = Client()
+        last_modified = client.get(detail_url(sample_todo))["Last-Modified"]
+        response = client.get(
+            detail_url(sample_todo), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304
+
+    def test_update_changes_etag(self, sample_todo):
+        """Test that editing the todo invalidates the ETag."""
+        client = Client()
+        etag = client.get(detail_url(sample_todo))["ETag"]
+        client.get(reverse("todo_toggle", args=[sample_todo.pk]))
+        response = client.get(detail_url(sample_todo), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_missing_todo_is_still_404(self, db):
+        """Test that a nonexistent todo is a 404, not a 304."""
+        response = Client().get(
+            reverse("todo_detail", args=[999]), HTTP_IF_NONE_MATCH="*"
+        )
+        assert response.status_code == 404
+
+    def test_validator_is_cheaper_than_render(
+        self, sample_todo, django_assert_max_num_queries
+    ):
+        """Test that a 304 costs a single indexed lookup."""
+        client = Client()
+        etag = client.get(detail_url(sample_todo))["ETag"]
+        with django_assert_max_num_queries(1):
+            client.get(detail_url(sample_todo), HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+class TestListConditionalGet:
+    """Test cases for conditional GETs on TodoListView."""
+
+    def assert_etag_changes_after(self, write):
+        client = Client()
+        etag = client.get(LIST_URL)["ETag"]
+        assert client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        write()
+        assert client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_matching_etag_returns_304(self, multiple_todos):
+        """Test that a current ETag gets 304 without rendering."""
+        client = Client()
+        response = client.get(LIST_URL)
+        assert not response.has_header("Last-Modified")
+        response = client.get(LIST_URL, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+        assert response.templates == []
+
+    def test_etag_differs_per_page(self):
+        """Test that each page has its own ETag."""
+        Todo.objects.bulk_create(Todo(title=f"Todo {i}") for i in range(15))
+        client = Client()
+        assert client.get(LIST_URL)["ETag"] != client.get(LIST_URL, {"page": 2})["ETag"]
+
+    def test_create_changes_etag(self, multiple_todos):
+        """Test that creating a todo invalidates the ETag."""
+        self.assert_etag_changes_after(lambda: Todo.objects.create(title="New"))
+
+    def test_delete_changes_etag(self, multiple_todos):
+        """Test that deleting an older todo invalidates the ETag."""
+        self.assert_etag_changes_after(lambda: multiple_todos[0].delete())
+
+    def test_bulk_update_changes_etag(self, multiple_todos):
+        """Test that a queryset update that sets updated_at invalidates the ETag."""
+        self.assert_etag_changes_after(
+            lambda: Todo.objects.update(completed=True, updated_at=timezone.now())
+        )
+
+    def test_validator_is_cheaper_than_render(
+        self, multiple_todos, django_assert_num_queries
+    ):
+        """Test that a 304 runs one aggregate query instead of the page queries."""
+        client = Client()
+        with django_assert_num_queries(2):
+            etag = client.get(LIST_URL)["ETag"]
+        with django_assert_num_queries(1):
+            response = client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
@@ -0,0 +1,216 @@
+"""Tests for the denormalized todo counters."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from todos import bulk, counters, search
+from todos.models import Todo, TodoCounters
+
+
+def assert_exact(using="default"):
+    """Assert that the counters row matches COUNT(*) over the table."""
+    stored = TodoCounters.objects.using(using).get(pk=counters.ROW_ID)
+    actual = counters.count_todos(Todo.objects.using(using))
+    assert (stored.total, stored.completed) == (actual.total, actual.completed)
+    return stored
+
+
+@pytest.mark.django_db
+class TestCounters:
+    """Test cases for keeping the counters row exact."""
+
+    def test_create_and_delete(self, todo_factory):
+        """Test that creating and deleting todos adjust the counts."""
+        todo = todo_factory(completed=True)
+        todo_factory()
+        assert str(assert_exact()) == "1 of 2 done"
+        todo.delete()
+        assert assert_exact().total == 1
+
+    def test_toggle(self, sample_todo):
+        """Test that toggle_todo moves a todo between completed and pending."""
+        Client().get(reverse("todo_toggle", args=[sample_todo.pk]))
+        assert assert_exact().completed == 1
+        Client().get(reverse("todo_toggle", args=[sample_todo.pk]))
+        assert assert_exact().pending == 1
+
+    def test_save_without_change(self, completed_todo):
+        """Test that saving other fields leaves the counts alone."""
+        completed_todo.title = "Renamed"
+        completed_todo.save()
+        Todo.objects.update(completed=True)
+        assert assert_exact().completed == 1
+
+    def test_bulk_operations(self):
+        """Test that bulk create, complete and delete keep the counts exact."""
+        todos = bulk.bulk_create_todos(
+            [{"title": f"Todo {i}"} for i in range(50)], batch_size=7
+        )
+        ids = [todo.pk for todo in todos]
+        bulk.bulk_set_completed(ids[:30], True, batch_size=7)
+        assert assert_exact().completed == 30
+        bulk.bulk_delete(ids[20:], batch_size=7)
+        assert assert_exact().total == 20
+
+    def test_import(self, tmp_path):
+        """Test that imported rows are counted."""
+        path = tmp_path / "todos.ndjson"
+        path.write_text(
+            '{"title": "a", "completed": true}\n{"title": "b", "completed": false}\n'
+        )
+        call_command("import_todos", str(path), stderr=StringIO())
+        assert str(assert_exact()) == "1 of 2 done"
+
+    def test_fallback_without_row(self, multiple_todos):
+        """Test that counts are computed when the row is missing."""
+        TodoCounters.objects.all().delete()
+        counts = counters.get_counts()
+        assert (counts.total, counts.completed) == (5, 3)
+        assert counters.get_list_stats()["count"] == 5
+
+
+@pytest.mark.django_db
+class TestListViewCounts:
+    """Test cases for the list page reading the counters."""
+
+    def test_counts_shown(self, multiple_todos):
+        """Test that the list page shows completed and pending totals."""
+        response = Client().get(reverse("todo_list"))
+        assert "3 of 5 done, 2 pending" in response.content.decode()
+
+    def test_paginator_uses_counter(self, todo_factory, django_assert_num_queries):
+        """Test that the paginator's count comes from the counters row."""
+        for i in range(12):
+            todo_factory(title=f"Todo {i}")
+        with django_assert_num_queries(2) as ctx:
+            response = Client().get(reverse("todo_list"))
+        assert response.context["paginator"].num_pages == 2
+        assert all("COUNT(" not in q["sql"].upper() for q in ctx.captured_queries)
+
+    def test_search_counts_matches(self, multiple_todos):
+        """Test that a search counts its matches, not every todo."""
+        response = Client().get(reverse("todo_list"), {"q": "Todo 1"})
+        assert response.context["paginator"].count == 1
+        assert "todo-counts" not in response.content.decode()
+
+    def test_delete_changes_etag(self, multiple_todos):
+        """Test that deleting a todo still invalidates the list's ETag."""
+        client = Client()
+        etag = client.get(reverse("todo_list"))["ETag"]
+        multiple_todos[0].delete()
+        assert client.get(reverse("todo_list"))["ETag"] != etag
+
+
+@pytest.mark.django_db
+class TestReconcileCountersCommand:
+    """Test cases for the reconcile_counters management command."""
+
+    def test_fixes_drift(self, multiple_todos):
+        """Test that drifted counters are recomputed."""
+        TodoCounters.objects.filter(pk=counters.ROW_ID).update(total=99, completed=0)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        assert "total 99 -> 5" in out.getvalue()
+        assert_exact()
+
+    def test_reports_archived_drift(self, multiple_todos):
+        """Test that drift in the archived count alone is reported."""
+        TodoCounters.objects.filter(pk=counters.ROW_ID).update(archived=3)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        assert "archived 3 -> 0" in out.getvalue()
+
+    def test_recreates_missing_row(self, multiple_todos):
+        """Test that a missing row is created."""
+        TodoCounters.objects.all().delete()
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        assert "was missing" in out.getvalue()
+        assert_exact()
+
+
+@pytest.fixture
+def file_database(add_file_database):
+    """Fixture that adds a file database for concurrent writers."""
+    return add_file_database("concurrency")
+
+
+class TestCountersConcurrency:
+    """Test cases for the counters under concurrent writes."""
+
+    def run_parallel(self, func, count, using, workers=16):
+        def run(i):
+            try:
+                return func(i)
+            finally:
+                connections[using].close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, range(count)))
+
+    def test_parallel_toggles(self, file_database):
+        """Test that concurrent toggles of a few todos keep the counts exact."""
+        todos = Todo.objects.using(file_database)
+        pks = [todos.create(title=f"Todo {i}").pk for i in range(10)]
+        rng = random.Random(0)
+        targets = [rng.choice(pks) for _ in range(301)]
+
+        def toggle(i):
+            return todos.filter(pk=targets[i]).toggle_completed()
+
+        assert self.run_parallel(toggle, len(targets), file_database) == [1] * 301
+        flips = [targets.count(pk) % 2 for pk in pks]
+        assert assert_exact(file_database).completed == sum(flips)
+
+    def test_parallel_creates_toggles_and_deletes(self, file_database):
+        """Test that interleaved creates, toggles and deletes stay exact."""
+        todos = Todo.objects.using(file_database)
+        pks = [todos.create(title=f"Todo {i}").pk for i in range(99)]
+
+        def write(i):
+            if i % 3 == 0:
+                todos.create(title=f"New {i}", completed=i % 2 == 0)
+            elif i % 3 == 1:
+                todos.filter(pk=pks[i]).toggle_completed()
+            else:
+                todos.filter(pk=pks[i]).delete()
+
+        self.run_parallel(write, 99, file_database)
+        counts = assert_exact(file_database)
+        assert counts.total == 99
+        assert counts.completed == 17 + 33
+
+
+class TestCounterMigrations:
+    """Test cases for the migrations that install the triggers."""
+
+    def triggers(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'todos_todo' ORDER BY name"
+            )
+            return [name for (name,) in cursor.fetchall()]
+
+    def test_unapply_and_reapply(self, add_file_database):
+        """Test that migrating back and forth leaves every trigger in place."""
+        alias = add_file_database("migrations")
+        expected = self.triggers(alias)
+        assert len(expected) == 6
+        Todo.objects.using(alias).create(title="Kept", completed=True)
+        call_command("migrate", "todos", "0007", database=alias, verbosity=0)
+        assert self.triggers(alias) == expected
+        call_command("migrate", "todos", "0005", database=alias, verbosity=0)
+        call_command("migrate", "todos", database=alias, verbosity=0)
+        assert self.triggers(alias) == expected
+        todos = Todo.objects.using(alias)
+        todos.create(title="Deleted").delete()
+        counts = assert_exact(alias)
+        assert (counts.total, counts.completed) == (1, 1)
+        assert search.search(todos.all(), "Kept").count() == 1
@@ -0,0 +1,64 @@
+"""Tests of the hot pages over the large dataset tier.
+
+The query budgets in ``todos/budgets.py`` are enforced for every request
+(see ``conftest.py``), so these tests fail if a page's query count grows
+with the size of the table.
+"""
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+from todos import counters, instrumentation
+from todos.models import Todo
+
+pytestmark = [pytest.mark.large, pytest.mark.django_db]
+
+LIST_URL = reverse("todo_list")
+
+
+@pytest.mark.usefixtures("large_todos")
+class TestLargeList:
+    """Test cases for the list page over many todos."""
+
+    def test_counts_come_from_counters(self, large_todos):
+        """Test that the page counts every row without a COUNT(*)."""
+        response = Client().get(LIST_URL)
+        assert response.context["paginator"].count == large_todos
+        assert counters.get_counts().total == large_todos
+
+    def test_last_page(self, large_todos):
+        """Test that the last offset page renders its remaining rows."""
+        response = Client().get(LIST_URL, {"page": "last"})
+        assert response.context["page_obj"].number == -(-large_todos // 10)
+        assert list(response.context["todos"])[-1].title == "Todo 1"
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=0, TODOS_PAGINATION_MODE="keyset")
+    def test_keyset_pages_cost_the_same(self):
+        """Test that following cursors runs the same queries on every page."""
+        client = Client()
+        response = client.get(LIST_URL)
+        seen = []
+        for _ in range(5):
+            seen.extend(todo.pk for todo in response.context["todos"])
+            cursor = response.context["page_obj"].next_cursor
+            with instrumentation.collect() as stats:
+                response = client.get(LIST_URL, {"cursor": cursor})
+            assert stats.queries == 2
+        assert len(set(seen)) == 50
+
+    def test_search(self, large_todos):
+        """Test that search finds one row among many."""
+        response = Client().get(LIST_URL, {"q": f"Todo {large_todos}"})
+        assert [todo.title for todo in response.context["todos"]] == [
+            f"Todo {large_todos}"
+        ]
+
+    def test_writes_are_rolled_back(self, large_todos):
+        """Test that a test's writes don't leak into the class dataset."""
+        Todo.objects.create(title="Extra")
+        assert Todo.objects.count() == large_todos + 1
+
+    def test_dataset_is_unchanged(self, large_todos):
+        """Test that the row added by the previous test is gone."""
+        assert Todo.objects.count() == large_todos
+        assert not Todo.objects.filter(title="Extra").exists()
@@ -0,0 +1,86 @@
+"""Tests for serving the todo routes with the lean middleware stack."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from todos import instrumentation
+from todos.middleware import is_lean_path
+
+
+@pytest.fixture
+def admin_user(db):
+    """Fixture that creates a superuser."""
+    return User.objects.create_superuser("admin", "admin@example.com", "password")
+
+
+@pytest.mark.django_db
+class TestLeanPaths:
+    """Test cases for skipping session, auth and messages on /todos/."""
+
+    def test_todo_pages_skip_session_and_user(self, sample_todo):
+        """Test that todo requests get neither a session nor a user."""
+        response = Client().get(reverse("todo_detail", args=[sample_todo.pk]))
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, "session")
+        assert not hasattr(response.wsgi_request, "user")
+
+    def test_admin_keeps_full_stack(self, admin_user):
+        """Test that the admin still gets the session and user."""
+        client = Client()
+        client.force_login(admin_user)
+        response = client.get(reverse("admin:index"))
+        assert response.status_code == 200
+        assert response.wsgi_request.user == admin_user
+
+    def test_signed_in_user_costs_no_queries(self, admin_user, sample_todo):
+        """Test that a session cookie doesn't add queries to todo pages."""
+        url = reverse("todo_detail", args=[sample_todo.pk])
+        anonymous = Client()
+        client = Client()
+        client.force_login(admin_user)
+        with instrumentation.collect() as expected:
+            anonymous.get(url)
+        with instrumentation.collect() as stats:
+            client.get(url)
+        assert stats.queries == expected.queries
+
+    def test_disabled(self, settings, sample_todo):
+        """Test that an empty TODOS_LEAN_PATHS runs the full stack everywhere."""
+        settings.TODOS_LEAN_PATHS = []
+        response = Client().get(reverse("todo_list"))
+        assert hasattr(response.wsgi_request, "user")
+
+    def test_not_with_session_csrf(self, settings):
+        """Test that CSRF_USE_SESSIONS keeps the session on every path."""
+        assert is_lean_path("/todos/")
+        settings.CSRF_USE_SESSIONS = True
+        assert not is_lean_path("/todos/")
+
+    def test_async(self, sample_todo):
+        """Test that the lean stack also passes requests through under ASGI."""
+        response = async_to_sync(AsyncClient().get)(reverse("todo_list"))
+        assert response.status_code == 200
+        assert sample_todo.title in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestLeanPathsCsrf:
+    """Test cases for CSRF protection on the lean paths."""
+
+    def test_post_without_token_is_forbidden(self):
+        """Test that a form post without a token is rejected."""
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(reverse("todo_create"), {"title": "New"})
+        assert response.status_code == 403
+
+    def test_post_with_cookie_token(self):
+        """Test that the token from the form page's cookie is accepted."""
+        client = Client(enforce_csrf_checks=True)
+        client.get(reverse("todo_create"))
+        token = client.cookies["csrftoken"].value
+        response = client.post(
+            reverse("todo_create"), {"title": "New", "csrfmiddlewaretoken": token}
+        )
+        assert response.status_code == 302
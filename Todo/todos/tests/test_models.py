@@ -2,8 +2,12 @@
 
 import pytest
 from datetime import datetime
+from todos import bulk
 from todos.models import Todo
 
+LONG_DESCRIPTION = " ".join(f"word{i}" for i in range(500))
+EXCERPT = " ".join(f"word{i}" for i in range(20)) + " …"
+
 
 @pytest.mark.django_db
 class TestTodoModel:
@@ -158,3 +162,53 @@ class TestTodoModel:
         todo.refresh_from_db()
         assert todo.title == "Updated Title"
         assert todo.description == "Updated Description"
+
+
+@pytest.mark.django_db
+class TestDescriptionExcerpt:
+    """Test cases for keeping description_excerpt in step with description."""
+
+    def test_set_on_create(self):
+        """Test that the excerpt is the first 20 words of the description."""
+        todo = Todo.objects.create(title="Long", description=LONG_DESCRIPTION)
+        assert Todo.objects.get(pk=todo.pk).description_excerpt == EXCERPT
+
+    def test_short_description_kept_whole(self):
+        """Test that a description of 20 words or fewer is kept as is."""
+        todo = Todo.objects.create(title="Short", description="Just a few words")
+        assert todo.description_excerpt == "Just a few words"
+
+    def test_save_with_update_fields(self):
+        """Test that saving only the description updates the excerpt too."""
+        todo = Todo.objects.create(title="Todo")
+        todo.description = LONG_DESCRIPTION
+        todo.save(update_fields=["description"])
+        assert Todo.objects.get(pk=todo.pk).description_excerpt == EXCERPT
+
+    def test_bulk_create(self):
+        """Test that bulk-created todos get excerpts."""
+        bulk.bulk_create_todos([{"title": "Bulk", "description": LONG_DESCRIPTION}])
+        assert Todo.objects.get().description_excerpt == EXCERPT
+
+    def test_queryset_update(self):
+        """Test that QuerySet.update() of the description updates the excerpt."""
+        Todo.objects.create(title="Todo", description="Old")
+        Todo.objects.update(description=LONG_DESCRIPTION)
+        assert Todo.objects.get().description_excerpt == EXCERPT
+
+    def test_bulk_update(self):
+        """Test that bulk_update() of the description updates the excerpt."""
+        todos = [Todo.objects.create(title="Todo", description="Old")]
+        todos[0].description = LONG_DESCRIPTION
+        Todo.objects.bulk_update(todos, ["description"])
+        assert Todo.objects.get().description_excerpt == EXCERPT
+
+    def test_bulk_update_without_description(self):
+        """Test that bulk_update() keeps the excerpt of the saved description."""
+        todos = [Todo.objects.create(title="Todo", description="Old")]
+        todos[0].title = "Renamed"
+        todos[0].description = LONG_DESCRIPTION
+        Todo.objects.bulk_update(todos, ["title"])
+        saved = Todo.objects.get()
+        assert (saved.title, saved.description) == ("Renamed", "Old")
+        assert saved.description_excerpt == "Old"
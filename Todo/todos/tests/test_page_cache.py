@@ -0,0 +1,143 @@
+"""Tests for the todo list page cache."""
+
+import json
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+from todos import page_cache
+from todos.models import Todo
+
+LIST_URL = reverse("todo_list")
+
+
+def get_list(client, **params):
+    return client.get(LIST_URL, params)
+
+
+@pytest.fixture(
+    params=["locmem", "filebased"],
+    ids=["locmem", "filebased"],
+)
+def cache_backend(request, tmp_path):
+    """Fixture that turns the cache on, once with each supported backend."""
+    if request.param == "locmem":
+        backend = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    else:
+        backend = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    with override_settings(CACHES={"default": backend}, TODOS_PAGE_CACHE_TIMEOUT=300):
+        yield request.param
+
+
+@pytest.mark.django_db
+class TestPageCache:
+    """Test cases for caching rendered list pages."""
+
+    def test_second_request_is_a_hit(self, cache_backend, multiple_todos):
+        """Test that a repeated request is served from the cache."""
+        client = Client()
+        assert get_list(client)["X-Page-Cache"] == "miss"
+        response = get_list(client)
+        assert response["X-Page-Cache"] == "hit"
+        assert "Todo 1" in response.content.decode()
+
+    def test_hit_skips_page_queries(
+        self, cache_backend, multiple_todos, django_assert_num_queries
+    ):
+        """Test that a cache hit runs only the conditional GET validator."""
+        client = Client()
+        get_list(client)
+        with django_assert_num_queries(1) as ctx:
+            get_list(client)
+        assert "todos_todocounters" in ctx.captured_queries[0]["sql"]
+
+    def test_pages_are_cached_separately(self, cache_backend):
+        """Test that each page number gets its own fragment."""
+        Todo.objects.bulk_create(Todo(title=f"Todo {i}") for i in range(15))
+        client = Client()
+        get_list(client)
+        response = get_list(client, page=2)
+        assert response["X-Page-Cache"] == "miss"
+        assert len(response.context["todos"]) == 5
+
+    def test_stats_count_hits_and_misses(self, cache_backend, multiple_todos):
+        """Test that the hit/miss counters are updated."""
+        page_cache.stats.reset()
+        client = Client()
+        get_list(client)
+        get_list(client)
+        get_list(client)
+        assert page_cache.stats.as_dict() == {"hits": 2, "misses": 1}
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=0)
+    def test_disabled(self, multiple_todos):
+        """Test that a zero timeout disables the cache."""
+        client = Client()
+        get_list(client)
+        response = get_list(client)
+        assert "X-Page-Cache" not in response
+        assert len(response.context["todos"]) == 5
+
+
+@pytest.mark.django_db
+class TestPageCacheInvalidation:
+    """Test cases proving no stale page is served after a write."""
+
+    def assert_fresh_after(self, write, check):
+        client = Client()
+        get_list(client)
+        assert get_list(client)["X-Page-Cache"] == "hit"
+        write()
+        response = get_list(client)
+        assert response["X-Page-Cache"] == "miss"
+        assert check(response.content.decode())
+
+    def test_create_invalidates(self, cache_backend, sample_todo):
+        """Test that creating a todo invalidates cached pages."""
+        self.assert_fresh_after(
+            lambda: Client().post(reverse("todo_create"), {"title": "Brand new"}),
+            lambda html: "Brand new" in html,
+        )
+
+    def test_update_invalidates(self, cache_backend, sample_todo):
+        """Test that editing a todo invalidates cached pages."""
+        self.assert_fresh_after(
+            lambda: Client().post(
+                reverse("todo_update", args=[sample_todo.pk]), {"title": "Edited"}
+            ),
+            lambda html: "Edited" in html and "Sample Todo" not in html,
+        )
+
+    def test_toggle_invalidates(self, cache_backend, sample_todo):
+        """Test that toggling a todo invalidates cached pages."""
+        self.assert_fresh_after(
+            lambda: Client().get(reverse("todo_toggle", args=[sample_todo.pk])),
+            lambda html: "Mark Incomplete" in html,
+        )
+
+    def test_delete_invalidates(self, cache_backend, sample_todo):
+        """Test that deleting a todo invalidates cached pages."""
+        self.assert_fresh_after(
+            lambda: Client().post(reverse("todo_delete", args=[sample_todo.pk])),
+            lambda html: "Sample Todo" not in html,
+        )
+
+    def test_bulk_operations_invalidate(self, cache_backend, sample_todo):
+        """Test that bulk endpoints invalidate cached pages."""
+        self.assert_fresh_after(
+            lambda: Client().post(
+                reverse("todo_bulk_complete"),
+                json.dumps({"ids": [sample_todo.pk]}),
+                content_type="application/json",
+            ),
+            lambda html: "Mark Incomplete" in html,
+        )
+
+    def test_lost_generation_restarts_higher(self, cache_backend):
+        """Test that an evicted generation never reuses an older value."""
+        before = page_cache.get_generation()
+        page_cache.get_cache().delete(page_cache.GENERATION_KEY)
+        assert page_cache.get_generation() > before
@@ -0,0 +1,115 @@
+"""Tests for keyset pagination."""
+
+import base64
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from todos.models import Todo
+from todos.pagination import (
+    InvalidCursor,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def make_token(pk):
+    payload = f'["n","2026-01-01T00:00:00+00:00",{pk}]'
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def twenty_five_todos(bulk_todos):
+    """Fixture that creates 25 todos, half of them sharing one timestamp."""
+    todos = bulk_todos(25)
+    Todo.objects.filter(pk__lte=todos[12].pk).update(created_at=timezone.now())
+    return list(Todo.objects.order_by("-created_at", "-id"))
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    """Test cases for KeysetPaginator."""
+
+    def test_cursor_round_trip(self, sample_todo):
+        """Test that a cursor decodes back to the row it was built from."""
+        direction, created_at, pk = decode_cursor(encode_cursor(sample_todo))
+        assert direction == "n"
+        assert created_at == sample_todo.created_at
+        assert pk == sample_todo.pk
+
+    @pytest.mark.parametrize("token", ["", "garbage", "bm90IGpzb24", "WyJ4IiwiYSIsMV0"])
+    def test_invalid_cursor_raises(self, token):
+        """Test that malformed cursors raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+    @pytest.mark.parametrize("pk", ["1.5", "1e400", str(2**63), "true", '"1"'])
+    def test_cursor_pk_must_fit_an_id(self, pk):
+        """Test that a pk that isn't a 64-bit integer raises InvalidCursor."""
+        assert decode_cursor(make_token(2**63 - 1))[2] == 2**63 - 1
+        with pytest.raises(InvalidCursor):
+            decode_cursor(make_token(pk))
+
+    def test_walks_forward_through_every_row(self, twenty_five_todos):
+        """Test that following next cursors visits every row exactly once."""
+        paginator = KeysetPaginator(Todo.objects.all(), 10)
+        seen = []
+        page = paginator.page()
+        assert page.has_previous() is False
+        while True:
+            seen.extend(page.object_list)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        assert seen == twenty_five_todos
+
+    def test_walks_backward(self, twenty_five_todos):
+        """Test that the previous cursor returns the preceding page."""
+        paginator = KeysetPaginator(Todo.objects.all(), 10)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        assert back.object_list == first.object_list
+        assert back.has_previous() is False
+        assert back.has_next() is True
+
+    def test_does_not_count(self, twenty_five_todos, django_assert_num_queries):
+        """Test that a page costs a single query and no COUNT(*)."""
+        paginator = KeysetPaginator(Todo.objects.all(), 10)
+        with django_assert_num_queries(1) as ctx:
+            paginator.page()
+        assert "COUNT" not in ctx.captured_queries[0]["sql"].upper()
+
+
+@pytest.mark.django_db
+class TestTodoListViewKeysetMode:
+    """Test cases for the keyset mode of TodoListView."""
+
+    def test_cursor_param_enables_keyset_mode(self, twenty_five_todos):
+        """Test that passing a cursor switches the view to keyset pagination."""
+        client = Client()
+        response = client.get(reverse("todo_list") + "?cursor=")
+        assert response.context["page_obj"].is_keyset
+        assert list(response.context["todos"]) == twenty_five_todos[:10]
+        assert "?cursor=" in response.content.decode()
+
+    @override_settings(TODOS_PAGINATION_MODE="keyset")
+    def test_setting_enables_keyset_mode(self, twenty_five_todos):
+        """Test that TODOS_PAGINATION_MODE makes keyset the default."""
+        client = Client()
+        response = client.get(reverse("todo_list"))
+        page = response.context["page_obj"]
+        assert page.is_keyset
+        response = client.get(reverse("todo_list") + f"?cursor={page.next_cursor}")
+        assert list(response.context["todos"]) == twenty_five_todos[10:20]
+        assert response.context["is_paginated"] is True
+
+    def test_invalid_cursor_returns_404(self, db):
+        """Test that a tampered cursor is a 404, not a server error."""
+        client = Client()
+        response = client.get(reverse("todo_list") + "?cursor=garbage")
+        assert response.status_code == 404
+        response = client.get(reverse("todo_list"), {"cursor": make_token("1e400")})
+        assert response.status_code == 404
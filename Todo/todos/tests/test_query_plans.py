@@ -0,0 +1,73 @@
+"""Query-plan regression tests for the hot Todo querysets.
+
+Each queryset below backs a page users hit often. These tests run SQLite's
+``EXPLAIN QUERY PLAN`` on them and fail if one of them stops using an index
+(a bare ``SCAN`` of the table) or needs a temporary B-tree to sort.
+"""
+
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from todos import purge
+from todos.models import Todo
+from todos.pagination import KeysetPaginator
+
+TABLE = Todo._meta.db_table
+FULL_SCAN = re.compile(rf"\bSCAN {TABLE}\b(?! USING (COVERING )?INDEX)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+
+def hot_querysets():
+    """Return ``(name, queryset)`` pairs for the querysets under test."""
+    now = timezone.now()
+    admin_order = ("-created_at", "-pk")
+    return [
+        ("list", Todo.objects.all()[:10]),
+        ("list_keyset", Todo.objects.order_by(*KeysetPaginator.ordering)[:11]),
+        (
+            "list_keyset_cursor",
+            Todo.objects.filter(created_at__lte=now).order_by(
+                *KeysetPaginator.ordering
+            )[:11],
+        ),
+        ("completed", Todo.objects.filter(completed=True)[:10]),
+        ("pending", Todo.objects.filter(completed=False)[:10]),
+        ("admin_changelist", Todo.objects.order_by(*admin_order)[:100]),
+        (
+            "admin_filter_completed",
+            Todo.objects.filter(completed=True).order_by(*admin_order)[:100],
+        ),
+        (
+            "admin_filter_created_at",
+            Todo.objects.filter(
+                created_at__gte=now - timedelta(days=7), created_at__lt=now
+            ).order_by(*admin_order)[:100],
+        ),
+        ("purge", purge.purgeable(now - timedelta(days=7))[:500]),
+    ]
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+@pytest.mark.large
+@pytest.mark.usefixtures("large_todos")
+class TestTodoQueryPlans:
+    """Test cases for the query plans of hot Todo querysets."""
+
+    @pytest.mark.parametrize(
+        "name,queryset", hot_querysets(), ids=[n for n, _ in hot_querysets()]
+    )
+    def test_no_full_scan_or_temp_sort(self, name, queryset):
+        """Test that the queryset is served from an index, already in order."""
+        plan = queryset.explain()
+        assert not FULL_SCAN.search(plan), f"{name} does a full scan:\n{plan}"
+        assert not TEMP_SORT.search(plan), f"{name} sorts in a temp B-tree:\n{plan}"
+
+    def test_detector_flags_unindexed_query(self):
+        """Test that the checks catch a query that cannot use an index."""
+        plan = Todo.objects.order_by("title").explain()
+        assert FULL_SCAN.search(plan)
+        assert TEMP_SORT.search(plan)
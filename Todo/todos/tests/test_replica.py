@@ -0,0 +1,230 @@
+"""Tests for reading the todo pages from a replica."""
+
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from todos import replica
+from todos.models import Todo
+
+LIST_URL = reverse("todo_list")
+
+
+@pytest.fixture
+def replica_db(settings, add_file_database):
+    """Fixture that gives ``default`` a replica, empty until synced."""
+    settings.TODOS_REPLICAS = {"default": "replica"}
+    replica.stats.reset()
+    return add_file_database("replica", migrate=False)
+
+
+@pytest.fixture
+def synced(replica_db, todo_factory):
+    """Fixture that copies one todo to the replica, then adds another."""
+    first = todo_factory(title="Synced")
+    replica.sync()
+    second = todo_factory(title="Not synced")
+    return first, second
+
+
+def titles(response):
+    return [todo.title for todo in response.context["todos"]]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReadOnlyViews:
+    """Test cases for the list and detail pages on the replica."""
+
+    def test_list_reads_replica(self, synced):
+        """Test that the list page shows the replica's todos and counts."""
+        response = Client().get(LIST_URL)
+        assert titles(response) == ["Synced"]
+        assert response.context["counts"].total == 1
+        assert replica.stats.as_dict() == {"replica": 1, "primary_sticky": 0}
+
+    def test_detail_reads_replica(self, synced):
+        """Test that todos the replica hasn't got yet are not found."""
+        first, second = synced
+        client = Client()
+        assert client.get(reverse("todo_detail", args=[first.pk])).status_code == 200
+        assert client.get(reverse("todo_detail", args=[second.pk])).status_code == 404
+
+    def test_other_views_use_primary(self, synced):
+        """Test that the edit form, for one, reads from the primary."""
+        _, second = synced
+        response = Client().get(reverse("todo_update", args=[second.pk]))
+        assert response.status_code == 200
+
+    def test_replica_is_never_written(self, synced):
+        """Test that saving a todo read from the replica writes the primary."""
+        first, _ = synced
+        with replica.reading_from_replicas():
+            todo = Todo.objects.get(pk=first.pk)
+        assert todo._state.db == "replica"
+        todo.title = "Renamed"
+        todo.save()
+        assert Todo.objects.using("default").get(pk=first.pk).title == "Renamed"
+        assert Todo.objects.using("replica").get(pk=first.pk).title == "Synced"
+
+    def test_sync_catches_up(self, synced):
+        """Test that the next copy brings the replica up to date."""
+        client = Client()
+        assert titles(client.get(LIST_URL)) == ["Synced"]
+        replica.sync()
+        assert titles(client.get(LIST_URL)) == ["Not synced", "Synced"]
+
+    def test_without_replicas(self, settings, todo_factory):
+        """Test that without TODOS_REPLICAS reads stay on default."""
+        settings.TODOS_REPLICAS = {}
+        todo_factory(title="Only")
+        response = Client().get(LIST_URL)
+        assert titles(response) == ["Only"]
+        assert not response.cookies
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStickiness:
+    """Test cases for reading your own writes after a write."""
+
+    def test_sticks_after_write(self, synced):
+        """Test that a client that just wrote reads from the primary."""
+        client = Client()
+        response = client.post(reverse("todo_create"), {"title": "Mine"})
+        assert replica.STICKY_COOKIE in response.cookies
+        assert titles(client.get(LIST_URL)) == ["Mine", "Not synced", "Synced"]
+        assert replica.stats.as_dict() == {"replica": 0, "primary_sticky": 1}
+
+    def test_sees_own_toggle(self, synced):
+        """Test that a toggle shows up on the next page load."""
+        first, _ = synced
+        client = Client()
+        client.post(reverse("todo_toggle", args=[first.pk]))
+        response = client.get(reverse("todo_detail", args=[first.pk]))
+        assert response.context["todo"].completed
+
+    def test_sees_own_toggle_link(self, synced):
+        """Test that toggling through the list page's GET link sticks too."""
+        first, _ = synced
+        client = Client()
+        response = client.get(reverse("todo_toggle", args=[first.pk]))
+        assert replica.STICKY_COOKIE in response.cookies
+        response = client.get(reverse("todo_detail", args=[first.pk]))
+        assert response.context["todo"].completed
+
+    def test_failed_toggle_does_not_stick(self, synced):
+        """Test that a toggle of a missing todo sets no cookie."""
+        response = Client().get(reverse("todo_toggle", args=[999]))
+        assert response.status_code == 404
+        assert replica.STICKY_COOKIE not in response.cookies
+
+    def test_other_clients_stay_on_replica(self, synced):
+        """Test that one client's write doesn't move others off the replica."""
+        Client().post(reverse("todo_create"), {"title": "Mine"})
+        assert titles(Client().get(LIST_URL)) == ["Synced"]
+
+    def test_window_expires(self, settings, synced):
+        """Test that reads return to the replica after the sticky window."""
+        settings.TODOS_REPLICA_STICKY_SECONDS = 30
+        client = Client()
+        response = client.post(reverse("todo_create"), {"title": "Mine"})
+        cookie = response.cookies[replica.STICKY_COOKIE]
+        assert cookie["max-age"] == 30
+        assert float(cookie.value) == pytest.approx(time.time() + 30, abs=5)
+        client.cookies[replica.STICKY_COOKIE] = f"{time.time() - 1:.3f}"
+        assert titles(client.get(LIST_URL)) == ["Synced"]
+
+    def test_failed_write_not_sticky(self, synced):
+        """Test that a write that failed doesn't move the client."""
+        response = Client().post(reverse("todo_toggle", args=[10**9]))
+        assert response.status_code == 404
+        assert replica.STICKY_COOKIE not in response.cookies
+
+    def test_bad_cookie_ignored(self, synced):
+        """Test that a malformed cookie reads from the replica."""
+        client = Client()
+        client.cookies[replica.STICKY_COOKIE] = "soon"
+        assert titles(client.get(LIST_URL)) == ["Synced"]
+
+    @override_settings(TODOS_PAGE_CACHE_TIMEOUT=300)
+    def test_cached_pages_kept_apart(self, synced):
+        """Test that the page cache doesn't mix replica and primary pages."""
+        reader, writer = Client(), Client()
+        assert titles(reader.get(LIST_URL)) == ["Synced"]
+        writer.post(reverse("todo_create"), {"title": "Mine"})
+        response = writer.get(LIST_URL)
+        assert titles(response) == ["Mine", "Not synced", "Synced"]
+        assert response["X-Page-Cache"] == "miss"
+        response = reader.get(LIST_URL)
+        assert response["X-Page-Cache"] == "miss"
+        assert "Mine" not in response.content.decode()
+        assert reader.get(LIST_URL)["X-Page-Cache"] == "hit"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaStatus:
+    """Test cases for the replication lag metrics."""
+
+    def test_never_synced(self, replica_db):
+        """Test that a replica that was never copied reports no lag."""
+        status = replica.get_status()
+        assert status["synced_at"] is None
+        assert status["lag_seconds"] is None
+
+    def test_caught_up(self, replica_db, sample_todo):
+        """Test that an up-to-date replica has no lag."""
+        synced_at = replica.sync()
+        status = replica.get_status()
+        assert status["synced_at"] == synced_at
+        assert status["lag_seconds"] == 0
+        assert not status["behind"]
+
+    def test_behind(self, synced):
+        """Test that writes since the copy show up as lag."""
+        status = replica.get_status()
+        assert status["behind"]
+        assert status["lag_seconds"] == status["age_seconds"] > 0
+
+    def test_api(self, synced):
+        """Test that the status is served as JSON."""
+        data = Client().get(reverse("api:replica_status")).json()
+        [status] = data["replicas"]
+        assert status["replica"] == "replica"
+        assert status["behind"]
+        assert data["reads"] == {"replica": 0, "primary_sticky": 0}
+
+
+@pytest.mark.django_db
+class TestSync:
+    """Test cases for copying the primary to its replica."""
+
+    def test_refuses_inside_transaction(self, replica_db):
+        """Test that a copy inside a transaction fails instead of hanging."""
+        with pytest.raises(RuntimeError):
+            replica.sync()
+
+    def test_replica_not_migrated(self, replica_db):
+        """Test that migrate leaves replicas alone."""
+        call_command("migrate", database="replica", verbosity=0)
+        assert "todos_todo" not in connections["replica"].introspection.table_names()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSyncReplicaCommand:
+    """Test cases for the sync_replica management command."""
+
+    def test_copies(self, replica_db, sample_todo):
+        """Test that the command copies each primary over its replica."""
+        err = StringIO()
+        call_command("sync_replica", stderr=err)
+        assert "Copied default to replica" in err.getvalue()
+        assert Todo.objects.using("replica").get().title == sample_todo.title
+
+    def test_without_replicas(self, settings):
+        """Test that the command fails without TODOS_REPLICAS."""
+        settings.TODOS_REPLICAS = {}
+        with pytest.raises(CommandError):
+            call_command("sync_replica")
@@ -0,0 +1,147 @@
+"""Tests for full-text search."""
+
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from todos import search
+from todos.models import Todo
+
+
+def search_titles(text):
+    return [todo.title for todo in search.search(Todo.objects.all(), text)]
+
+
+@pytest.mark.django_db
+class TestSearchIndex:
+    """Test cases for the FTS5 index and its triggers."""
+
+    def test_create_is_indexed(self):
+        """Test that new todos are searchable immediately."""
+        Todo.objects.create(title="Buy groceries", description="milk and eggs")
+        assert search_titles("eggs") == ["Buy groceries"]
+
+    def test_update_reindexes(self):
+        """Test that changing the title replaces the old terms."""
+        todo = Todo.objects.create(title="Original chore")
+        todo.title = "Renamed chore"
+        todo.save()
+        assert search_titles("renamed") == ["Renamed chore"]
+        assert search_titles("original") == []
+
+    def test_delete_removes_from_index(self, sample_todo):
+        """Test that deleted todos no longer match."""
+        sample_todo.delete()
+        assert search_titles("sample") == []
+
+    def test_bulk_create_is_indexed(self):
+        """Test that rows inserted without save() are indexed by the triggers."""
+        Todo.objects.bulk_create([Todo(title="Bulk one"), Todo(title="Bulk two")])
+        assert sorted(search_titles("bulk")) == ["Bulk one", "Bulk two"]
+
+    def test_title_matches_rank_first(self):
+        """Test that a title match outranks a description match."""
+        Todo.objects.create(title="Call mom", description="about the garden")
+        Todo.objects.create(title="Garden work", description="weeding")
+        assert search_titles("garden") == ["Garden work", "Call mom"]
+
+    def test_last_word_matches_as_prefix(self):
+        """Test that the last word also matches longer words."""
+        Todo.objects.create(title="Refactor pagination")
+        assert search_titles("refactor pag") == ["Refactor pagination"]
+
+    def test_operators_are_treated_as_text(self):
+        """Test that FTS5 syntax in user input does not raise."""
+        Todo.objects.create(title="Fix NOT operator")
+        assert search_titles('NOT "operator') == ["Fix NOT operator"]
+        assert search_titles("title:") == []
+
+    def test_blank_query_matches_nothing(self, sample_todo):
+        """Test that an empty query returns no rows."""
+        assert search_titles("   ") == []
+
+    def test_rebuild_command(self, sample_todo):
+        """Test that the rebuild command restores a wiped index."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}) "
+                "VALUES ('delete-all')"
+            )
+        assert search_titles("sample") == []
+        call_command("rebuild_search_index", stdout=StringIO())
+        assert search_titles("sample") == ["Sample Todo"]
+
+
+@pytest.mark.django_db
+class TestSearchViews:
+    """Test cases for search in the list view and admin."""
+
+    def test_list_view_search(self, multiple_todos):
+        """Test that ?q= filters the list view."""
+        client = Client()
+        response = client.get(reverse("todo_list"), {"q": "description 3"})
+        assert [t.title for t in response.context["todos"]] == ["Todo 3"]
+        assert response.context["search_query"] == "description 3"
+
+    def test_list_view_search_keeps_query_in_page_links(self):
+        """Test that pagination links carry the search query."""
+        Todo.objects.bulk_create(Todo(title=f"Report {i}") for i in range(15))
+        client = Client()
+        response = client.get(reverse("todo_list"), {"q": "report"})
+        assert response.context["is_paginated"] is True
+        assert "?page=2&amp;q=report" in response.content.decode()
+
+    def test_list_view_search_no_results(self, multiple_todos):
+        """Test that an unmatched query shows a no-results message."""
+        client = Client()
+        response = client.get(reverse("todo_list"), {"q": "nothing"})
+        assert len(response.context["todos"]) == 0
+        assert "No todos match" in response.content.decode()
+
+    def test_admin_search(self, admin_client, multiple_todos):
+        """Test that the admin changelist searches the index."""
+        response = admin_client.get(
+            reverse("admin:todos_todo_changelist"), {"q": "todo 2"}
+        )
+        assert response.status_code == 200
+        assert [t.title for t in response.context["cl"].result_list] == ["Todo 2"]
+
+
+class TestSearchMigration:
+    """Test cases for the migration that creates the index."""
+
+    def tables(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name = %s", [search.FTS_TABLE]
+            )
+            return cursor.fetchall()
+
+    def test_unapply_and_reapply(self, add_file_database):
+        """Test that migrating back drops the index and forward rebuilds it."""
+        alias = add_file_database("migrations")
+        Todo.objects.using(alias).create(title="Kept")
+        call_command("migrate", "todos", "0003", database=alias, verbosity=0)
+        assert self.tables(alias) == []
+        call_command("migrate", "todos", database=alias, verbosity=0)
+        todos = Todo.objects.using(alias).all()
+        assert search.search(todos, "kept").count() == 1
+
+    def test_skipped_on_other_databases(self):
+        """Test that the FTS5 SQL only runs on SQLite."""
+        migration = import_module("todos.migrations.0004_todo_search_index")
+        executed = []
+        editor = SimpleNamespace(
+            connection=SimpleNamespace(vendor="postgresql"),
+            execute=lambda sql, params=None: executed.append(sql),
+        )
+        migration.sqlite_only(migration.CREATE_SEARCH_INDEX_SQL)(None, editor)
+        assert executed == []
+        editor.connection.vendor = "sqlite"
+        migration.sqlite_only(migration.DROP_SEARCH_INDEX_SQL)(None, editor)
+        assert executed == migration.DROP_SEARCH_INDEX_SQL
@@ -0,0 +1,116 @@
+"""Tests for the Server-Timing middleware and request profiling."""
+
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+from todos import profiling
+
+
+@pytest.fixture
+def server_timing(settings):
+    """Fixture that enables ServerTimingMiddleware."""
+    settings.MIDDLEWARE = [
+        "todos.middleware.ServerTimingMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    """Fixture that points TODOS_PROFILE_DIR at a temporary directory."""
+    settings.TODOS_PROFILE_DIR = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("server_timing")
+class TestServerTimingMiddleware:
+    """Test cases for ServerTimingMiddleware."""
+
+    def test_header(self, multiple_todos):
+        """Test that responses carry db, template and total timings."""
+        header = Client().get(reverse("todo_list"))["Server-Timing"]
+        assert re.fullmatch(
+            r'db;dur=[\d.]+;desc="2 queries", template;dur=[\d.]+, total;dur=[\d.]+',
+            header,
+        )
+
+    def test_shares_stats_with_budgets(self, sample_todo):
+        """Test that the budget middleware sees the same measurements."""
+        response = Client().get(reverse("todo_detail", args=[sample_todo.pk]))
+        stats = response.wsgi_request.todos_stats
+        assert f'desc="{stats.queries} queries"' in response["Server-Timing"]
+
+    def test_no_profiles_when_sampling_is_off(self, profile_dir, sample_todo):
+        """Test that nothing is profiled at the default sample rate of 0."""
+        Client().get(reverse("todo_list"))
+        assert list(profile_dir.iterdir()) == []
+
+    @override_settings(TODOS_PROFILE_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_profiled(self, profile_dir, sample_todo):
+        """Test that a sampled request is dumped as a .prof file."""
+        Client().get(reverse("todo_list"))
+        [path] = profile_dir.iterdir()
+        assert path.suffix == ".prof"
+        assert "-GET-todos-" in path.name
+
+    @override_settings(TODOS_PROFILE_SAMPLE_RATE=1.0)
+    def test_one_profile_at_a_time(self, profile_dir, sample_todo):
+        """Test that a request sampled during another's profile isn't profiled."""
+        profile = profiling.start()
+        try:
+            response = Client().get(reverse("todo_list"))
+        finally:
+            profiling.stop(profile)
+        assert response.status_code == 200
+        assert list(profile_dir.iterdir()) == []
+        Client().get(reverse("todo_list"))
+        assert len(list(profile_dir.iterdir())) == 1
+
+    def test_other_profiler_active(self, monkeypatch):
+        """Test that a profiler that can't be enabled is skipped, not raised."""
+
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+        monkeypatch.setattr(profiling.cProfile.Profile, "enable", enable)
+        assert profiling.start() is None
+        monkeypatch.undo()
+        profile = profiling.start()
+        assert profile is not None
+        profiling.stop(profile)
+
+
+@pytest.mark.django_db
+class TestSummarizeProfilesCommand:
+    """Test cases for the summarize_profiles management command."""
+
+    @pytest.mark.usefixtures("server_timing")
+    @override_settings(TODOS_PROFILE_SAMPLE_RATE=1.0)
+    def test_summarizes_hottest_functions(self, profile_dir, sample_todo):
+        """Test that the report lists functions from every profile."""
+        client = Client()
+        client.get(reverse("todo_list"))
+        client.get(reverse("todo_detail", args=[sample_todo.pk]))
+        out = StringIO()
+        call_command("summarize_profiles", "--limit", "5", stdout=out)
+        output = out.getvalue()
+        assert output.startswith("2 profiles")
+        assert "cumtime" in output
+
+    def test_match_filters_profiles(self, profile_dir):
+        """Test that --match selects profiles by file name."""
+        (profile_dir / "a-GET-todos-1.0ms.prof").touch()
+        (profile_dir / "b-GET-admin-1.0ms.prof").touch()
+        assert [p.name for p in profiling.find_profiles(match="todos")] == [
+            "a-GET-todos-1.0ms.prof"
+        ]
+
+    def test_no_profiles(self, profile_dir):
+        """Test that an empty directory is an error."""
+        with pytest.raises(CommandError, match="No profiles"):
+            call_command("summarize_profiles")
@@ -0,0 +1,398 @@
+"""Tests for spreading todos over several databases."""
+
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import Count, Max
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from todos import archive, async_views, sharding, write_behind
+from todos.models import Todo, TodoArchive, TodoCounters
+
+SHARDS = ["default", "shard1", "shard2"]
+
+
+@pytest.fixture
+def shards(db, settings, add_file_database):
+    """Fixture that spreads todos over ``default`` and two file databases."""
+    settings.TODOS_SHARDS = SHARDS
+    # Two queries per shard: its counters row and its rows of the page.
+    settings.TODOS_BUDGETS = {
+        "todo_list": {"queries": 2 * len(SHARDS)},
+        "api:todo_list": {"queries": len(SHARDS)},
+    }
+    for alias in SHARDS[1:]:
+        add_file_database(alias)
+    return SHARDS
+
+
+@pytest.fixture
+def spread_todos(shards):
+    """Fixture that saves 12 todos, four on each shard, oldest first."""
+    todos = []
+    for i in range(12):
+        todo = Todo(title=f"Todo {i}", completed=i % 4 == 0)
+        todo.save()
+        todos.append(todo)
+    return todos
+
+
+def on_shard(todo):
+    return Todo.objects.using(sharding.db_for_pk(todo.pk))
+
+
+def post_json(client, url, data):
+    return client.post(url, json.dumps(data), content_type="application/json")
+
+
+@pytest.mark.django_db
+class TestShardRouter:
+    """Test cases for routing todos to their shards."""
+
+    def test_saves_take_turns(self, spread_todos):
+        """Test that new todos are spread evenly over the shards."""
+        assert {alias: Todo.objects.using(alias).count() for alias in SHARDS} == {
+            alias: 4 for alias in SHARDS
+        }
+
+    def test_ids_in_shard_range(self, spread_todos):
+        """Test that each shard hands out ids from its own range."""
+        for todo in spread_todos:
+            index = SHARDS.index(todo._state.db)
+            assert index * sharding.ID_RANGE < todo.pk < (index + 1) * sharding.ID_RANGE
+            assert sharding.db_for_pk(todo.pk) == todo._state.db
+
+    def test_existing_todo_saved_to_its_shard(self, spread_todos):
+        """Test that saving a fetched todo updates it where it lives."""
+        todo = sharding.for_pk(spread_todos[1].pk).get(pk=spread_todos[1].pk)
+        todo.title = "Renamed"
+        todo.save()
+        assert on_shard(todo).get(pk=todo.pk).title == "Renamed"
+        assert Todo.objects.using("default").filter(title="Renamed").count() == 0
+
+    def test_other_apps_stay_on_default(self, shards):
+        """Test that shards only get the todos tables."""
+        tables = connections["shard1"].introspection.table_names()
+        assert "todos_todo" in tables
+        assert "auth_user" not in tables
+
+    def test_disabled_by_default(self, sample_todo):
+        """Test that with one shard everything stays on default."""
+        queryset = Todo.objects.all()
+        assert sharding.scatter(queryset) is queryset
+        assert sharding.ShardRouter().db_for_write(Todo, instance=Todo()) is None
+
+
+@pytest.mark.django_db
+class TestShardedQuerySet:
+    """Test cases for querying every shard at once."""
+
+    def test_merges_in_order(self, spread_todos):
+        """Test that rows from all shards come back newest first."""
+        merged = sharding.scatter(Todo.objects.all())
+        assert [todo.pk for todo in merged] == [t.pk for t in spread_todos[::-1]]
+        assert [todo.pk for todo in merged[3:7]] == [
+            t.pk for t in spread_todos[::-1][3:7]
+        ]
+
+    def test_mixed_directions(self, spread_todos):
+        """Test that orderings mixing directions merge correctly."""
+        merged = sharding.scatter(Todo.objects.order_by("completed", "-created_at"))
+        expected = sorted(spread_todos[::-1], key=lambda todo: todo.completed)
+        assert [todo.pk for todo in merged] == [todo.pk for todo in expected]
+
+    def test_count_and_aggregate(self, spread_todos):
+        """Test that counts add up and maxima take the largest."""
+        merged = sharding.scatter(Todo.objects.all())
+        assert merged.count() == 12
+        assert merged.filter(completed=True).count() == 3
+        stats = merged.order_by().aggregate(last=Max("updated_at"), count=Count("pk"))
+        assert stats == {"last": spread_todos[-1].updated_at, "count": 12}
+
+    def test_list_stats(self, spread_todos):
+        """Test that the counters rows of every shard are added up."""
+        stats = sharding.get_list_stats()
+        assert (stats["count"], stats["completed"]) == (12, 3)
+        assert stats["last"] == spread_todos[-1].updated_at
+        assert async_to_sync(sharding.aget_list_stats)() == stats
+
+    def test_slices_lazily(self, spread_todos, django_assert_num_queries):
+        """Test that a slice is only run when read, and only once."""
+        with django_assert_num_queries(0):
+            page = sharding.scatter(Todo.objects.all())[2:5]
+        # One query on each shard; this counts the one on default.
+        with django_assert_num_queries(1):
+            assert len(page) == 3
+            assert [todo.pk for todo in page] == [t.pk for t in spread_todos[::-1][2:5]]
+        with pytest.raises(TypeError):
+            page[1:2]
+
+    def test_async(self, spread_todos):
+        """Test that async iteration, counts and aggregates merge the shards."""
+        merged = sharding.scatter(Todo.objects.all())
+
+        async def read():
+            rows = [todo.pk async for todo in merged[:5]]
+            stats = await merged.order_by().aaggregate(last=Max("updated_at"))
+            return rows, await merged.acount(), stats["last"]
+
+        rows, count, last = async_to_sync(read)()
+        assert rows == [todo.pk for todo in spread_todos[::-1][:5]]
+        assert (count, last) == (12, spread_todos[-1].updated_at)
+
+
+@pytest.mark.django_db
+class TestShardedViews:
+    """Test cases for the todo views over several shards."""
+
+    def test_list_pages_across_shards(self, client, spread_todos):
+        """Test that the list pages through every shard, newest first."""
+        newest = [todo.pk for todo in spread_todos[::-1]]
+        first = client.get(reverse("todo_list"))
+        assert [todo.pk for todo in first.context["todos"]] == newest[:10]
+        assert first.context["counts"].total == 12
+        second = client.get(reverse("todo_list"), {"page": 2})
+        assert [todo.pk for todo in second.context["todos"]] == newest[10:]
+
+    def test_keyset_pages_across_shards(self, client, settings, spread_todos):
+        """Test that cursor pagination also merges the shards."""
+        settings.TODOS_PAGINATION_MODE = "keyset"
+        newest = [todo.pk for todo in spread_todos[::-1]]
+        first = client.get(reverse("todo_list"))
+        assert [todo.pk for todo in first.context["todos"]] == newest[:10]
+        cursor = first.context["page_obj"].next_cursor
+        second = client.get(reverse("todo_list"), {"cursor": cursor})
+        assert [todo.pk for todo in second.context["todos"]] == newest[10:]
+
+    def test_search_across_shards(self, client, spread_todos):
+        """Test that a search finds matches on every shard."""
+        response = client.get(reverse("todo_list"), {"q": "Todo"})
+        assert len(response.context["todos"]) == 10
+        assert response.context["paginator"].count == 12
+
+    def test_archived_across_shards(self, client, spread_todos):
+        """Test that each shard archives its own todos and the list merges them."""
+        for alias in SHARDS:
+            Todo.objects.using(alias).filter(completed=True).update(
+                updated_at=timezone.now() - timedelta(days=31)
+            )
+            archive.archive(rate=0, using=alias)
+        assert [TodoArchive.objects.using(alias).count() for alias in SHARDS] == [
+            1,
+            1,
+            1,
+        ]
+        assert sharding.get_list_stats()["archived"] == 3
+        response = client.get(reverse("todo_list"), {"archived": "1", "page": 2})
+        assert [todo.pk for todo in response.context["todos"]] == [
+            todo.pk for todo in spread_todos[1::-1]
+        ]
+        archived = spread_todos[4]
+        response = client.get(reverse("todo_detail", args=[archived.pk]))
+        assert response.context["todo"].is_archived
+
+    def test_detail_from_its_shard(self, client, spread_todos):
+        """Test that the detail page reads the todo from its shard."""
+        todo = spread_todos[2]
+        response = client.get(reverse("todo_detail", args=[todo.pk]))
+        assert response.context["todo"] == todo
+        assert response.has_header("ETag")
+
+    def test_toggle_on_its_shard(self, client, spread_todos):
+        """Test that toggling updates the todo where it lives."""
+        todo = spread_todos[1]
+        client.post(reverse("todo_toggle", args=[todo.pk]))
+        assert on_shard(todo).get(pk=todo.pk).completed
+        assert sharding.get_list_stats()["completed"] == 4
+
+    def test_update_and_delete_on_its_shard(self, client, spread_todos):
+        """Test that edits and deletes go to the todo's shard."""
+        todo = spread_todos[2]
+        client.post(
+            reverse("todo_update", args=[todo.pk]),
+            {"title": "Edited", "description": "", "completed": False},
+        )
+        assert on_shard(todo).get(pk=todo.pk).title == "Edited"
+        client.post(reverse("todo_delete", args=[todo.pk]))
+        assert not on_shard(todo).filter(pk=todo.pk).exists()
+        assert sharding.get_list_stats()["count"] == 11
+
+    def test_create_goes_to_next_shard(self, client, spread_todos):
+        """Test that the create view spreads new todos too."""
+        for i in range(3):
+            client.post(reverse("todo_create"), {"title": f"New {i}"})
+        counts = [Todo.objects.using(alias).count() for alias in SHARDS]
+        assert counts == [5, 5, 5]
+
+    def test_write_behind_per_shard(self, client, settings, spread_todos):
+        """Test that queued toggles are committed on the todo's shard."""
+        settings.TODOS_WRITE_BEHIND = True
+        todo = spread_todos[1]
+        try:
+            client.post(reverse("todo_toggle", args=[todo.pk]))
+            assert on_shard(todo).get(pk=todo.pk).completed
+            assert write_behind.get_queue(todo._state.db).operations == 1
+        finally:
+            write_behind.shutdown()
+
+
+@pytest.mark.django_db
+class TestShardedApi:
+    """Test cases for the JSON API and bulk endpoints over several shards."""
+
+    def test_list_pages_across_shards(self, client, spread_todos):
+        """Test that the API lists every shard's todos, newest first."""
+        newest = [todo.pk for todo in spread_todos[::-1]]
+        url = reverse("api:todo_list")
+        first = client.get(url, {"limit": 8}).json()
+        assert [todo["id"] for todo in first["results"]] == newest[:8]
+        second = client.get(url, {"limit": 8, "cursor": first["next"]}).json()
+        assert [todo["id"] for todo in second["results"]] == newest[8:]
+        found = client.get(url, {"q": "Todo", "limit": 20}).json()
+        assert len(found["results"]) == 12
+
+    def test_detail_update_and_delete(self, client, spread_todos):
+        """Test that one todo is read, edited and deleted on its shard."""
+        todo = spread_todos[2]
+        url = reverse("api:todo_detail", args=[todo.pk])
+        assert client.get(url).json()["title"] == "Todo 2"
+        response = client.patch(
+            url, json.dumps({"title": "Edited"}), content_type="application/json"
+        )
+        assert response.status_code == 200
+        assert on_shard(todo).get(pk=todo.pk).title == "Edited"
+        response = client.delete(url, headers={"content-type": "application/json"})
+        assert response.status_code == 204
+        assert not on_shard(todo).filter(pk=todo.pk).exists()
+
+    def test_create_and_toggle(self, client, spread_todos):
+        """Test that the API creates on the next shard and toggles in place."""
+        response = post_json(client, reverse("api:todo_list"), {"title": "New"})
+        assert response.status_code == 201
+        todo = Todo(pk=response.json()["id"])
+        assert on_shard(todo).filter(title="New").exists()
+        response = client.post(
+            reverse("api:todo_toggle", args=[todo.pk]), content_type="application/json"
+        )
+        assert response.json()["completed"]
+        assert sharding.get_list_stats()["completed"] == 4
+
+    def test_export_reads_every_shard(self, client, spread_todos):
+        """Test that the export streams every shard's todos in id order."""
+        response = client.get(reverse("api:todo_export"), {"fields": "id"})
+        rows = [json.loads(line) for line in response.streaming_content]
+        assert [row["id"] for row in rows] == sorted(todo.pk for todo in spread_todos)
+        assert len({sharding.db_for_pk(row["id"]) for row in rows}) == len(SHARDS)
+
+    def test_bulk_complete_and_delete(self, client, spread_todos):
+        """Test that bulk ids are grouped by shard and updated where they live."""
+        ids = [todo.pk for todo in spread_todos[1:7]]
+        response = post_json(client, reverse("todo_bulk_complete"), {"ids": ids})
+        assert response.json() == {"updated": 6}
+        assert sharding.get_list_stats()["completed"] == 8
+        response = post_json(client, reverse("todo_bulk_delete"), {"ids": ids})
+        assert response.json() == {"deleted": 6}
+        assert sharding.get_list_stats()["count"] == 6
+
+    def test_bulk_create_spreads(self, client, spread_todos):
+        """Test that bulk-created todos are spread over the shards."""
+        items = [{"title": f"New {i}"} for i in range(6)]
+        response = post_json(client, reverse("todo_bulk_create"), {"todos": items})
+        ids = response.json()["ids"]
+        assert [on_shard(Todo(pk=pk)).get(pk=pk).title for pk in ids] == [
+            item["title"] for item in items
+        ]
+        counts = [Todo.objects.using(alias).count() for alias in SHARDS]
+        assert counts == [6, 6, 6]
+
+
+@pytest.mark.django_db
+class TestShardedAsyncViews:
+    """Test cases for the async views over several shards."""
+
+    def test_list(self, spread_todos):
+        """Test that the async list merges the shards and adds up the counts."""
+        view = async_to_sync(async_views.AsyncTodoListView.as_view())
+        response = view(AsyncRequestFactory().get(reverse("todo_list")))
+        content = response.content.decode()
+        assert "Todo 11" in content and "Todo 2" in content
+        assert "Todo 1<" not in content
+
+    def test_detail_and_toggle(self, spread_todos):
+        """Test that the async detail and toggle find the todo on its shard."""
+        factory = AsyncRequestFactory()
+        todo = spread_todos[2]
+        detail = async_to_sync(async_views.AsyncTodoDetailView.as_view())
+        response = detail(factory.get("/"), pk=todo.pk)
+        assert "Todo 2" in response.content.decode()
+        toggle = async_to_sync(async_views.toggle_todo)
+        assert toggle(factory.post("/"), pk=todo.pk).status_code == 302
+        assert on_shard(todo).get(pk=todo.pk).completed
+
+
+@pytest.mark.django_db
+class TestMigrateShardsCommand:
+    """Test cases for the migrate_shards management command."""
+
+    def test_migrates_and_keeps_ranges(self, spread_todos):
+        """Test that running it again leaves every shard's ids in range."""
+        out = StringIO()
+        call_command("migrate_shards", stdout=out)
+        assert "Migrated 3 shard(s)." in out.getvalue()
+        todo = Todo(title="After")
+        todo.save()
+        assert sharding.db_for_pk(todo.pk) == todo._state.db
+        counters = TodoCounters.objects.using(todo._state.db).get()
+        assert counters.total == 5
+
+
+def shard_snapshot():
+    return {
+        alias: (
+            list(Todo.objects.using(alias).order_by("pk").values_list("pk", "title")),
+            list(TodoArchive.objects.using(alias).values_list("pk", flat=True)),
+        )
+        for alias in SHARDS
+    }
+
+
+@pytest.mark.django_db
+class TestShardedTransfer:
+    """Test cases for exporting and importing todos across shards."""
+
+    def test_round_trip_keeps_every_shard(self, tmp_path, spread_todos):
+        """Test that every shard's todos are exported and imported back."""
+        Todo.objects.using("shard1").filter(completed=True).update(
+            updated_at=timezone.now() - timedelta(days=31)
+        )
+        archive.archive(rate=0, using="shard1")
+        before = shard_snapshot()
+        path = tmp_path / "todos.csv"
+        call_command("export_todos", str(path), stderr=StringIO())
+        ids = [int(line.split(",")[0]) for line in path.read_text().splitlines()[1:]]
+        assert ids == sorted(todo.pk for todo in spread_todos)
+        for alias in SHARDS:
+            Todo.all_objects.using(alias).hard_delete()
+            TodoArchive.objects.using(alias).all().delete()
+        call_command("import_todos", str(path), keep_ids=True, stderr=StringIO())
+        assert shard_snapshot() == before
+        assert before["shard1"][1]
+
+    def test_import_spreads_new_todos(self, tmp_path, spread_todos):
+        """Test that imported todos without kept ids take the shards in turn."""
+        path = tmp_path / "todos.csv"
+        call_command("export_todos", str(path), stderr=StringIO())
+        call_command("import_todos", str(path), stderr=StringIO())
+        for alias in SHARDS:
+            todos = Todo.objects.using(alias)
+            assert todos.count() == 8
+            assert all(
+                sharding.db_for_pk(pk) == alias
+                for pk in todos.values_list("pk", flat=True)
+            )
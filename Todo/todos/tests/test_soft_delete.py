@@ -0,0 +1,167 @@
+"""Tests for soft deletion and the purge of deleted todos."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from todos import counters, page_cache, purge
+from todos.models import Todo
+
+
+def soft_delete(todos, ago):
+    """Mark ``todos`` deleted ``ago`` before now."""
+    Todo.objects.filter(pk__in=[t.pk for t in todos]).update(
+        deleted_at=timezone.now() - ago
+    )
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+    """Test cases for deleting todos by setting deleted_at."""
+
+    def test_delete_view_marks_deleted(self, sample_todo):
+        """Test that the delete view keeps the row but hides it."""
+        Client().post(reverse("todo_delete", args=[sample_todo.pk]))
+        assert not Todo.objects.filter(pk=sample_todo.pk).exists()
+        assert Todo.all_objects.get(pk=sample_todo.pk).deleted_at is not None
+
+    def test_delete_is_one_update(self, sample_todo):
+        """Test that deleting a todo costs a single-row UPDATE."""
+        with CaptureQueriesContext(connection) as queries:
+            assert sample_todo.delete() == (1, {"todos.Todo": 1})
+        [query] = [q["sql"] for q in queries.captured_queries]
+        assert query.startswith('UPDATE "todos_todo" SET "deleted_at"')
+
+    def test_deleted_todo_is_not_found(self, sample_todo):
+        """Test that detail, toggle and delete 404 for a deleted todo."""
+        sample_todo.delete()
+        client = Client()
+        for name in ("todo_detail", "todo_toggle", "todo_delete"):
+            assert client.get(reverse(name, args=[sample_todo.pk])).status_code == 404
+
+    def test_delete_twice(self, sample_todo):
+        """Test that deleting an already deleted todo changes nothing."""
+        sample_todo.delete()
+        assert Todo.all_objects.filter(pk=sample_todo.pk).delete() == (
+            0,
+            {"todos.Todo": 0},
+        )
+
+    def test_counts_exclude_deleted(self, multiple_todos):
+        """Test that the counters drop deleted todos and follow toggles."""
+        multiple_todos[0].delete()
+        Todo.all_objects.filter(pk=multiple_todos[0].pk).update(completed=False)
+        counts = counters.get_counts()
+        assert (counts.total, counts.completed) == (4, 2)
+        assert counters.reconcile()[0].total == 4
+
+    def test_restore(self, completed_todo):
+        """Test that clearing deleted_at brings a todo back into the counts."""
+        completed_todo.delete()
+        Todo.all_objects.filter(pk=completed_todo.pk).update(deleted_at=None)
+        assert str(counters.get_counts()) == "1 of 1 done"
+
+    def test_delete_invalidates_page_cache(self, sample_todo):
+        """Test that a soft delete bumps the page cache generation."""
+        generation = page_cache.get_generation()
+        sample_todo.delete()
+        assert page_cache.get_generation() != generation
+
+    def test_list_hides_deleted(self, multiple_todos):
+        """Test that the list page leaves deleted todos out."""
+        multiple_todos[0].delete()
+        response = Client().get(reverse("todo_list"))
+        assert multiple_todos[0] not in response.context["todos"]
+        assert response.context["counts"].total == 4
+
+    def test_api_delete(self, sample_todo):
+        """Test that DELETE on the API soft-deletes too."""
+        url = reverse("api:todo_detail", args=[sample_todo.pk])
+        response = Client().delete(url, headers={"content-type": "application/json"})
+        assert response.status_code == 204
+        assert Todo.all_objects.filter(pk=sample_todo.pk).exists()
+        assert Client().get(url).status_code == 404
+
+
+@pytest.mark.django_db
+class TestPurge:
+    """Test cases for hard-deleting soft-deleted todos."""
+
+    def test_purges_only_old_deletions(self, multiple_todos):
+        """Test that todos deleted within the retention period are kept."""
+        soft_delete(multiple_todos[:2], timedelta(days=8))
+        soft_delete(multiple_todos[2:3], timedelta(days=1))
+        assert purge.purge(older_than=timedelta(days=7)).rows == 2
+        assert Todo.all_objects.count() == 3
+        assert str(counters.get_counts()) == str(counters.reconcile()[0])
+
+    def test_chunks_and_rate_limit(self, bulk_todos):
+        """Test that each chunk is followed by a sleep sized to the rate."""
+        todos = bulk_todos(10)
+        soft_delete(todos, timedelta(days=8))
+        sleeps = []
+        progress = purge.purge(chunk_size=4, rate=1000, sleep=sleeps.append)
+        assert progress.rows == 10
+        assert len(sleeps) == 3
+        assert all(0 <= s <= 0.004 for s in sleeps)
+        assert not Todo.all_objects.exists()
+
+    def test_unlimited_rate_never_sleeps(self, multiple_todos):
+        """Test that a rate of 0 purges without sleeping."""
+        soft_delete(multiple_todos, timedelta(days=8))
+        purge.purge(rate=0, sleep=pytest.fail)
+        assert not Todo.all_objects.exists()
+
+    def test_purge_skips_page_cache(self, multiple_todos):
+        """Test that purging invisible rows leaves cached pages valid."""
+        soft_delete(multiple_todos, timedelta(days=8))
+        generation = page_cache.get_generation()
+        purge.purge(rate=0)
+        assert page_cache.get_generation() == generation
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("90s", timedelta(seconds=90)),
+            ("30m", timedelta(minutes=30)),
+            ("12h", timedelta(hours=12)),
+            ("7d", timedelta(days=7)),
+            ("1.5", timedelta(days=1.5)),
+        ],
+    )
+    def test_parse_age(self, value, expected):
+        """Test that ages take an s, m, h or d suffix, days by default."""
+        assert purge.parse_age(value) == expected
+
+
+@pytest.mark.django_db
+class TestPurgeDeletedTodosCommand:
+    """Test cases for the purge_deleted_todos management command."""
+
+    def test_purges(self, multiple_todos):
+        """Test that the command purges and reports how many it removed."""
+        soft_delete(multiple_todos[:3], timedelta(hours=2))
+        err = StringIO()
+        call_command(
+            "purge_deleted_todos", "--older-than", "1h", "--rate", "0", stderr=err
+        )
+        assert "Purged 3 deleted todos" in err.getvalue()
+        assert Todo.all_objects.count() == 2
+
+    def test_default_retention(self, settings, multiple_todos):
+        """Test that TODOS_PURGE_AFTER applies without --older-than."""
+        settings.TODOS_PURGE_AFTER = timedelta(days=30)
+        soft_delete(multiple_todos, timedelta(days=8))
+        call_command("purge_deleted_todos", stderr=StringIO())
+        assert Todo.all_objects.count() == 5
+
+    def test_invalid_age(self):
+        """Test that an unparseable --older-than is an error."""
+        with pytest.raises(CommandError, match="Invalid age"):
+            call_command("purge_deleted_todos", "--older-than", "soon")
@@ -0,0 +1,54 @@
+"""Tests for the production SQLite profile."""
+
+import pytest
+from django.db.utils import ConnectionHandler
+from todo_project.sqlite import production_database
+
+
+@pytest.fixture
+def profile_connection(tmp_path, django_db_blocker):
+    """Fixture that opens a file database with the production profile."""
+    handler = ConnectionHandler(
+        {"default": production_database(str(tmp_path / "profile.sqlite3"))}
+    )
+    connection = handler["default"]
+    with django_db_blocker.unblock():
+        connection.ensure_connection()
+        yield connection
+        connection.close()
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+class TestProductionProfile:
+    """Test cases for the production SQLite profile."""
+
+    def test_pragmas_applied_on_connect(self, profile_connection):
+        """Test that every new connection runs the profile's pragmas."""
+        assert pragma(profile_connection, "journal_mode") == "wal"
+        assert pragma(profile_connection, "synchronous") == 1  # NORMAL
+        assert pragma(profile_connection, "busy_timeout") == 5000
+        assert pragma(profile_connection, "cache_size") == -20000
+        assert pragma(profile_connection, "temp_store") == 2  # MEMORY
+
+    def test_transactions_take_write_lock_up_front(self, profile_connection):
+        """Test that atomic blocks begin with BEGIN IMMEDIATE."""
+        assert profile_connection.transaction_mode == "IMMEDIATE"
+
+    def test_connections_are_persistent(self, tmp_path):
+        """Test that connections are reused across requests."""
+        database = production_database(tmp_path / "db.sqlite3")
+        assert database["CONN_MAX_AGE"] > 0
+        assert database["CONN_HEALTH_CHECKS"] is True
+
+    def test_overrides(self, tmp_path):
+        """Test that single pragmas can be overridden."""
+        database = production_database(
+            tmp_path / "db.sqlite3", pragmas={"busy_timeout": 100}
+        )
+        assert "PRAGMA busy_timeout=100" in database["OPTIONS"]["init_command"]
+        assert "PRAGMA journal_mode=WAL" in database["OPTIONS"]["init_command"]
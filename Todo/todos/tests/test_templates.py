@@ -0,0 +1,56 @@
+"""Tests for the template profiles and the list page's row links."""
+
+import pytest
+from django.test import Client
+from django.test.utils import override_script_prefix
+from django.urls import reverse
+from todo_project.settings import TEMPLATES
+from todo_project.templating import production_templates
+from todos.instrumentation import DjangoTemplates
+
+ROW_URLS = ("todo_detail", "todo_toggle", "todo_update", "todo_delete")
+
+
+class TestProductionTemplates:
+    """Test cases for the production template profile."""
+
+    def test_cached_loaders_without_debug(self):
+        """Test that templates are compiled once and without debug info."""
+        [template] = production_templates(TEMPLATES)
+        assert template["APP_DIRS"] is False
+        [(loader, loaders)] = template["OPTIONS"]["loaders"]
+        assert loader == "django.template.loaders.cached.Loader"
+        assert "django.template.loaders.app_directories.Loader" in loaders
+        assert template["OPTIONS"]["debug"] is False
+        assert "loaders" not in TEMPLATES[0]["OPTIONS"]
+
+    def test_other_backends_unchanged(self):
+        """Test that non-Django backends are left alone."""
+        jinja = {"BACKEND": "django.template.backends.jinja2.Jinja2", "OPTIONS": {}}
+        assert production_templates([jinja]) == [jinja]
+
+    def test_timing_backend_compiles_once(self):
+        """Test that the timing backend reuses the compiled template."""
+        params = {**production_templates(TEMPLATES)[0], "NAME": "production"}
+        del params["BACKEND"]
+        engine = DjangoTemplates(params)
+        first = engine.get_template("todos/todo_list_page.html")
+        second = engine.get_template("todos/todo_list_page.html")
+        assert first.template is second.template
+        assert "No todos yet" in first.render({"todos": []})
+
+
+@pytest.mark.django_db
+class TestRowLinks:
+    """Test cases for the list page's links built on todo_url_prefix."""
+
+    @pytest.mark.parametrize("script_prefix", ["/", "/app/"])
+    def test_links_match_reverse(self, sample_todo, script_prefix):
+        """Test that every row link is what {% url %} would have produced."""
+        path = reverse("todo_list")
+        with override_script_prefix(script_prefix):
+            html = Client().get(path).content.decode()
+            urls = [reverse(name, args=[sample_todo.pk]) for name in ROW_URLS]
+        for url in urls:
+            assert url.startswith(script_prefix)
+            assert f'href="{url}"' in html
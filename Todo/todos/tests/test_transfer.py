@@ -0,0 +1,155 @@
+"""Tests for the export_todos and import_todos commands."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from todos import archive, counters
+from todos.models import Todo, TodoArchive
+
+
+def export(path, **options):
+    call_command("export_todos", str(path), stderr=StringIO(), **options)
+
+
+def import_(path, **options):
+    call_command("import_todos", str(path), stderr=StringIO(), **options)
+
+
+def snapshot():
+    return list(
+        Todo.objects.order_by("pk").values_list(
+            "id", "title", "description", "completed", "created_at", "updated_at"
+        )
+    )
+
+
+def archive_snapshot():
+    return list(
+        TodoArchive.objects.order_by("pk").values_list(
+            "id", "title", "completed", "created_at", "updated_at", "archived_at"
+        )
+    )
+
+
+@pytest.fixture
+def archived_todos(multiple_todos):
+    """Fixture that archives the completed ones of ``multiple_todos``."""
+    Todo.objects.filter(completed=True).update(
+        updated_at=timezone.now() - timedelta(days=31)
+    )
+    archive.archive(rate=0)
+    return multiple_todos
+
+
+@pytest.mark.django_db
+class TestExportImport:
+    """Test cases for moving todos through export files."""
+
+    @pytest.mark.parametrize("suffix", ["csv", "ndjson"])
+    def test_round_trip_keeps_everything(self, tmp_path, multiple_todos, suffix):
+        """Test that export then import with --keep-ids restores every field."""
+        Todo.objects.filter(pk=multiple_todos[0].pk).update(
+            description='Quotes "here", commas, and\na newline'
+        )
+        before = snapshot()
+        path = tmp_path / f"todos.{suffix}"
+        export(path)
+        Todo.all_objects.all().hard_delete()
+        import_(path, keep_ids=True)
+        assert snapshot() == before
+
+    def test_import_assigns_new_ids_by_default(self, tmp_path, multiple_todos):
+        """Test that imported rows get fresh ids unless --keep-ids is given."""
+        path = tmp_path / "todos.csv"
+        export(path)
+        import_(path)
+        assert Todo.objects.count() == 10
+        assert Todo.objects.filter(title="Todo 1").count() == 2
+
+    def test_export_resume_appends(self, tmp_path, multiple_todos):
+        """Test that --after-id appends the remaining rows without a header."""
+        path = tmp_path / "todos.csv"
+        Todo.objects.filter(pk__gt=multiple_todos[1].pk).delete()
+        export(path)
+        Todo.objects.bulk_create(Todo(title=f"Later {i}") for i in range(2))
+        export(path, after_id=multiple_todos[1].pk)
+        lines = path.read_text().splitlines()
+        assert lines[0].startswith("id,title")
+        assert len(lines) == 5
+
+    def test_import_skip_resumes(self, tmp_path, multiple_todos):
+        """Test that --skip passes over already imported records."""
+        path = tmp_path / "todos.ndjson"
+        export(path)
+        Todo.all_objects.all().hard_delete()
+        import_(path, skip=3, keep_ids=True)
+        assert list(Todo.objects.order_by("pk").values_list("title", flat=True)) == [
+            "Todo 4",
+            "Todo 5",
+        ]
+
+    def test_import_commits_in_batches(
+        self, tmp_path, multiple_todos, django_assert_num_queries
+    ):
+        """Test that rows are inserted with one INSERT per batch."""
+        path = tmp_path / "todos.csv"
+        export(path)
+        Todo.objects.all().delete()
+        # Two transactions of 3 and 2 rows, each with SAVEPOINT and RELEASE.
+        with django_assert_num_queries(7) as ctx:
+            import_(path, batch_size=2, transaction_size=3)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 3
+        assert Todo.objects.count() == 5
+
+    @pytest.mark.parametrize("suffix", ["csv", "ndjson"])
+    def test_round_trip_keeps_archive(self, tmp_path, archived_todos, suffix):
+        """Test that archived todos are exported and imported back archived."""
+        before, archived_before = snapshot(), archive_snapshot()
+        assert len(archived_before) == 3
+        path = tmp_path / f"todos.{suffix}"
+        export(path)
+        Todo.all_objects.all().hard_delete()
+        TodoArchive.objects.all().delete()
+        import_(path, keep_ids=True)
+        assert (snapshot(), archive_snapshot()) == (before, archived_before)
+        assert counters.get_counts().archived == 3
+
+    def test_import_archived_with_new_ids(self, tmp_path, archived_todos):
+        """Test that archived todos get fresh ids that live todos won't reuse."""
+        path = tmp_path / "todos.csv"
+        export(path)
+        import_(path)
+        assert (Todo.objects.count(), TodoArchive.objects.count()) == (4, 6)
+        ids = [*Todo.objects.values_list("pk", flat=True)]
+        ids += TodoArchive.objects.values_list("pk", flat=True)
+        assert len(set(ids)) == 10
+        new = Todo.objects.create(title="After")
+        assert not TodoArchive.objects.filter(pk=new.pk).exists()
+        assert counters.get_counts().archived == 6
+
+    def test_export_without_archived(self, tmp_path, archived_todos):
+        """Test that --no-include-archived exports only live todos."""
+        path = tmp_path / "todos.csv"
+        export(path, include_archived=False)
+        lines = path.read_text().splitlines()
+        assert lines[0] == "id,title,description,completed,created_at,updated_at"
+        assert len(lines) == 3
+
+    def test_export_to_stdout(self, multiple_todos):
+        """Test that - writes NDJSON to stdout."""
+        out = StringIO()
+        call_command(
+            "export_todos", "-", format="ndjson", stdout=out, stderr=StringIO()
+        )
+        assert len(out.getvalue().splitlines()) == 5
+
+    def test_reports_rate(self, tmp_path, multiple_todos):
+        """Test that the commands report rows per second."""
+        err = StringIO()
+        call_command("export_todos", str(tmp_path / "t.csv"), stderr=err)
+        assert "Exported 5 todos" in err.getvalue()
+        assert "rows/s" in err.getvalue()
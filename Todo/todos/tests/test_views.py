@@ -1,6 +1,9 @@
 """Tests for the Todo views."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from django.db import connection
 from django.test import Client
 from django.urls import reverse
 from todos.models import Todo
@@ -39,16 +42,25 @@ class TestTodoListView:
         assert response.status_code == 200
         assert len(response.context["todos"]) == 0
 
-    def test_list_view_pagination(self):
+    def test_list_view_pagination(self, bulk_todos):
         """Test that list view supports pagination."""
-        for i in range(15):
-            Todo.objects.create(title=f"Todo {i+1}")
+        bulk_todos(15)
 
         client = Client()
         response = client.get(reverse("todo_list"))
         assert "is_paginated" in response.context
         assert response.context["is_paginated"] is True
 
+    def test_list_view_does_not_load_descriptions(self, django_assert_num_queries):
+        """Test that the page shows the excerpt without loading descriptions."""
+        Todo.objects.create(title="Long", description="word " * 5000)
+        with django_assert_num_queries(2) as ctx:
+            response = Client().get(reverse("todo_list"))
+        page_query = ctx.captured_queries[-1]["sql"]
+        assert '"description_excerpt"' in page_query
+        assert '"description",' not in page_query
+        assert "word " * 20 + "…" in response.content.decode()
+
 
 @pytest.mark.django_db
 class TestTodoDetailView:
@@ -251,3 +263,54 @@ class TestToggleTodoView:
         client = Client()
         response = client.get(reverse("todo_toggle", args=[999]))
         assert response.status_code == 404
+
+    def test_toggle_todo_single_query(self, django_assert_num_queries):
+        """Test that toggle is one UPDATE with no prior SELECT."""
+        todo = Todo.objects.create(title="Test Todo")
+        client = Client()
+        with django_assert_num_queries(1) as ctx:
+            client.get(reverse("todo_toggle", args=[todo.pk]))
+        assert ctx.captured_queries[0]["sql"].startswith("UPDATE")
+
+    def test_toggle_todo_bumps_updated_at(self):
+        """Test that toggle refreshes updated_at."""
+        todo = Todo.objects.create(title="Test Todo")
+        client = Client()
+        client.get(reverse("todo_toggle", args=[todo.pk]))
+
+        before = todo.updated_at
+        todo.refresh_from_db()
+        assert todo.updated_at > before
+
+
+@pytest.mark.django_db(transaction=True)
+class TestToggleTodoConcurrency:
+    """Test cases for toggle_todo under concurrent requests."""
+
+    def toggle_many(self, pk, count, workers=16):
+        def toggle(_):
+            try:
+                return Client().get(reverse("todo_toggle", args=[pk])).status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(toggle, range(count)))
+
+    def test_parallel_toggles_are_not_lost(self):
+        """Test that an even number of parallel toggles restores the state."""
+        todo = Todo.objects.create(title="Test Todo", completed=False)
+        statuses = self.toggle_many(todo.pk, 300)
+
+        assert statuses == [302] * 300
+        todo.refresh_from_db()
+        assert todo.completed is False
+
+    def test_parallel_toggles_odd_count(self):
+        """Test that an odd number of parallel toggles flips the state once."""
+        todo = Todo.objects.create(title="Test Todo", completed=False)
+        statuses = self.toggle_many(todo.pk, 301)
+
+        assert statuses == [302] * 301
+        todo.refresh_from_db()
+        assert todo.completed is True
@@ -0,0 +1,160 @@
+"""Tests for the write-behind batching queue."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncRequestFactory, Client
+from django.urls import reverse
+from todos import async_views, instrumentation, write_behind
+from todos.models import Todo
+from todos.write_behind import Operation, PendingWrite, WriteBehindQueue
+
+
+@pytest.fixture(autouse=True)
+def stop_queue():
+    """Fixture that stops the process-wide queue after each test."""
+    yield
+    write_behind.shutdown()
+
+
+@pytest.fixture
+def enabled(settings):
+    """Fixture that turns on TODOS_WRITE_BEHIND."""
+    settings.TODOS_WRITE_BEHIND = True
+
+
+def fold(*operations):
+    write = PendingWrite()
+    for fields in operations:
+        write.add(Operation(1, fields))
+    return write
+
+
+class TestPendingWrite:
+    """Test cases for folding a batch's writes to one todo."""
+
+    def test_toggles_cancel_out(self):
+        """Test that an even number of toggles is no write at all."""
+        assert fold(None, None).flip is False
+        assert fold(None, None, None).flip is True
+
+    def test_later_fields_win(self):
+        """Test that a later update overrides earlier values."""
+        write = fold({"title": "a", "completed": True}, {"title": "b"})
+        assert write.fields == {"title": "b", "completed": True}
+
+    def test_toggle_after_update_flips_value(self):
+        """Test that a toggle after setting completed flips the set value."""
+        write = fold(None, {"completed": True}, None)
+        assert write.fields == {"completed": False}
+        assert write.flip is False
+
+
+@pytest.mark.django_db
+class TestApplyBatch:
+    """Test cases for committing one batch."""
+
+    def test_one_update_for_all_toggles(self, multiple_todos):
+        """Test that toggles of many todos run one SELECT and one UPDATE."""
+        pks = [todo.pk for todo in multiple_todos]
+        operations = [Operation(pk) for pk in pks] + [Operation(pks[0])]
+        with instrumentation.collect() as stats:
+            found = write_behind.apply_batch(operations)
+        assert stats.queries == 2
+        assert found == set(pks)
+        assert Todo.objects.get(pk=pks[0]).completed is multiple_todos[0].completed
+        assert Todo.objects.get(pk=pks[1]).completed is not multiple_todos[1].completed
+
+    def test_updates_and_missing_todos(self, sample_todo):
+        """Test that field updates apply and missing todos are reported."""
+        operations = [
+            Operation(sample_todo.pk, {"title": "New", "completed": False}),
+            Operation(sample_todo.pk),
+            Operation(sample_todo.pk + 100),
+        ]
+        assert write_behind.apply_batch(operations) == {sample_todo.pk}
+        sample_todo.refresh_from_db()
+        assert (sample_todo.title, sample_todo.completed) == ("New", True)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWriteBehindQueue:
+    """Test cases for the queue and its worker thread."""
+
+    def test_concurrent_writes_are_batched(self):
+        """Test that concurrent toggles share transactions and all land."""
+        pks = [Todo.objects.create(title=f"Todo {i}").pk for i in range(10)]
+        write_queue = WriteBehindQueue(interval=0.05)
+
+        def toggle(i):
+            try:
+                return write_queue.submit(pks[i % 10]).result(5)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=30) as pool:
+            assert all(pool.map(toggle, range(30)))
+        write_queue.close()
+        assert write_queue.operations == 30
+        assert write_queue.batches < 30
+        assert Todo.objects.filter(completed=True).count() == 10
+
+    def test_close_commits_queued_writes(self, sample_todo):
+        """Test that shutting down flushes writes still waiting for a batch."""
+        write_queue = WriteBehindQueue(interval=60)
+        future = write_queue.submit(sample_todo.pk, {"title": "Saved"})
+        write_queue.close(timeout=5)
+        assert future.result(0) is True
+        sample_todo.refresh_from_db()
+        assert sample_todo.title == "Saved"
+
+    def test_refuses_writes_after_close(self, sample_todo):
+        """Test that a closed queue refuses new writes."""
+        write_queue = WriteBehindQueue()
+        write_queue.close()
+        with pytest.raises(RuntimeError):
+            write_queue.submit(sample_todo.pk)
+
+    def test_rejects_unknown_fields(self, sample_todo):
+        """Test that only the form's fields can be updated."""
+        with pytest.raises(ValueError, match="created_at"):
+            write_behind.get_queue().submit(sample_todo.pk, {"created_at": None})
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("enabled")
+class TestWriteBehindViews:
+    """Test cases for the views with TODOS_WRITE_BEHIND on."""
+
+    def test_toggle_reads_its_own_write(self, sample_todo):
+        """Test that the page after a toggle shows the toggled todo."""
+        client = Client()
+        response = client.get(reverse("todo_toggle", args=[sample_todo.pk]))
+        assert response.status_code == 302
+        response = client.get(response["Location"])
+        assert "1 of 1 done" in response.content.decode()
+
+    def test_toggle_missing_todo(self):
+        """Test that toggling a missing todo is still a 404."""
+        response = Client().get(reverse("todo_toggle", args=[999]))
+        assert response.status_code == 404
+
+    def test_update(self, sample_todo):
+        """Test that an edit is committed before the redirect."""
+        response = Client().post(
+            reverse("todo_update", args=[sample_todo.pk]),
+            {"title": "Edited", "description": "", "completed": "on"},
+        )
+        assert response.status_code == 302
+        sample_todo.refresh_from_db()
+        assert (sample_todo.title, sample_todo.completed) == ("Edited", True)
+
+    def test_async_toggle(self, sample_todo):
+        """Test that the async toggle view awaits its batch."""
+        request = AsyncRequestFactory().get("/")
+        response = async_to_sync(async_views.toggle_todo)(request, pk=sample_todo.pk)
+        assert response.status_code == 302
+        sample_todo.refresh_from_db()
+        assert sample_todo.completed is True
@@ -0,0 +1,279 @@
+"""Streaming export and import of todos as CSV or NDJSON.
+
+Both directions work row by row: the export reads through a chunked
+server-side iterator and the import inserts chunked ``bulk_create``
+batches inside periodic transactions, so memory use stays flat however
+many rows are moved. Progress is reported as rows per second together
+with the position to resume from.
+
+Archived todos (see ``todos.archive``) are exported too, in the same id
+order, with their ``archived_at`` set; it is empty for live todos. The
+import puts them back in the archive.
+
+With ``TODOS_SHARDS``, the export reads every shard in turn, which keeps
+id order since each shard has its own id range, and the import writes
+each todo to the shard ``save()`` would: its id's shard with
+``keep_ids``, else the next shard in turn.
+"""
+
+import csv
+import heapq
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import chain, islice
+
+from django.db import DEFAULT_DB_ALIAS, router
+from django.utils import timezone
+
+from . import page_cache, sharding
+from .bulk import atomic
+from .models import Todo, TodoArchive, make_excerpt
+
+FIELDS = ("id", "title", "description", "completed", "created_at", "updated_at")
+ARCHIVED_FIELDS = FIELDS + ("archived_at",)
+FORMATS = ("csv", "ndjson")
+
+
+def guess_format(path, default="csv"):
+    """Return the format implied by a file name's extension."""
+    for name in FORMATS:
+        if str(path).endswith(f".{name}"):
+            return name
+    return default
+
+
+class Progress:
+    """Rate-limited rows/sec reporting."""
+
+    def __init__(self, report, every=5.0):
+        self.report = report
+        self.every = every
+        self.rows = 0
+        self.started = self.last_report = time.perf_counter()
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed else 0.0
+
+    def add(self, rows, position):
+        self.rows += rows
+        now = time.perf_counter()
+        if self.report and now - self.last_report >= self.every:
+            self.last_report = now
+            self.report(f"{self.rows} rows, {self.rate:,.0f} rows/s, {position}")
+
+
+def encode_row(row):
+    # isoformat() keeps the microseconds that DjangoJSONEncoder drops.
+    return [
+        value.isoformat() if hasattr(value, "isoformat") else value for value in row
+    ]
+
+
+def get_rows(using, after_id=0, chunk_size=2000, include_archived=True):
+    """Return an iterator of one database's todos with ``id > after_id``.
+
+    Rows come in primary key order, with archived todos merged in by id
+    and an extra ``archived_at`` when ``include_archived`` is set.
+    """
+    rows = (
+        Todo.objects.using(using)
+        .filter(pk__gt=after_id)
+        .order_by("pk")
+        .values_list(*FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    if not include_archived:
+        return rows
+    archived = (
+        TodoArchive.objects.using(using)
+        .filter(pk__gt=after_id)
+        .order_by("pk")
+        .values_list(*ARCHIVED_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    return heapq.merge(
+        (row + (None,) for row in rows), archived, key=lambda row: row[0]
+    )
+
+
+def export_rows(
+    out,
+    fmt="csv",
+    after_id=0,
+    chunk_size=2000,
+    header=True,
+    include_archived=True,
+    report=None,
+):
+    """Write todos with ``id > after_id`` to ``out`` in primary key order.
+
+    Every shard is read, one after the other. With ``include_archived``,
+    archived todos are merged in by id, with an extra ``archived_at``
+    column. Returns a ``Progress`` with the number of rows written and
+    the rate.
+    """
+    fields = ARCHIVED_FIELDS if include_archived else FIELDS
+    rows = chain.from_iterable(
+        get_rows(alias, after_id, chunk_size, include_archived)
+        for alias in sharding.get_shards()
+    )
+    progress = Progress(report)
+    if fmt == "csv":
+        writer = csv.writer(out)
+        if header:
+            writer.writerow(fields)
+        for row in rows:
+            writer.writerow(encode_row(row))
+            progress.add(1, f"last id {row[0]}")
+    else:
+        for row in rows:
+            out.write(json.dumps(dict(zip(fields, encode_row(row)))) + "\n")
+            progress.add(1, f"last id {row[0]}")
+    return progress
+
+
+def read_records(stream, fmt="csv"):
+    """Yield one dict per record of ``stream``, without reading it all."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_todo(record, keep_ids=False, now=None):
+    """Return an unsaved ``Todo`` from an exported record.
+
+    Missing timestamps default to ``now``.
+    """
+    now = now or timezone.now()
+    values = {"created_at": now, "updated_at": now}
+    for name in FIELDS:
+        if name not in record or (name == "id" and not keep_ids):
+            continue
+        value = record[name]
+        if value in (None, "") and name != "description":
+            continue
+        values[name] = Todo._meta.get_field(name).to_python(value)
+    return Todo(**values)
+
+
+def get_archived_at(record):
+    """Return an exported record's ``archived_at``, or ``None`` if it's live."""
+    value = record.get("archived_at")
+    if value in (None, ""):
+        return None
+    return TodoArchive._meta.get_field("archived_at").to_python(value)
+
+
+def import_archived(
+    todos, archived_at, keep_ids=False, batch_size=1000, using=DEFAULT_DB_ALIAS
+):
+    """Insert unsaved ``todos`` into the archive, archived at ``archived_at``.
+
+    Without ``keep_ids`` they are inserted into ``todos_todo`` first, to
+    take fresh ids from its sequence, then moved as ``archive.archive()``
+    moves them.
+    """
+    if not keep_ids:
+        Todo.objects.using(using).bulk_create(todos, batch_size=batch_size)
+    TodoArchive.objects.using(using).bulk_create(
+        (
+            TodoArchive(
+                id=todo.pk,
+                title=todo.title,
+                description=todo.description,
+                description_excerpt=make_excerpt(todo.description),
+                completed=todo.completed,
+                created_at=todo.created_at,
+                updated_at=todo.updated_at,
+                archived_at=when,
+            )
+            for todo, when in zip(todos, archived_at)
+        ),
+        batch_size=batch_size,
+    )
+    if not keep_ids:
+        for chunk in lazy_chunks([todo.pk for todo in todos], batch_size):
+            moved = Todo.all_objects.using(using).filter(pk__in=chunk)
+            moved.update(deleted_at=timezone.now())
+            moved.only("pk", "deleted_at").hard_delete()
+
+
+@contextmanager
+def preserve_timestamps():
+    """Keep imported ``created_at``/``updated_at`` instead of stamping now.
+
+    Only safe in a process dedicated to the import, such as a management
+    command, because it changes the model fields for every thread.
+    """
+    fields = [Todo._meta.get_field("created_at"), Todo._meta.get_field("updated_at")]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def lazy_chunks(iterable, size):
+    """Yield lists of up to ``size`` items, reading only one list at a time."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_records(
+    records,
+    skip=0,
+    batch_size=1000,
+    transaction_size=20000,
+    keep_ids=False,
+    report=None,
+):
+    """Insert ``records`` with chunked ``bulk_create`` in batched transactions.
+
+    Each transaction inserts up to ``transaction_size`` records, in
+    ``bulk_create`` batches of ``batch_size``, on each shard it touches.
+    Records with an ``archived_at`` go to the archive. The first ``skip`` records are
+    passed over, to resume an interrupted import from the last committed
+    position. Returns a ``Progress`` with the rows inserted.
+
+    Timestamps are kept as exported; see ``preserve_timestamps`` for why
+    this belongs in a dedicated process.
+    """
+    progress = Progress(report)
+    position = skip
+    with preserve_timestamps():
+        for chunk in lazy_chunks(islice(records, skip, None), transaction_size):
+            now = timezone.now()
+            todos = defaultdict(list)
+            archived = defaultdict(list)
+            archived_at = defaultdict(list)
+            for record in chunk:
+                todo = build_todo(record, keep_ids, now)
+                alias = router.db_for_write(Todo, instance=todo)
+                when = get_archived_at(record)
+                if when is None:
+                    todos[alias].append(todo)
+                else:
+                    archived[alias].append(todo)
+                    archived_at[alias].append(when)
+            with atomic(sorted(todos.keys() | archived.keys())):
+                for alias, objs in todos.items():
+                    Todo.objects.using(alias).bulk_create(objs, batch_size=batch_size)
+                for alias, objs in archived.items():
+                    import_archived(
+                        objs, archived_at[alias], keep_ids, batch_size, alias
+                    )
+            position += len(chunk)
+            progress.add(len(chunk), f"resume with --skip {position}")
+    page_cache.bump_generation()
+    return progress
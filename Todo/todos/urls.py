@@ -1,11 +1,30 @@
-from django.urls import path
-from . import views
+from django.conf import settings
+from django.urls import include, path
+from . import async_views, replica, views
+
+# Under ASGI, serve the read-heavy views and toggle without thread handoffs.
+if getattr(settings, "TODOS_ASYNC_VIEWS", False):
+    list_view = async_views.AsyncTodoListView.as_view()
+    detail_view = async_views.AsyncTodoDetailView.as_view()
+    toggle_view = async_views.toggle_todo
+else:
+    list_view = views.TodoListView.as_view()
+    detail_view = views.TodoDetailView.as_view()
+    toggle_view = views.toggle_todo
+
+# Read from the replicas, if configured; see todos/replica.py.
+list_view = replica.read_only(list_view)
+detail_view = replica.read_only(detail_view)
 
 urlpatterns = [
-    path("", views.TodoListView.as_view(), name="todo_list"),
-    path("todo/<int:pk>/", views.TodoDetailView.as_view(), name="todo_detail"),
+    path("", list_view, name="todo_list"),
+    path("todo/<int:pk>/", detail_view, name="todo_detail"),
     path("create/", views.TodoCreateView.as_view(), name="todo_create"),
     path("todo/<int:pk>/update/", views.TodoUpdateView.as_view(), name="todo_update"),
     path("todo/<int:pk>/delete/", views.TodoDeleteView.as_view(), name="todo_delete"),
-    path("todo/<int:pk>/toggle/", views.toggle_todo, name="todo_toggle"),
+    path("todo/<int:pk>/toggle/", toggle_view, name="todo_toggle"),
+    path("bulk/create/", views.bulk_create_todos, name="todo_bulk_create"),
+    path("bulk/complete/", views.bulk_complete_todos, name="todo_bulk_complete"),
+    path("bulk/delete/", views.bulk_delete_todos, name="todo_bulk_delete"),
+    path("api/", include("todos.api.urls")),
 ]
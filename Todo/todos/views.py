@@ -1,5 +1,17 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404, JsonResponse
+from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.views.generic import (
     ListView,
     DetailView,
@@ -7,26 +19,306 @@ from django.views.generic import (
     UpdateView,
     DeleteView,
 )
-from django.urls import reverse_lazy
-from .models import Todo
+from django.urls import reverse, reverse_lazy
+from .models import Todo, TodoArchive, TodoCounters, is_valid_id
 from .forms import TodoForm
+from .pagination import InvalidCursor, KeysetPaginator
+from . import (
+    archive,
+    bulk,
+    counters,
+    page_cache,
+    replica,
+    search,
+    sharding,
+    write_behind,
+)
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 (or 412) response if the client's copy is current.
+
+    ``etag`` is unquoted and either validator may be ``None``. Returns
+    ``None`` when the request has to be served in full.
+    """
+    if etag is not None:
+        etag = quote_etag(etag)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    """Add ``ETag`` and ``Last-Modified`` headers to a successful response."""
+    if response.status_code != 200:
+        return response
+    if etag is not None:
+        response.headers.setdefault("ETag", quote_etag(etag))
+    if last_modified is not None:
+        response.headers.setdefault(
+            "Last-Modified", http_date(int(last_modified.timestamp()))
+        )
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer conditional GETs with 304 Not Modified before doing any work.
+
+    Subclasses implement ``get_validators()`` returning ``(etag,
+    last_modified)``, either of which may be ``None``. It should be much
+    cheaper than rendering the page: when the client's copy is current,
+    nothing else runs.
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = self.get_validators()
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+
+def get_search_query(request):
+    return request.GET.get("q", "").strip()
+
+
+def include_archived(request):
+    """Return whether the list should show archived todos, with ``?archived=1``.
+
+    Searches only cover the live todos, so they never do.
+    """
+    return request.GET.get("archived") == "1" and not get_search_query(request)
+
+
+def get_pagination_mode(request):
+    """Use keyset pagination when a cursor is given or it is configured.
 
+    Search results are ordered by rank, not creation time, and lists with
+    archived todos are a ``UNION ALL`` that can't be filtered by cursor,
+    so both always use offset pagination.
+    """
+    if get_search_query(request) or include_archived(request):
+        return "offset"
+    if "cursor" in request.GET:
+        return "keyset"
+    return getattr(settings, "TODOS_PAGINATION_MODE", "offset")
 
-class TodoListView(ListView):
-    """Display all todos."""
+
+def list_etag(request, stats):
+    """Return the list page's ETag from ``MAX(updated_at)`` and ``COUNT(*)``.
+
+    Creates and edits move the max and deletes move the count, as
+    archiving does the archived count. The ETag also covers the query
+    string, i.e. which page is shown.
+    """
+    last = stats["last"].isoformat() if stats["last"] else ""
+    version = (
+        f"{last}:{stats['count']}:{stats.get('archived', '')}:"
+        f"{get_pagination_mode(request)}:{request.GET.urlencode()}"
+    )
+    return hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()
+
+
+def add_archived(stats):
+    """Return list ``stats`` with the archived todos counted as completed ones."""
+    archived = stats["archived"]
+    return {
+        **stats,
+        "count": stats["count"] + archived,
+        "completed": stats["completed"] + archived,
+    }
+
+
+def get_list_counts(stats):
+    """Return the ``TodoCounters`` shown on an unfiltered list page."""
+    if "completed" not in stats:
+        return None
+    return TodoCounters(total=stats["count"], completed=stats["completed"])
+
+
+def todo_url_prefix():
+    """Return the URL prefix of a todo's pages, e.g. ``/todos/todo/``.
+
+    The list fragment appends ``<pk>/``, ``<pk>/toggle/``, ``<pk>/update/``
+    and ``<pk>/delete/`` to it instead of reversing four URLs per row.
+    """
+    return reverse("todo_detail", args=[0]).removesuffix("0/")
+
+
+def detail_etag(pk, updated_at):
+    return f"{pk}-{updated_at.timestamp()}"
+
+
+class TodoListView(ConditionalGetMixin, ListView):
+    """Display all todos.
+
+    The list and pagination part of the page is rendered from
+    ``fragment_template_name`` and cached in ``todos.page_cache``; a cache
+    hit skips the page queries and that template entirely. With
+    ``TODOS_SHARDS``, each page is merged from every shard. With
+    ``?archived=1``, archived todos are listed too; see ``todos.archive``.
+    """
 
     model = Todo
     template_name = "todos/todo_list.html"
+    fragment_template_name = "todos/todo_list_page.html"
+    # Just what the fragment shows; never the full description.
+    fields = ("id", "title", "description_excerpt", "completed", "created_at")
     context_object_name = "todos"
     paginate_by = 10
+    cache_key = None
+    etag = None
+    row_count = None
+    counts = None
+
+    def get(self, request, *args, **kwargs):
+        if not page_cache.is_enabled():
+            return super().get(request, *args, **kwargs)
+        variant = replica.cache_variant(self.get_pagination_mode(), self.etag)
+        self.cache_key = page_cache.page_key(request, variant)
+        fragment = page_cache.get_fragment(self.cache_key)
+        if fragment is None:
+            response = super().get(request, *args, **kwargs)
+            response["X-Page-Cache"] = "miss"
+        else:
+            response = self.response_class(
+                request=request,
+                template=self.template_name,
+                context={
+                    "page_fragment": fragment,
+                    "search_query": self.get_search_query(),
+                    "include_archived": self.include_archived(),
+                    "counts": self.counts,
+                },
+                using=self.template_engine,
+            )
+            response["X-Page-Cache"] = "hit"
+        return response
+
+    def get_validators(self):
+        """Validate against ``MAX(updated_at)`` and ``COUNT(*)`` of the list.
+
+        One query over the ``updated_at`` index; see ``list_etag()``. No
+        Last-Modified is sent, because a delete would not change it.
+        Unfiltered, the count comes from the ``todos.counters`` row rather
+        than a scan.
+        """
+        if self.get_search_query():
+            stats = (
+                self.get_queryset()
+                .order_by()
+                .aggregate(last=Max("updated_at"), count=Count("pk"))
+            )
+        else:
+            stats = sharding.get_list_stats()
+            if self.include_archived():
+                stats = add_archived(stats)
+        # The paginator reuses this count instead of running its own.
+        self.row_count = stats["count"]
+        self.counts = get_list_counts(stats)
+        self.etag = list_etag(self.request, stats)
+        return self.etag, None
 
+    def get_search_query(self):
+        return get_search_query(self.request)
 
-class TodoDetailView(DetailView):
-    """Display a single todo."""
+    def include_archived(self):
+        return include_archived(self.request)
+
+    def get_queryset(self):
+        queryset = super().get_queryset().only(*self.fields)
+        query = self.get_search_query()
+        if query:
+            queryset = search.search(queryset, query)
+        elif self.include_archived():
+            queryset = archive.with_archived(queryset, self.fields)
+        return sharding.scatter(queryset)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["search_query"] = self.get_search_query()
+        context["include_archived"] = self.include_archived()
+        context["counts"] = self.counts
+        context["todo_url_prefix"] = todo_url_prefix()
+        context["page_fragment"] = render_to_string(
+            self.fragment_template_name, context, self.request
+        )
+        if self.cache_key:
+            page_cache.set_fragment(self.cache_key, context["page_fragment"])
+        return context
+
+    def get_pagination_mode(self):
+        return get_pagination_mode(self.request)
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        if self.row_count is not None:
+            paginator.count = self.row_count
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.get_pagination_mode() != "keyset":
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class ShardMixin:
+    """Look the todo up on the shard that holds it; see ``todos.sharding``.
+
+    Saving or deleting it then goes to the same shard. Views served by
+    ``replica.read_only()`` read it from the shard's replica.
+    """
+
+    def get_queryset(self):
+        alias = replica.read_alias(sharding.db_for_pk(self.kwargs["pk"]))
+        return super().get_queryset().using(alias)
+
+
+class TodoDetailView(ShardMixin, ConditionalGetMixin, DetailView):
+    """Display a single todo, or an archived one; see ``todos.archive``."""
 
     model = Todo
     template_name = "todos/todo_detail.html"
     context_object_name = "todo"
+    archived = None
+
+    def get_validators(self):
+        """Validate against the row's ``updated_at``, fetched on its own.
+
+        A todo missing from the live table is looked up in the archive,
+        whole, since archived todos never change; one missing from both
+        is a 404 straight away.
+        """
+        queryset = self.get_queryset()
+        updated_at = (
+            queryset.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            self.archived = (
+                TodoArchive.objects.using(queryset.db)
+                .filter(pk=self.kwargs["pk"])
+                .first()
+            )
+            if self.archived is None:
+                raise Http404("No Todo matches the given query.")
+            updated_at = self.archived.updated_at
+        return detail_etag(self.kwargs["pk"], updated_at), updated_at
+
+    def get_object(self, queryset=None):
+        if self.archived is not None:
+            return self.archived
+        return super().get_object(queryset)
 
 
 class TodoCreateView(CreateView):
@@ -38,17 +330,32 @@ class TodoCreateView(CreateView):
     success_url = reverse_lazy("todo_list")
 
 
-class TodoUpdateView(UpdateView):
-    """Update an existing todo."""
+class TodoUpdateView(ShardMixin, UpdateView):
+    """Update an existing todo.
+
+    With ``TODOS_WRITE_BEHIND`` on, the change is committed in a batch by
+    ``todos.write_behind``.
+    """
 
     model = Todo
     form_class = TodoForm
     template_name = "todos/todo_form.html"
     success_url = reverse_lazy("todo_list")
 
+    def form_valid(self, form):
+        if not write_behind.is_enabled():
+            return super().form_valid(form)
+        if not write_behind.update(self.object.pk, form.cleaned_data):
+            raise Http404("No Todo matches the given query.")
+        return redirect(self.get_success_url())
+
+
+class TodoDeleteView(ShardMixin, DeleteView):
+    """Delete a todo.
 
-class TodoDeleteView(DeleteView):
-    """Delete a todo."""
+    ``Todo.delete()`` only marks it deleted, in a single-row ``UPDATE``;
+    ``purge_deleted_todos`` removes it later.
+    """
 
     model = Todo
     template_name = "todos/todo_confirm_delete.html"
@@ -57,7 +364,94 @@ class TodoDeleteView(DeleteView):
 
 def toggle_todo(request, pk):
     """Toggle the completed status of a todo."""
-    todo = get_object_or_404(Todo, pk=pk)
-    todo.completed = not todo.completed
-    todo.save()
+    # The list page links here, so a GET writes too.
+    replica.mark_written(request)
+    if write_behind.is_enabled():
+        if not write_behind.toggle(pk):
+            raise Http404("No Todo matches the given query.")
+        return redirect("todo_list")
+    if not sharding.for_pk(pk).filter(pk=pk).toggle_completed():
+        raise Http404("No Todo matches the given query.")
+    page_cache.bump_generation(sharding.db_for_pk(pk))
     return redirect("todo_list")
+
+
+def json_body(request):
+    """Return the decoded JSON object sent with ``request``.
+
+    Raises ``ValueError`` if the body is not a JSON object.
+    """
+    if request.content_type != "application/json":
+        raise ValueError("Expected an application/json request body.")
+    data = json.loads(request.body)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object.")
+    return data
+
+
+def bulk_endpoint(operation):
+    """Wrap a bulk view that takes the decoded body and returns a dict.
+
+    Bulk endpoints are called by scripts, so they only accept JSON bodies,
+    which browsers won't send cross-site without a CORS preflight; that
+    is what lets them skip the CSRF token.
+    """
+
+    @csrf_exempt
+    @require_POST
+    def view(request):
+        try:
+            data = json_body(request)
+            return JsonResponse(operation(data))
+        except ValidationError as e:
+            return JsonResponse({"errors": e.message_dict}, status=400)
+        except (ValueError, TypeError) as e:
+            return JsonResponse({"errors": {"__all__": [str(e)]}}, status=400)
+
+    view.__name__ = operation.__name__
+    view.__doc__ = operation.__doc__
+    return view
+
+
+def get_ids(data):
+    """Return the ``ids`` list of ``data``, checked to be 64-bit integers.
+
+    Raises ``ValidationError`` mapping each bad id's index to an error.
+    """
+    ids = data.get("ids")
+    if not isinstance(ids, list):
+        raise ValueError("'ids' must be a list of todo ids.")
+    errors = {
+        str(index): ["Expected an integer todo id."]
+        for index, pk in enumerate(ids)
+        if not is_valid_id(pk)
+    }
+    if errors:
+        raise ValidationError(errors)
+    return ids
+
+
+@bulk_endpoint
+def bulk_create_todos(data):
+    """Create many todos: ``{"todos": [{"title": ...}, ...]}``."""
+    items = data.get("todos")
+    if not isinstance(items, list):
+        raise ValueError("'todos' must be a list of todo objects.")
+    todos = bulk.bulk_create_todos(items, data.get("batch_size"))
+    return {"created": len(todos), "ids": [todo.pk for todo in todos]}
+
+
+@bulk_endpoint
+def bulk_complete_todos(data):
+    """Mark many todos completed: ``{"ids": [...], "completed": true}``."""
+    completed = data.get("completed", True)
+    if not isinstance(completed, bool):
+        raise ValueError("'completed' must be true or false.")
+    updated = bulk.bulk_set_completed(get_ids(data), completed, data.get("batch_size"))
+    return {"updated": updated}
+
+
+@bulk_endpoint
+def bulk_delete_todos(data):
+    """Delete many todos: ``{"ids": [...]}``."""
+    return {"deleted": bulk.bulk_delete(get_ids(data), data.get("batch_size"))}
@@ -0,0 +1,243 @@
+"""Coalesce toggles and field updates into batched transactions.
+
+With ``TODOS_WRITE_BEHIND`` on, ``toggle_todo`` and ``TodoUpdateView``
+don't commit their own transaction. They put the write on a process-wide
+queue, and a background thread drains it into one transaction at most
+every ``TODOS_WRITE_BEHIND_INTERVAL`` milliseconds or
+``TODOS_WRITE_BEHIND_BATCH_SIZE`` operations, whichever comes first. On
+SQLite, where every transaction queues for the single writer lock, a
+burst of clicks then takes a handful of lock round trips instead of one
+each.
+
+Within a batch, writes to the same todo are folded together first: an
+even number of toggles cancels out, and later field values win. All
+toggles left over go out as one ``UPDATE``.
+
+Each request still waits for the batch holding its write to commit before
+it responds, so the page it redirects to reads its own write. Waiting
+costs at most one interval; the win is in throughput under concurrency,
+not in the latency of a single request.
+
+With ``TODOS_SHARDS``, each shard gets a queue of its own, so batches
+for different shards commit in parallel.
+
+The workers start on first use. ``shutdown()``, registered with
+``atexit``, commits whatever is queued and stops them.
+"""
+
+import asyncio
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import page_cache, sharding
+from .models import Todo
+
+UPDATABLE_FIELDS = frozenset({"title", "description", "completed"})
+
+_STOP = object()
+
+
+def is_enabled():
+    return getattr(settings, "TODOS_WRITE_BEHIND", False)
+
+
+def get_interval():
+    """Return the longest time, in seconds, a write waits for its batch."""
+    return getattr(settings, "TODOS_WRITE_BEHIND_INTERVAL", 2) / 1000
+
+
+def get_batch_size():
+    return getattr(settings, "TODOS_WRITE_BEHIND_BATCH_SIZE", 200)
+
+
+def get_timeout():
+    """Return how long, in seconds, a request waits for its write."""
+    return getattr(settings, "TODOS_WRITE_BEHIND_TIMEOUT", 10)
+
+
+class Operation:
+    """One queued write: a toggle (``fields`` is ``None``) or an update."""
+
+    def __init__(self, pk, fields=None):
+        self.pk = pk
+        self.fields = fields
+        self.future = Future()
+
+
+class PendingWrite:
+    """The folded effect of a batch's operations on one todo."""
+
+    def __init__(self):
+        self.fields = {}
+        self.flip = False
+
+    def add(self, operation):
+        if operation.fields is not None:
+            self.fields.update(operation.fields)
+            if "completed" in operation.fields:
+                self.flip = False
+        elif "completed" in self.fields:
+            self.fields["completed"] = not self.fields["completed"]
+        else:
+            self.flip = not self.flip
+
+
+def apply_batch(operations, using=DEFAULT_DB_ALIAS):
+    """Apply ``operations`` in one transaction.
+
+    Returns the set of primary keys that exist; writes to other keys are
+    no-ops. Runs one query to find the todos, one ``UPDATE`` for all the
+    toggles and one per todo with field updates.
+    """
+    writes = {}
+    for operation in operations:
+        writes.setdefault(operation.pk, PendingWrite()).add(operation)
+    todos = Todo.objects.using(using)
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        found = set(todos.filter(pk__in=writes).values_list("pk", flat=True))
+        toggles = [pk for pk in found if writes[pk].flip and not writes[pk].fields]
+        if toggles:
+            todos.filter(pk__in=toggles).toggle_completed()
+        for pk in found:
+            write = writes[pk]
+            if not write.fields:
+                continue
+            fields = dict(write.fields)
+            if write.flip:
+                fields["completed"] = ~F("completed")
+            todos.filter(pk=pk).update(**fields, updated_at=now)
+        if found:
+            page_cache.bump_generation(using)
+    return found
+
+
+class WriteBehindQueue:
+    """A queue of writes and the thread that commits them in batches."""
+
+    def __init__(self, interval=None, batch_size=None, using=DEFAULT_DB_ALIAS):
+        self.interval = get_interval() if interval is None else interval
+        self.batch_size = batch_size or get_batch_size()
+        self.using = using
+        self.batches = 0
+        self.operations = 0
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="todos-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, pk, fields=None):
+        """Queue a toggle of todo ``pk``, or an update of ``fields`` on it.
+
+        Returns a ``Future`` that resolves to whether the todo existed,
+        once the batch holding the write has committed.
+        """
+        if fields is not None and not set(fields) <= UPDATABLE_FIELDS:
+            unknown = ", ".join(sorted(set(fields) - UPDATABLE_FIELDS))
+            raise ValueError(f"Can't update {unknown} through the write queue.")
+        operation = Operation(pk, fields)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write-behind queue has been shut down.")
+            self._queue.put(operation)
+        return operation.future
+
+    def close(self, timeout=None):
+        """Commit the queued writes and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            stopping = False
+            while not stopping:
+                operation = self._queue.get()
+                if operation is _STOP:
+                    break
+                batch = [operation]
+                deadline = time.monotonic() + self.interval
+                while len(batch) < self.batch_size:
+                    try:
+                        operation = self._queue.get(
+                            timeout=max(deadline - time.monotonic(), 0)
+                        )
+                    except queue.Empty:
+                        break
+                    if operation is _STOP:
+                        stopping = True
+                        break
+                    batch.append(operation)
+                self._flush(batch)
+        finally:
+            connections[self.using].close()
+
+    def _flush(self, batch):
+        try:
+            found = apply_batch(batch, self.using)
+        except Exception as e:
+            for operation in batch:
+                operation.future.set_exception(e)
+            return
+        self.batches += 1
+        self.operations += len(batch)
+        for operation in batch:
+            operation.future.set_result(operation.pk in found)
+
+
+_queues = {}
+_queue_lock = threading.Lock()
+
+
+def get_queue(using=DEFAULT_DB_ALIAS):
+    """Return the process-wide queue for ``using``, starting it if needed."""
+    with _queue_lock:
+        if using not in _queues:
+            _queues[using] = WriteBehindQueue(using=using)
+        return _queues[using]
+
+
+def shutdown(timeout=None):
+    """Commit the queued writes and stop the process-wide queues."""
+    with _queue_lock:
+        write_queues = list(_queues.values())
+        _queues.clear()
+    for write_queue in write_queues:
+        write_queue.close(timeout)
+
+
+atexit.register(shutdown)
+
+
+def toggle(pk):
+    """Toggle todo ``pk`` through the queue; return whether it existed."""
+    return get_queue(sharding.db_for_pk(pk)).submit(pk).result(get_timeout())
+
+
+async def atoggle(pk):
+    """Async version of ``toggle()``; waits without blocking the loop."""
+    future = asyncio.wrap_future(get_queue(sharding.db_for_pk(pk)).submit(pk))
+    return await asyncio.wait_for(future, get_timeout())
+
+
+def update(pk, fields):
+    """Update ``fields`` of todo ``pk`` through the queue.
+
+    Returns whether the todo existed.
+    """
+    write_queue = get_queue(sharding.db_for_pk(pk))
+    return write_queue.submit(pk, fields).result(get_timeout())